@@ -0,0 +1,68 @@
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+
+from sales_prediction.data_processing.features_engineering import (
+    AddressFeatureEngineering,
+    ColumnRenaming,
+    DataCleaner,
+)
+from timing import best_time
+
+
+def cli():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--data_dir",
+        "-d",
+        type=str,
+        required=False,
+        help="Directory holding the monthly Sales_*_2019.csv files.",
+        default="data/processed_csv_file",
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        required=False,
+        help="Number of timed runs per mode, the best one is reported.",
+        default=5,
+    )
+    return parser.parse_args()
+
+
+def load_frames(data_dir: str) -> List[pd.DataFrame]:
+    frames = []
+    for csv_file_path in sorted(Path(data_dir).glob("Sales_*_2019.csv")):
+        df = pd.read_csv(csv_file_path)
+        df = ColumnRenaming({"Purchase Address": "PurchaseAddress"}).transform(DataCleaner().transform(df))
+        frames.append(df[["PurchaseAddress"]])
+    return frames
+
+
+def time_transform(cached: bool, frames: List[pd.DataFrame], repeat: int) -> float:
+    transformer = AddressFeatureEngineering("PurchaseAddress", cached=cached)
+    return best_time(
+        lambda copies: [transformer.transform(df) for df in copies], repeat, setup=lambda: [df.copy() for df in frames]
+    )
+
+
+def main():
+    args = cli()
+    frames = load_frames(args.data_dir)
+    rows = sum(len(df) for df in frames)
+    unique_addresses = pd.concat(frames)["PurchaseAddress"].nunique()
+    print(f"{len(frames)} files, {rows} rows, {unique_addresses} distinct addresses")
+    default_time = time_transform(False, frames, args.repeat)
+    cached_time = time_transform(True, frames, args.repeat)
+    default_df = AddressFeatureEngineering("PurchaseAddress").transform(pd.concat(frames))
+    cached_df = AddressFeatureEngineering("PurchaseAddress", cached=True).transform(pd.concat(frames))
+    print(f"default: {default_time * 1000:8.1f} ms  {default_df.memory_usage(deep=True).sum() / 1e6:6.1f} MB")
+    print(f"cached:  {cached_time * 1000:8.1f} ms  {cached_df.memory_usage(deep=True).sum() / 1e6:6.1f} MB")
+    print(f"speedup: {default_time / cached_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
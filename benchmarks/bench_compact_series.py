@@ -0,0 +1,114 @@
+import tracemalloc
+from argparse import ArgumentParser
+from typing import Callable, Tuple
+
+import numpy as np
+import pandas as pd
+from sktime.forecasting.model_selection import ExpandingWindowSplitter
+
+from sales_prediction.training_pipeline.compact_series import CompactSeries
+from sales_prediction.training_pipeline.data_prep import load_daily_sales, split_daily_sales
+from sales_prediction.training_pipeline.hyperparmaters_tuning import (
+    SharedTransformSearchCV,
+    fit_fold_transforms,
+)
+from sales_prediction.training_pipeline.modelling import create_model, create_tuning_model
+from sales_prediction.utils import load_config
+from timing import best_time
+
+
+def cli():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--config_path",
+        "-c",
+        type=str,
+        required=False,
+        help="Path to the forecasting config file.",
+        default="src/config/forecasting_config.yaml",
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        required=False,
+        help="Number of timed runs per mode, the best one is reported.",
+        default=3,
+    )
+    parser.add_argument(
+        "--days",
+        "-d",
+        type=int,
+        required=False,
+        help="Tile the training series to this many days to profile a longer history.",
+        default=None,
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        required=False,
+        help="Number of allocation sites to list for each mode.",
+        default=0,
+    )
+    return parser.parse_args()
+
+
+def profile(function: Callable[[], object], repeat: int, top: int) -> Tuple[float, int, int, object]:
+    """
+    Best wall time, then peak and retained traced memory of one traced run
+    """
+    best = best_time(function, repeat)
+    tracemalloc.start()
+    result = function()
+    retained, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    for stat in snapshot.statistics("lineno")[:top]:
+        print(f"    {stat}")
+    return best, peak, retained, result
+
+
+def main():
+    args = cli()
+    config = load_config.load_config(args.config_path)
+    daily_sales = load_daily_sales(
+        config.get("csv_path"), config.get("parquet_path"), config.get("db_name")
+    )
+    df_train, _ = split_daily_sales(daily_sales)
+    if args.days:
+        values = np.resize(df_train.to_numpy(), args.days)
+        index = pd.date_range(df_train.index[-1] - pd.Timedelta(days=args.days - 1), periods=args.days, freq="D")
+        df_train = pd.Series(values, index=index, name=df_train.name)
+    compact = CompactSeries.from_series(df_train)
+    series = {"pandas series": df_train, "compact series": compact.to_series()}
+    cv = ExpandingWindowSplitter(fh=4, initial_window=30, step_length=7)
+    n_folds = cv.get_n_splits(df_train)
+    print(f"{len(df_train)} days: {df_train.memory_usage(deep=True)} bytes as a float64 series, "
+          f"{compact.nbytes} bytes compact; {n_folds} folds")
+    for name, y in series.items():
+        seconds, peak, retained, _ = profile(lambda: create_model().fit(y), args.repeat, args.top)
+        print(
+            f"fit   {name:15s} {seconds * 1000:8.1f} ms  peak {peak / 1e6:6.2f} MB  "
+            f"retained {retained / 1e6:6.2f} MB"
+        )
+    search_cv = SharedTransformSearchCV(create_tuning_model(), cv, {})
+    fold_modes = {
+        "float64, copies": lambda: [
+            fit_fold_transforms(search_cv.forecaster, df_train.iloc[train], df_train.iloc[test], {})
+            for train, test in cv.split(df_train)
+        ],
+        "float64, views": lambda: search_cv.folds(df_train, {}),
+        "compact, views": lambda: search_cv.folds(series["compact series"], {}),
+    }
+    for name, function in fold_modes.items():
+        y = series["compact series"] if name.startswith("compact") else df_train
+        seconds, peak, retained, folds = profile(function, args.repeat, args.top)
+        shared = sum(np.shares_memory(y_test.to_numpy(), y.to_numpy()) for _, _, y_test in folds)
+        print(
+            f"folds {name:15s} {seconds * 1000 / n_folds:8.2f} ms/fold  peak {peak / 1e3 / n_folds:7.1f} KB/fold  "
+            f"retained {retained / 1e3 / n_folds:7.1f} KB/fold  test windows viewed {shared}/{n_folds}"
+        )
+
+
+if __name__ == "__main__":
+    main()
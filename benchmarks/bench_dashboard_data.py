@@ -0,0 +1,96 @@
+import sqlite3
+from argparse import ArgumentParser
+
+import pandas as pd
+
+from sales_prediction.data_loading.dashboard_data import DashboardData
+from sales_prediction.data_loading.sales_cube import SalesCube
+from sales_prediction.utils.load_config import load_config
+from timing import best_time
+
+
+def cli():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--config_path",
+        "-c",
+        type=str,
+        required=False,
+        help="Path to the forecasting config file, for the database name.",
+        default="src/config/forecasting_config.yaml",
+    )
+    parser.add_argument(
+        "--years",
+        "-y",
+        type=int,
+        nargs="+",
+        required=False,
+        help="Lengths of history to time, as numbers of copies of the cube shifted by a year.",
+        default=[1, 5, 20],
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        required=False,
+        help="Number of timed runs, the best one is reported.",
+        default=3,
+    )
+    return parser.parse_args()
+
+
+def shifted_cube(db_name: str, years: int) -> sqlite3.Connection:
+    """
+    An in-memory copy of the aggregate tables repeated over `years` consecutive years
+    """
+    connection = sqlite3.connect(":memory:")
+    with sqlite3.connect(db_name) as source:
+        for table_name in SalesCube.TABLES:
+            df = pd.read_sql_query(f'SELECT * FROM "{table_name}"', source)
+            dates = pd.to_datetime(df["Date"])
+            copies = [
+                df.assign(Date=(dates - pd.DateOffset(years=shift)).dt.strftime("%Y-%m-%d"))
+                for shift in range(years)
+            ]
+            pd.concat(copies, ignore_index=True).to_sql(table_name, connection, index=False)
+    return connection
+
+
+def per_city_queries(sales_cube: SalesCube, city: str) -> None:
+    """
+    What the dashboard computed on every city change before the precomputed views
+    """
+    df_products = sales_cube.query(by=["Product"], filters={"CityName": [city]})
+    df_streets = sales_cube.query(by=["StreetName", "ZipAddress"], filters={"CityName": [city]})
+    df_city_by_day = sales_cube.query(filters={"CityName": [city]}).set_index("Date")
+    df_streets["street"] = df_streets["StreetName"] + ", " + df_streets["ZipAddress"]
+    df_streets["Month"] = df_streets["Date"].dt.month
+    diff_df = df_streets.groupby(["Month", "street"], as_index=False).agg(sales_month_street=("Sales", "sum"))
+    diff_df[diff_df["Month"].isin([11, 12])].pivot(index="street", columns="Month", values="sales_month_street")
+    df_streets.groupby(["street"], as_index=False).agg(total_sales=("Sales", "sum"))
+    df_products["Month"] = df_products["Date"].dt.month
+    df_products.groupby(["Month", "Product"], as_index=False).agg({"Sales": "sum"})
+    df_city_by_day.asfreq("D", fill_value=0)
+
+
+def main():
+    args = cli()
+    db_name = load_config(args.config_path).get("db_name")
+    for years in args.years:
+        connection = shifted_cube(db_name, years)
+        sales_cube = SalesCube(connection)
+        data = DashboardData.build(sales_cube)
+        cities = data.cities
+        build = best_time(lambda: DashboardData.build(sales_cube), args.repeat)
+        queries = best_time(lambda: [per_city_queries(sales_cube, city) for city in cities], args.repeat)
+        lookups = best_time(lambda: [data.view(city) for city in cities], args.repeat)
+        print(
+            f"{years:>3d} years  build {build * 1000:8.1f} ms  "
+            f"per-city queries {queries / len(cities) * 1000:8.2f} ms/city  "
+            f"precomputed view {lookups / len(cities) * 1e6:6.2f} us/city"
+        )
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
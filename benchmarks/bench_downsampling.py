@@ -0,0 +1,62 @@
+from argparse import ArgumentParser
+
+import numpy as np
+import pandas as pd
+
+from sales_prediction.utils.downsampling import METHODS, downsample, points_budget
+from timing import best_time
+
+
+def cli():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--points",
+        "-n",
+        type=int,
+        nargs="+",
+        required=False,
+        help="Lengths of the series to downsample.",
+        default=[10_000, 100_000, 1_000_000, 10_000_000],
+    )
+    parser.add_argument(
+        "--width",
+        "-w",
+        type=int,
+        required=False,
+        help="Width of the chart in pixels, which sets the point budget.",
+        default=900,
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        required=False,
+        help="Number of timed runs, the best one is reported.",
+        default=3,
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = cli()
+    max_points = points_budget(args.width)
+    rng = np.random.default_rng(0)
+    for n_points in args.points:
+        series = pd.Series(
+            rng.gamma(2.0, 500.0, size=n_points),
+            index=pd.date_range("2000-01-01", periods=n_points, freq="min"),
+            name="Sales",
+        )
+        payload = len(series.to_json(orient="split", date_format="iso"))
+        for method in METHODS:
+            best = best_time(lambda: downsample(series, max_points, method), args.repeat)
+            sampled = downsample(series, max_points, method)
+            sampled_payload = len(sampled.to_json(orient="split", date_format="iso"))
+            print(
+                f"{n_points:>11,d} points  {method:<6}  {best * 1000:8.1f} ms  {len(sampled):>5d} points  "
+                f"json {payload / 1e6:8.2f} MB -> {sampled_payload / 1e3:6.1f} KB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Optional
+
+import pandas as pd
+from sktime.forecasting.base import ForecastingHorizon
+
+from sales_prediction.training_pipeline.data_prep import load_sales_panel, split_daily_sales
+from sales_prediction.training_pipeline.hierarchical import HierarchicalForecaster
+from sales_prediction.training_pipeline.modelling import create_global_model, create_model
+from sales_prediction.utils import load_config
+
+
+def cli():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--config_path",
+        "-c",
+        type=str,
+        required=False,
+        help="Path to the forecasting config file.",
+        default="src/config/forecasting_config.yaml",
+    )
+    parser.add_argument(
+        "--max_series",
+        "-n",
+        type=int,
+        required=False,
+        help="Only compare on the series with the largest sales, all of them if not set.",
+        default=None,
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        required=False,
+        help="Number of timed fits of the global model, the best one is reported.",
+        default=3,
+    )
+    return parser.parse_args()
+
+
+def report(name: str, fit_seconds: float, predict_seconds: float, y_pred: pd.DataFrame, y_test: pd.DataFrame):
+    bottom_mae = (y_pred - y_test).abs().mean().mean()
+    total_mae = (y_pred.sum(axis=1) - y_test.sum(axis=1)).abs().mean()
+    print(
+        f"{name:12s} fit {fit_seconds:8.2f} s  predict {predict_seconds * 1000:8.1f} ms  "
+        f"series MAE {bottom_mae:8.1f}  total MAE {total_mae:9.1f}"
+    )
+
+
+def main():
+    args = cli()
+    config = load_config.load_config(args.config_path)
+    panel = load_sales_panel(config.get("csv_path"), config.get("parquet_path"), config.get("db_name"))
+    max_series: Optional[int] = args.max_series
+    if max_series is not None:
+        panel = panel[panel.sum().sort_values(ascending=False).index[:max_series]]
+    df_train, df_test = split_daily_sales(panel)
+    fh = ForecastingHorizon(df_test.index, is_relative=False)
+    print(f"{panel.shape[1]} series, {len(df_train)} training days, {len(df_test)} test days")
+
+    fit_seconds = float("inf")
+    for _ in range(args.repeat):
+        start = perf_counter()
+        global_model = create_global_model().fit(df_train)
+        fit_seconds = min(fit_seconds, perf_counter() - start)
+    start = perf_counter()
+    y_pred = global_model.predict(fh)
+    report("global", fit_seconds, perf_counter() - start, y_pred, df_test)
+
+    per_series = HierarchicalForecaster(create_model)
+    start = perf_counter()
+    per_series.fit(df_train)
+    fit_seconds = perf_counter() - start
+    start = perf_counter()
+    y_pred = per_series.predict_bottom(fh)
+    report("per series", fit_seconds, perf_counter() - start, y_pred, df_test)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from argparse import ArgumentParser
+from collections import Counter
+from time import perf_counter
+
+import numpy as np
+
+from sales_prediction.training_pipeline.data_prep import load_daily_sales
+from sales_prediction.training_pipeline.modelling import create_model
+from sales_prediction.training_pipeline.train import IncrementalTrainingPipeline
+from sales_prediction.utils import load_config
+
+
+def cli():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--config_path",
+        "-c",
+        type=str,
+        required=False,
+        help="Path to the forecasting config file.",
+        default="src/config/forecasting_config.yaml",
+    )
+    parser.add_argument(
+        "--days",
+        "-d",
+        type=int,
+        required=False,
+        help="Number of daily retrains to simulate at the end of the series.",
+        default=28,
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = cli()
+    config = load_config.load_config(args.config_path)
+    retraining = config.get("retraining", {})
+    daily_sales = load_daily_sales(
+        config.get("csv_path"), config.get("parquet_path"), config.get("db_name")
+    )
+    daily_sales = daily_sales[:"2019-12-31"]
+    first_day = len(daily_sales) - args.days
+    previous = create_model().fit(daily_sales.iloc[:first_day])
+    updates_since_refit = 0
+    timings = {"refit": [], "incremental": []}
+    errors = {"refit": [], "incremental": []}
+    modes = Counter()
+    for day in range(first_day + 1, len(daily_sales)):
+        history = daily_sales.iloc[:day]
+        actual = daily_sales.iloc[day]
+
+        start = perf_counter()
+        refit = create_model().fit(history)
+        timings["refit"].append(perf_counter() - start)
+        errors["refit"].append(abs(refit.predict([1]).iloc[0] - actual))
+
+        train_pipeline = IncrementalTrainingPipeline(
+            create_model(),
+            history,
+            previous=previous,
+            updates_since_refit=updates_since_refit,
+            extra_iter=retraining.get("extra_iter", 50),
+            refit_every=retraining.get("refit_every", 7),
+            drift_threshold=retraining.get("drift_threshold", 0.3),
+        )
+        start = perf_counter()
+        previous = train_pipeline.fit()
+        timings["incremental"].append(perf_counter() - start)
+        errors["incremental"].append(abs(previous.predict([1]).iloc[0] - actual))
+        updates_since_refit = train_pipeline.updates_since_refit_
+        modes[train_pipeline.mode_] += 1
+
+    print(f"{len(timings['refit'])} daily retrains, incremental modes {dict(modes)}")
+    for name in timings:
+        print(
+            f"{name:12s} mean {np.mean(timings[name]) * 1000:8.1f} ms  "
+            f"median {np.median(timings[name]) * 1000:8.1f} ms  next-day MAE {np.mean(errors[name]):9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
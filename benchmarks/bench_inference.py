@@ -0,0 +1,63 @@
+from argparse import ArgumentParser
+from pathlib import Path
+
+import pandas as pd
+from sktime.forecasting.base import ForecastingHorizon
+
+from sales_prediction.jobs.inference import InferenceJob
+from sales_prediction.training_pipeline.data_prep import load_daily_sales, split_daily_sales
+from sales_prediction.training_pipeline.modelling import create_model
+from sales_prediction.utils import load_config
+from timing import best_time
+
+
+def cli():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--config_path",
+        "-c",
+        type=str,
+        required=False,
+        help="Path to the forecasting config file.",
+        default="src/config/forecasting_config.yaml",
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        required=False,
+        help="Number of timed runs per mode, the best one is reported.",
+        default=3,
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = cli()
+    config = load_config.load_config(args.config_path)
+    daily_sales = load_daily_sales(
+        config.get("csv_path"), config.get("parquet_path"), config.get("db_name")
+    )
+    df_train, df_test = split_daily_sales(daily_sales)
+    model_path = config.get("model_path2")
+    if model_path and Path(model_path).exists():
+        job = InferenceJob.from_path(model_path)
+    else:
+        job = InferenceJob(create_model().fit(df_train))
+    horizons = [
+        ForecastingHorizon(df_test.index, is_relative=False),
+        ForecastingHorizon(pd.date_range("2020-01-01", "2020-06-01", freq="D"), is_relative=False),
+        ForecastingHorizon(list(range(1, 8))),
+        ForecastingHorizon(list(range(1, 31))),
+    ]
+    steps = sum(len(fh) for fh in horizons)
+    single_time = best_time(lambda: [job.predict(fh) for fh in horizons], args.repeat)
+    batched_time = best_time(lambda: job.predict_many(horizons), args.repeat)
+    print(f"{len(horizons)} horizons, {steps} steps")
+    print(f"single:  {single_time * 1000:8.1f} ms  {single_time * 1000 / len(horizons):8.1f} ms/horizon")
+    print(f"batched: {batched_time * 1000:8.1f} ms  {batched_time * 1000 / len(horizons):8.1f} ms/horizon")
+    print(f"speedup: {single_time / batched_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import subprocess
+import sys
+import tempfile
+from argparse import ArgumentParser
+from pathlib import Path
+
+from sktime.utils import mlflow_sktime
+
+from sales_prediction.training_pipeline.data_prep import load_daily_sales, split_daily_sales
+from sales_prediction.training_pipeline.modelling import create_model
+from sales_prediction.utils import load_config
+from sales_prediction.utils.registries import ModelRegistry
+from timing import best_time
+
+COLD_START = """
+from time import perf_counter
+start = perf_counter()
+from sales_prediction.utils.registries import ModelRegistry
+ModelRegistry.load_model({path!r})
+print(perf_counter() - start)
+"""
+
+
+def cli():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--config_path",
+        "-c",
+        type=str,
+        required=False,
+        help="Path to the forecasting config file.",
+        default="src/config/forecasting_config.yaml",
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        required=False,
+        help="Number of timed runs per mode, the best one is reported.",
+        default=5,
+    )
+    return parser.parse_args()
+
+
+def cold_start(model_path: Path, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", COLD_START.format(path=str(model_path))],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        best = min(best, float(output.stdout.strip().splitlines()[-1]))
+    return best
+
+
+def main():
+    args = cli()
+    config = load_config.load_config(args.config_path)
+    daily_sales = load_daily_sales(
+        config.get("csv_path"), config.get("parquet_path"), config.get("db_name")
+    )
+    df_train, _ = split_daily_sales(daily_sales)
+    forecaster = create_model().fit(df_train)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        mlflow_path = Path(tmp_dir) / "mlflow_model"
+        fast_path = Path(tmp_dir) / "fast_model"
+        ModelRegistry.save_model(forecaster, str(mlflow_path), fast_format=False)
+        ModelRegistry.save_model(forecaster, str(fast_path))
+        print(f"cold start, mlflow:   {cold_start(mlflow_path, args.repeat) * 1000:8.1f} ms")
+        print(f"cold start, pickle:   {cold_start(fast_path, args.repeat) * 1000:8.1f} ms")
+        mlflow_time = best_time(lambda: mlflow_sktime.load_model(str(mlflow_path)), args.repeat)
+        fast_time = best_time(lambda: ModelRegistry.load_model(str(fast_path), use_cache=False), args.repeat)
+        ModelRegistry.load_model(str(fast_path))
+        cached_time = best_time(lambda: ModelRegistry.load_model(str(fast_path)), args.repeat)
+        print(f"per request, mlflow:  {mlflow_time * 1000:8.1f} ms")
+        print(f"per request, pickle:  {fast_time * 1000:8.1f} ms")
+        print(f"per request, cached:  {cached_time * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+import itertools
+import json
+import logging
+import platform
+import sys
+import tempfile
+from argparse import ArgumentParser
+from collections import defaultdict
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import sklearn
+import sktime
+from sktime.forecasting.base import ForecastingHorizon
+
+from run_data_pipeline import build_transformation_pipeline
+from sales_prediction.data_loading.loadCsv import BulkSqliteLoader, CsvToSqliteWithPandas
+from sales_prediction.data_processing.instrumentation import StepProfiler
+from sales_prediction.jobs.inference import InferenceJob
+from sales_prediction.training_pipeline.data_prep import prepare_data
+from sales_prediction.training_pipeline.modelling import create_model
+from sales_prediction.training_pipeline.train import TrainingPipeline
+from sales_prediction.utils.csv_to_dataframe import DataLoader
+from sales_prediction.utils.db_connector import sqlite_connector
+from sales_prediction.utils.load_config import load_config
+from synthetic_orders import write_orders_csv
+
+STAGES = ["load", "transform", "sqlite_pandas", "sqlite_bulk", "prepare_data", "fit", "predict"]
+
+
+def cli():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--rows",
+        "-n",
+        type=int,
+        nargs="+",
+        required=False,
+        help="Numbers of synthetic order lines to time, from 10^4 up to 10^8.",
+        default=[10_000, 100_000, 1_000_000],
+    )
+    parser.add_argument(
+        "--config_path",
+        "-c",
+        type=str,
+        required=False,
+        help="Path to the data processing config file.",
+        default="src/config/data_processing_config.yaml",
+    )
+    parser.add_argument(
+        "--chunksize",
+        "-cs",
+        type=int,
+        required=False,
+        help="Stream the orders this many rows at a time instead of loading them at once, for 10^7 rows and more.",
+        default=None,
+    )
+    parser.add_argument(
+        "--stages",
+        "-s",
+        type=str,
+        nargs="+",
+        choices=STAGES,
+        required=False,
+        help="Stages to time, the SQLite loads need about 150 bytes of disk per row.",
+        default=STAGES,
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        required=False,
+        help="Number of timed runs per size, the best one is reported for every stage.",
+        default=3,
+    )
+    parser.add_argument(
+        "--baseline",
+        "-b",
+        type=str,
+        required=False,
+        help="JSON baseline the timings are compared with.",
+        default="benchmarks/baselines/bench_suite.json",
+    )
+    parser.add_argument(
+        "--update_baseline",
+        "-u",
+        action="store_true",
+        help="Write the timings to the baseline instead of comparing them with it.",
+    )
+    parser.add_argument(
+        "--threshold",
+        "-t",
+        type=float,
+        required=False,
+        help="Relative slowdown over the baseline reported as a regression, the baseline's one by default.",
+        default=None,
+    )
+    parser.add_argument(
+        "--min_seconds",
+        "-ms",
+        type=float,
+        required=False,
+        help="Slowdowns shorter than this are noise and never reported, the baseline's one by default.",
+        default=None,
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        required=False,
+        help="JSON file the timings of this run are written to.",
+        default=None,
+    )
+    parser.add_argument(
+        "--work_dir",
+        "-w",
+        type=str,
+        required=False,
+        help="Directory for the synthetic csv files and databases, a temporary one by default.",
+        default=None,
+    )
+    return parser.parse_args()
+
+
+def machine_info() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "sktime": sktime.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def run_stages(
+    csv_path: Path, config: dict, work_dir: Path, stages: List[str], chunksize: Optional[int] = None
+) -> Dict[str, float]:
+    """
+    Run the synthetic orders through every stage once and time each of them
+
+    In streaming mode the stages run chunk after chunk, the SQLite tables being appended
+    to, and the daily sales of the chunks are added up before the model is fitted.
+
+    Args:
+        csv_path (Path): the synthetic orders
+        config (dict): the data processing config
+        work_dir (Path): the directory of the SQLite databases
+        stages (List[str]): the stages to time, the loading and the transformation always run
+        chunksize (Optional[int]): the number of rows per chunk in streaming mode
+    Returns:
+        Dict[str, float]: the seconds of every stage and of every feature engineering step
+    """
+    logger = logging.getLogger(__name__)
+    profiler = StepProfiler()
+    pipeline = build_transformation_pipeline(config, logger, profiler=profiler)
+    seconds: Dict[str, float] = defaultdict(float)
+    y_train = y_test = None
+    loader = DataLoader(csv_path)
+    raw_frames = loader.load_chunks(chunksize) if chunksize else (loader.load_data() for _ in range(1))
+    with sqlite_connector(str(work_dir / "pandas.sqlite")) as pandas_connection, sqlite_connector(
+        str(work_dir / "bulk.sqlite")
+    ) as bulk_connection:
+        loaders = {
+            "sqlite_pandas": CsvToSqliteWithPandas(pandas_connection, logger),
+            "sqlite_bulk": BulkSqliteLoader(
+                bulk_connection, logger, config["data_loader"].get("sqlite_batch_size", 50_000)
+            ),
+        }
+        for index in itertools.count():
+            start = perf_counter()
+            raw_df = next(raw_frames, None)
+            if raw_df is None:
+                break
+            seconds["load"] += perf_counter() - start
+
+            start = perf_counter()
+            df, _ = pipeline.transform(raw_df, source=f"{csv_path.name}[{index}]")
+            seconds["transform"] += perf_counter() - start
+
+            for stage, sales_loader in loaders.items():
+                if stage in stages:
+                    start = perf_counter()
+                    if not sales_loader.load_csv_into_table(df, "sales", "replace" if index == 0 else "append"):
+                        raise RuntimeError(f"Could not load the orders with {type(sales_loader).__name__}")
+                    seconds[stage] += perf_counter() - start
+
+            if {"prepare_data", "fit", "predict"} & set(stages):
+                start = perf_counter()
+                chunk_train, chunk_test = prepare_data(df)
+                seconds["prepare_data"] += perf_counter() - start
+                y_train = chunk_train if y_train is None else y_train.add(chunk_train, fill_value=0)
+                y_test = chunk_test if y_test is None else y_test.add(chunk_test, fill_value=0)
+
+    if {"fit", "predict"} & set(stages):
+        start = perf_counter()
+        forecaster = TrainingPipeline(create_model(), y_train).fit()
+        seconds["fit"] = perf_counter() - start
+        start = perf_counter()
+        InferenceJob(forecaster=forecaster).predict(ForecastingHorizon(y_test.index, is_relative=False))
+        seconds["predict"] = perf_counter() - start
+
+    for step, step_seconds in profiler.summary()["seconds"].items():
+        seconds[f"step.{step}"] = step_seconds
+    return {stage: value for stage, value in seconds.items() if stage in stages or stage.startswith("step.")}
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+    min_seconds: float,
+) -> List[str]:
+    """
+    The stages slower than their baseline by more than `threshold` and by more than `min_seconds`
+
+    Args:
+        results (Dict[str, Dict[str, float]]): the seconds of every stage, per number of rows
+        baseline (Dict[str, Dict[str, float]]): the baseline seconds, per number of rows
+        threshold (float): the relative slowdown reported as a regression
+        min_seconds (float): the absolute slowdown under which timings are noise
+    Returns:
+        List[str]: a description of every regression
+    """
+    regressions = []
+    for rows, stages in results.items():
+        for stage, seconds in stages.items():
+            reference = baseline.get(rows, {}).get(stage)
+            if reference is None:
+                continue
+            if seconds > reference * (1 + threshold) and seconds - reference > min_seconds:
+                regressions.append(
+                    f"{int(rows):>11,d} rows  {stage:<35}  {reference:9.3f} s -> {seconds:9.3f} s  "
+                    f"({seconds / reference - 1:+.0%})"
+                )
+    return regressions
+
+
+def time_rows(
+    n_rows: int, args, config: dict, work_dir: Path, baseline: Dict[str, Dict[str, float]]
+) -> Dict[str, float]:
+    """
+    The best seconds of every stage over `args.repeat` runs on `n_rows` synthetic order lines
+
+    Args:
+        n_rows (int): the number of order lines
+        args: the command line arguments
+        config (dict): the data processing config
+        work_dir (Path): the directory of the synthetic csv file and of the databases
+        baseline (Dict[str, Dict[str, float]]): the baseline seconds, per number of rows
+    Returns:
+        Dict[str, float]: the best seconds of every stage
+    """
+    start = perf_counter()
+    csv_path = write_orders_csv(work_dir / f"orders_{n_rows}.csv", n_rows)
+    print(f"{n_rows:>11,d} rows  generated in {perf_counter() - start:.1f} s")
+    best: Dict[str, float] = {}
+    for _ in range(args.repeat):
+        for stage, seconds in run_stages(csv_path, config, work_dir, args.stages, args.chunksize).items():
+            best[stage] = min(best.get(stage, float("inf")), seconds)
+    for stage, seconds in best.items():
+        reference = baseline.get(str(n_rows), {}).get(stage)
+        versus = f"  baseline {reference:9.3f} s ({seconds / reference - 1:+.0%})" if reference else ""
+        print(f"{n_rows:>11,d} rows  {stage:<35}  {seconds:9.3f} s  {n_rows / seconds:>12,.0f} rows/s{versus}")
+    csv_path.unlink()
+    return {stage: round(seconds, 4) for stage, seconds in best.items()}
+
+
+def write_json(path: Path, report: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def main():
+    args = cli()
+    config = load_config(args.config_path)
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    threshold = args.threshold if args.threshold is not None else baseline.get("threshold", 0.25)
+    min_seconds = args.min_seconds if args.min_seconds is not None else baseline.get("min_seconds", 0.05)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = Path(args.work_dir or tmp_dir)
+        results = {
+            str(n_rows): time_rows(n_rows, args, config, work_dir, baseline.get("results", {}))
+            for n_rows in args.rows
+        }
+
+    report = {
+        "machine": machine_info(),
+        "chunksize": args.chunksize,
+        "threshold": threshold,
+        "min_seconds": min_seconds,
+        "results": results,
+    }
+    if args.output:
+        write_json(Path(args.output), report)
+    if args.update_baseline:
+        write_json(baseline_path, {**report, "results": {**baseline.get("results", {}), **results}})
+        print(f"Baseline written to {baseline_path}")
+        return
+    if baseline and baseline.get("machine") != report["machine"]:
+        print("The baseline was recorded on another machine or with other libraries, compare with care")
+    if baseline and baseline.get("chunksize") != args.chunksize:
+        print("The baseline was recorded with another chunksize, compare with care")
+    regressions = compare(results, baseline.get("results", {}), threshold, min_seconds)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
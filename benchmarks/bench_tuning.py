@@ -0,0 +1,90 @@
+import os
+from argparse import ArgumentParser
+from time import perf_counter
+
+import numpy as np
+from sktime.forecasting.model_selection import ExpandingWindowSplitter
+
+from sales_prediction.jobs.hyperparams_tuning import TuningHyperParamsJob
+from sales_prediction.training_pipeline.hyperparmaters_tuning import SharedTransformSearchCV
+from sales_prediction.training_pipeline.data_prep import load_daily_sales, split_daily_sales
+from sales_prediction.training_pipeline.modelling import create_tuning_model
+from sales_prediction.utils import load_config
+
+PARAM_GRID = {
+    "forecaster__estimator__learning_rate": [0.1, 0.05, 0.01],
+    "forecaster__estimator__l2_regularization": [0.1, 0.01],
+}
+LARGE_PARAM_GRID = {
+    "forecaster__estimator__learning_rate": [0.2, 0.1, 0.05, 0.01],
+    "forecaster__estimator__l2_regularization": [1.0, 0.1, 0.01, 0.0],
+    "forecaster__estimator__max_leaf_nodes": [7, 15, 31],
+}
+
+
+def cli():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--config_path",
+        "-c",
+        type=str,
+        required=False,
+        help="Path to the forecasting config file.",
+        default="src/config/forecasting_config.yaml",
+    )
+    parser.add_argument(
+        "--n_jobs",
+        "-j",
+        type=int,
+        required=False,
+        help="Number of workers of the parallel modes.",
+        default=os.cpu_count(),
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = cli()
+    config = load_config.load_config(args.config_path)
+    daily_sales = load_daily_sales(
+        config.get("csv_path"), config.get("parquet_path"), config.get("db_name")
+    )
+    df_train, _ = split_daily_sales(daily_sales)
+    cv = ExpandingWindowSplitter(fh=4, initial_window=30, step_length=7)
+    modes = {
+        "sktime, serial": dict(backend=None),
+        f"sktime, loky x{args.n_jobs}": dict(backend="loky", n_jobs=args.n_jobs),
+        "shared transforms, serial": dict(backend=None, share_transforms=True),
+        f"shared transforms, loky x{args.n_jobs}": dict(
+            backend="loky", n_jobs=args.n_jobs, share_transforms=True
+        ),
+    }
+    n_folds = cv.get_n_splits(df_train)
+    n_candidates = len(PARAM_GRID["forecaster__estimator__learning_rate"]) * len(
+        PARAM_GRID["forecaster__estimator__l2_regularization"]
+    )
+    print(f"{n_candidates} candidates x {n_folds} folds, {os.cpu_count()} cores")
+    for name, kwargs in modes.items():
+        job = TuningHyperParamsJob(create_tuning_model(), cv, PARAM_GRID, **kwargs)
+        start = perf_counter()
+        search_cv = job.run(df_train)
+        elapsed = perf_counter() - start
+        print(f"{name:28s} {elapsed:8.1f} s  best score {search_cv.best_score_:.6f}  {search_cv.best_params_}")
+    n_large = int(np.prod([len(values) for values in LARGE_PARAM_GRID.values()]))
+    print(f"{n_large} candidates x {n_folds} folds")
+    for searchers in ["grid", "halving"]:
+        job = TuningHyperParamsJob(
+            create_tuning_model(), cv, LARGE_PARAM_GRID, searchers=searchers,
+            backend="loky", n_jobs=args.n_jobs, share_transforms=True,
+        )
+        start = perf_counter()
+        search_cv = job.run(df_train)
+        elapsed = perf_counter() - start
+        full_score = SharedTransformSearchCV(create_tuning_model(), cv, {}, backend=None).score(
+            df_train, [search_cv.best_params_]
+        ).mean()
+        print(f"{searchers:28s} {elapsed:8.1f} s  score on all folds {full_score:.6f}  {search_cv.best_params_}")
+
+
+if __name__ == "__main__":
+    main()
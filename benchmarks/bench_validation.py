@@ -0,0 +1,70 @@
+import logging
+from argparse import ArgumentParser
+from pathlib import Path
+
+import pandas as pd
+
+from run_data_pipeline import build_transformation_pipeline
+from sales_prediction.data_processing.validate_ouput import SALES_OUTPUT_VALIDATOR
+from sales_prediction.utils.load_config import load_config
+from timing import best_time
+
+
+def cli():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--data_dir",
+        "-d",
+        type=str,
+        required=False,
+        help="Directory holding the monthly Sales_*_2019.csv files.",
+        default="data/processed_csv_file",
+    )
+    parser.add_argument(
+        "--config_path",
+        "-c",
+        type=str,
+        required=False,
+        help="Path to the data processing config file.",
+        default="src/config/data_processing_config.yaml",
+    )
+    parser.add_argument(
+        "--copies",
+        "-n",
+        type=int,
+        nargs="+",
+        required=False,
+        help="Sizes to time, as numbers of copies of the 2019 orders.",
+        default=[1, 6, 12],
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        required=False,
+        help="Number of timed runs per size, the best one is reported.",
+        default=3,
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = cli()
+    pipeline = build_transformation_pipeline(load_config(args.config_path), logging.getLogger(__name__))
+    raw_df = pd.concat(
+        [pd.read_csv(csv_file_path) for csv_file_path in sorted(Path(args.data_dir).glob("Sales_*_2019.csv"))],
+        ignore_index=True,
+    )
+    df, _ = pipeline.transform(raw_df)
+    for copies in args.copies:
+        frame = pd.concat([df] * copies, ignore_index=True)
+        best = best_time(lambda: SALES_OUTPUT_VALIDATOR.validate(frame), args.repeat)
+        report = SALES_OUTPUT_VALIDATOR.validate(frame)
+        print(
+            f"{len(frame):>10,d} rows  {best * 1000:8.1f} ms  {len(frame) / best / 1e6:6.2f} M rows/s  "
+            f"{len(report.violations)} violated checks"
+        )
+
+
+if __name__ == "__main__":
+    main()
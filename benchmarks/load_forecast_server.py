@@ -0,0 +1,101 @@
+import asyncio
+import json
+import random
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def cli():
+    parser = ArgumentParser(
+        description="Load test of a running forecast server (python -m sales_prediction.jobs.serving)."
+    )
+    parser.add_argument("--host", type=str, required=False, default="127.0.0.1")
+    parser.add_argument("--port", "-p", type=int, required=False, default=8000)
+    parser.add_argument(
+        "--concurrency",
+        "-n",
+        type=int,
+        required=False,
+        help="Number of clients sending requests at the same time.",
+        default=16,
+    )
+    parser.add_argument(
+        "--requests",
+        "-r",
+        type=int,
+        required=False,
+        help="Number of requests sent by each client.",
+        default=50,
+    )
+    parser.add_argument("--seed", type=int, required=False, default=42)
+    return parser.parse_args()
+
+
+async def get(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str, path: str
+) -> Tuple[int, Dict]:
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    content_length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            content_length = int(value)
+    return status, json.loads(await reader.readexactly(content_length))
+
+
+async def client(host: str, port: int, requests: int, rng: random.Random) -> List[float]:
+    reader, writer = await asyncio.open_connection(host, port)
+    latencies = []
+    try:
+        for _ in range(requests):
+            start = pd.Timestamp("2020-01-01") + pd.Timedelta(days=rng.randrange(0, 120))
+            end = start + pd.Timedelta(days=rng.randrange(6, 60))
+            path = f"/forecast?start={start:%Y-%m-%d}&end={end:%Y-%m-%d}"
+            sent = perf_counter()
+            status, body = await get(reader, writer, host, path)
+            latencies.append(perf_counter() - sent)
+            if status != 200:
+                raise RuntimeError(f"{path} answered {status}: {body}")
+    finally:
+        writer.close()
+    return latencies
+
+
+async def run(args) -> None:
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    _, before = await get(reader, writer, args.host, "/health")
+    rng = random.Random(args.seed)
+    clients = [
+        client(args.host, args.port, args.requests, random.Random(rng.random()))
+        for _ in range(args.concurrency)
+    ]
+    start = perf_counter()
+    results = await asyncio.gather(*clients)
+    elapsed = perf_counter() - start
+    _, after = await get(reader, writer, args.host, "/health")
+    writer.close()
+    latencies = np.array([latency for latencies in results for latency in latencies]) * 1000
+    batches = after["batches"] - before["batches"]
+    requests = after["requests"] - before["requests"]
+    print(f"{len(latencies)} requests from {args.concurrency} clients in {elapsed:.2f}s")
+    print(f"throughput: {len(latencies) / elapsed:8.1f} requests/s")
+    print(f"p50:        {np.percentile(latencies, 50):8.1f} ms")
+    print(f"p99:        {np.percentile(latencies, 99):8.1f} ms")
+    print(f"batches:    {batches} ({requests / max(batches, 1):.1f} requests per batch)")
+
+
+def main():
+    asyncio.run(run(cli()))
+
+
+if __name__ == "__main__":
+    main()
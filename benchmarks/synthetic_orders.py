@@ -0,0 +1,153 @@
+from pathlib import Path
+from typing import Iterator, Union
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["Order ID", "Product", "Quantity Ordered", "Price Each", "Order Date", "Purchase Address"]
+PRODUCTS = {
+    "USB-C Charging Cable": (11.95, 0.1178),
+    "Lightning Charging Cable": (14.95, 0.1165),
+    "AAA Batteries (4-pack)": (2.99, 0.1110),
+    "AA Batteries (4-pack)": (3.84, 0.1107),
+    "Wired Headphones": (11.99, 0.1015),
+    "Apple Airpods Headphones": (150.0, 0.0836),
+    "Bose SoundSport Headphones": (99.99, 0.0717),
+    "27in FHD Monitor": (149.99, 0.0404),
+    "iPhone": (700.0, 0.0368),
+    "27in 4K Gaming Monitor": (389.99, 0.0335),
+    "34in Ultrawide Monitor": (379.99, 0.0332),
+    "Google Phone": (600.0, 0.0297),
+    "Flatscreen TV": (300.0, 0.0258),
+    "Macbook Pro Laptop": (1700.0, 0.0254),
+    "ThinkPad Laptop": (999.99, 0.0222),
+    "20in Monitor": (109.99, 0.0221),
+    "Vareebadd Phone": (400.0, 0.0111),
+    "LG Washing Machine": (600.0, 0.0036),
+    "LG Dryer": (600.0, 0.0035),
+}
+CITIES = [
+    "Atlanta, GA 30301",
+    "Austin, TX 73301",
+    "Boston, MA 02215",
+    "Dallas, TX 75001",
+    "Los Angeles, CA 90001",
+    "New York City, NY 10001",
+    "Portland, ME 04101",
+    "Portland, OR 97035",
+    "San Francisco, CA 94016",
+    "Seattle, WA 98101",
+]
+CITY_WEIGHTS = [0.08, 0.053, 0.107, 0.08, 0.159, 0.134, 0.013, 0.054, 0.24, 0.08]
+STREETS = [
+    f"{name} St"
+    for name in [
+        "1st", "2nd", "4th", "5th", "6th", "7th", "8th", "9th", "10th", "11th", "12th", "13th",
+        "14th", "Adams", "Cedar", "Center", "Cherry", "Chestnut", "Church", "Dogwood", "Elm",
+        "Forest", "Hickory", "Highland", "Hill", "Jackson", "Jefferson", "Johnson", "Lake",
+        "Lakeview", "Lincoln", "Madison", "Main", "Maple", "Meadow", "Mill", "North", "Oak",
+        "Park", "Pine", "Ridge", "River", "South", "Spruce", "Sunset", "Walnut", "Washington", "West",
+    ]
+]
+
+
+def generate_orders(
+    n_rows: int,
+    seed: int = 0,
+    start: str = "2019-01-01",
+    end: str = "2020-01-01 06:00",
+    first_order_id: int = 141234,
+    blank_rate: float = 0.003,
+    header_rate: float = 0.002,
+) -> pd.DataFrame:
+    """
+    Raw order lines with the schema and the defects of the Sales_*_2019.csv files
+
+    Dates are minutes drawn uniformly between `start` and `end`, formatted '%m/%d/%y %H:%M'.
+    Products, quantities, cities and multi-line orders follow the 2019 frequencies. A
+    `blank_rate` share of the lines is empty and a `header_rate` share repeats the header,
+    as in the monthly files.
+
+    Args:
+        n_rows (int): the number of lines
+        seed (int): the seed of the random generator
+        start (str): the first possible order minute
+        end (str): the end of the order period, excluded
+        first_order_id (int): the id of the first order
+        blank_rate (float): the share of empty lines
+        header_rate (float): the share of repeated header lines
+    Returns:
+        pd.DataFrame: the raw order lines, every column as text
+    """
+    rng = np.random.default_rng(seed)
+    minutes = pd.date_range(start, end, freq="min", inclusive="left")
+    products = list(PRODUCTS)
+    prices = np.array([price for price, _ in PRODUCTS.values()])
+    weights = np.array([weight for _, weight in PRODUCTS.values()])
+    product_codes = rng.choice(len(products), size=n_rows, p=weights / weights.sum())
+    quantities = np.minimum(rng.geometric(0.9, size=n_rows), 9)
+    order_ids = first_order_id + np.cumsum(rng.random(n_rows) > 0.04) - 1
+    minute_codes = rng.integers(0, len(minutes), size=n_rows)
+    city_codes = rng.choice(len(CITIES), size=n_rows, p=np.array(CITY_WEIGHTS) / sum(CITY_WEIGHTS))
+    street_codes = rng.integers(0, len(STREETS), size=n_rows)
+    numbers = rng.integers(1, 1000, size=n_rows)
+
+    minute_strings = np.asarray(minutes.strftime("%m/%d/%y %H:%M"), dtype=object)
+    street_strings = np.array(STREETS, dtype=object)
+    city_strings = np.array(CITIES, dtype=object)
+    addresses = (
+        pd.Series(numbers.astype(str), dtype=object) + " " + street_strings[street_codes] + ", "
+        + city_strings[city_codes]
+    )
+    df = pd.DataFrame(
+        {
+            "Order ID": order_ids.astype(str),
+            "Product": np.array(products, dtype=object)[product_codes],
+            "Quantity Ordered": quantities.astype(str),
+            "Price Each": prices[product_codes].astype(str),
+            "Order Date": minute_strings[minute_codes],
+            "Purchase Address": addresses.to_numpy(),
+        }
+    ).astype(object)
+    defects = rng.random(n_rows)
+    df.loc[defects < blank_rate] = np.nan
+    header = (defects >= blank_rate) & (defects < blank_rate + header_rate)
+    df.loc[header] = COLUMNS
+    return df
+
+
+def iter_orders(n_rows: int, chunk_rows: int = 1_000_000, seed: int = 0) -> Iterator[pd.DataFrame]:
+    """
+    Generate `n_rows` order lines a chunk at a time, each chunk drawn with its own seed
+
+    Args:
+        n_rows (int): the total number of lines
+        chunk_rows (int): the number of lines per chunk
+        seed (int): the seed of the first chunk
+    Returns:
+        Iterator[pd.DataFrame]: the chunks, with increasing order ids
+    """
+    first_order_id = 141234
+    for index, chunk_start in enumerate(range(0, n_rows, chunk_rows)):
+        size = min(chunk_rows, n_rows - chunk_start)
+        yield generate_orders(size, seed=seed + index, first_order_id=first_order_id)
+        first_order_id += chunk_rows
+
+
+def write_orders_csv(path: Union[str, Path], n_rows: int, chunk_rows: int = 1_000_000, seed: int = 0) -> Path:
+    """
+    Write `n_rows` synthetic order lines to a csv file without holding them all in memory
+
+    Args:
+        path (Union[str, Path]): the csv file
+        n_rows (int): the number of lines
+        chunk_rows (int): the number of lines generated at a time
+        seed (int): the seed of the random generator
+    Returns:
+        Path: the csv file
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for index, chunk in enumerate(iter_orders(n_rows, chunk_rows, seed)):
+        chunk.to_csv(path, mode="w" if index == 0 else "a", header=index == 0, index=False)
+    return path
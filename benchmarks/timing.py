@@ -0,0 +1,22 @@
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+
+def best_time(function: Callable[..., Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> float:
+    """
+    The best wall time of `repeat` calls to `function`
+
+    Args:
+        function (Callable[..., Any]): the timed call, given the result of `setup` when there is one
+        repeat (int): the number of timed calls
+        setup (Optional[Callable[[], Any]]): prepares the argument of every call, outside the timed part
+    Returns:
+        float: the shortest call, in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        start = perf_counter()
+        function(argument) if setup is not None else function()
+        best = min(best, perf_counter() - start)
+    return best
@@ -1,84 +1,60 @@
-import requests
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import folium
-from folium import plugins
-from folium.plugins import HeatMap
-import geocoder
-import geopy
 import altair as alt
 import math
 from streamlit_folium import st_folium
+from sales_prediction.data_loading.dashboard_data import DashboardData, data_fingerprint, map_points
+from sales_prediction.data_loading.geocode_cache import GeocodeCache
+from sales_prediction.data_loading.sales_cube import SalesCube
+from sales_prediction.utils.db_connector import get_reader
+from sales_prediction.utils.downsampling import downsample, points_budget
+
+US_CENTER = [39.8, -98.6]
+CHART_WIDTH = 900
 
 st.set_page_config("EDA", "📊", layout="wide")
 st.title("Sales Dashboard - 2019")
 
 
-def get_df_by_city(df: pd.DataFrame, cities: list):
-    return df[df["CityName"].isin(cities)]
-
-
-def get_sales_by_product(df: pd.DataFrame, products: list):
-    return df[df["Product"].isin(products)]
-
-
-def get_sales_by_month(df: pd.DataFrame, months: list):
-    return df[df["Month"].isin(months)]
-
-
-def get_street(row):
-    address = "{}, {}".format(row["StreetName"], row["ZipAddress"])
-    return address
-
-
 def get_radius(row, min_value, max_value):
-    radius = math.sqrt((max_value - row["total_sales"]))
-    if row["total_sales"] == max_value:
+    radius = math.sqrt((max_value - row["Sales"]))
+    if row["Sales"] == max_value:
         radius = math.sqrt(max_value - min_value + 1)
     return radius / 10
 
 
-@st.cache_data
-def compute_global_sales_avg(df, sales_col: str, quantity_col: str, price_col: str):
-    total_sales = df[sales_col].sum()
-    avg_quantity = df[quantity_col].mean()
-    avg_price = df[price_col].mean()
-
-    return total_sales, avg_quantity, avg_price
-
-
-def global_difference(value_now: float, value_before: float) -> float:
-    if value_before == 0:
-        return 0
-    return (value_now - value_before) / value_before
+@st.cache_resource(max_entries=1)
+def get_dashboard_data(db_name: str, fingerprint: str) -> DashboardData:
+    reader = get_reader(db_name)
+    return DashboardData.build(SalesCube(reader=reader), geocodes=GeocodeCache(reader=reader).read())
 
 
 @st.cache_data
 def create_heatmap(df_city):
-    top10_df = (
-        df_city.drop_duplicates(subset="street")
-        .sort_values(by="total_sales", ascending=False)
-        .head(10)
-    )
-    center = [top10_df["lat"].values[0], top10_df["long"].values[0]]
-    m = folium.Map(location=center, zoom_start=10)
-    url = "https://raw.githubusercontent.com/python-visualization/folium-example-data/main/us_states.json"
-
-    max_value = top10_df["total_sales"].max()
-    min_value = top10_df["total_sales"].min()
-    geojson = requests.get(url).json()
+    top10_df = map_points(df_city)
+    if top10_df.empty:
+        return folium.Map(location=US_CENTER, zoom_start=4)
+    center = [top10_df["Latitude"].mean(), top10_df["Longitude"].mean()]
+    m = folium.Map(location=center, zoom_start=13)
+
+    max_value = top10_df["Sales"].max()
+    min_value = top10_df["Sales"].min()
     for idx, row in top10_df.iterrows():
         all_loc = []
-        street = row["street"]
-        lat, long = row["lat"], row["long"]
-        total_sales = row["total_sales"]
-        color = "red" if row["total_sales"] == max_value else "blue"
+        label = row["label"]
+        lat, long = row["Latitude"], row["Longitude"]
+        total_sales = row["Sales"]
+        color = "red" if row["Sales"] == max_value else "blue"
+        position = "street" if row["Precision"] == "street" else "zip code centroid, approximate"
         folium.Marker(
             location=[lat, long],
             opacity=0.5,
-            tooltip=f"<body>Street: {street} <br> Sales: {round(total_sales / 1000000, 3)}M</body>",
-            popup=street,
+            tooltip=(
+                f"<body>Street: {label} <br> Sales: {round(total_sales / 1000000, 3)}M"
+                f"<br> Position: {position}</body>"
+            ),
+            popup=label,
         ).add_to(m)
         folium.CircleMarker(
             location=[lat, long],
@@ -106,40 +82,6 @@ def format_number(num):
     return f"{num:.0f}"
 
 
-@st.cache_data
-def calculate_difference(
-    df: pd.DataFrame,
-    time_column: str,
-    value_column: str,
-    group_column: str,
-    time_values: list,
-):
-    diff_df = df.groupby([time_column, group_column], as_index=False).agg(
-        {value_column: "sum"}
-    )
-    diff_df.columns = [
-        time_column,
-        group_column,
-        f"{value_column}_{time_column}_{group_column}",
-    ]
-
-    filtered_df = diff_df[diff_df[time_column].isin(time_values)]
-
-    pivot_df = filtered_df.pivot(
-        index=group_column,
-        columns=time_column,
-        values=f"{value_column}_{time_column}_{group_column}",
-    )
-
-    pivot_df["difference"] = (
-        pivot_df[time_values[-1]] - pivot_df[time_values[0]]
-    ) / pivot_df[time_values[0]]
-
-    result_df = pivot_df.reset_index()
-
-    return result_df
-
-
 def display_metrics(result_df, time_column, group_column):
     max_value = result_df.max()[time_column]
     max_label = result_df.loc[result_df[time_column].idxmax()][group_column]
@@ -153,54 +95,23 @@ def display_metrics(result_df, time_column, group_column):
     st.metric(label=min_label, value=format_number(min_value), delta=min_delta)
 
 
-df = pd.read_csv("data/processed_data/sales_2019.csv", parse_dates=["OrderDate"])
-df = df.set_index(keys=["OrderDate"])
-df_nov = df.loc["2019-11-01":"2019-11-30"]
-df_dec = df.loc["2019-12-01":"2019-12-31"]
-evol_nov = compute_global_sales_avg(
-    df_nov.resample("D").sum(), "Sales", "QuantityOrdered", "PriceEach"
-)
-evol_dec = compute_global_sales_avg(
-    df_dec.resample("D").sum(), "Sales", "QuantityOrdered", "PriceEach"
-)
-differences = [global_difference(dec, nov) for dec, nov in zip(evol_dec, evol_nov)]
-diff_total_sales, diff_avg_quantity, diff_avg_price = differences
-print(diff_total_sales, diff_avg_quantity, diff_avg_price)
-df_by_city_name = df.groupby("CityName")["Sales"].sum(numeric_only=True).reset_index()
-df_by_city_name = df_by_city_name.sort_values(by="Sales", ascending=True)
+db_name = "data/databases/sales.sqlite"
+dashboard_data = get_dashboard_data(db_name, data_fingerprint(db_name))
+with st.sidebar:
+    city = st.selectbox(
+        "Select City", dashboard_data.cities, key="city", on_change=st.rerun
+    )
+city_view = dashboard_data.view(city)
+
+evol_dec = dashboard_data.monthly_metrics.loc["current"].tolist()
+diff_total_sales, diff_avg_quantity, diff_avg_price = dashboard_data.monthly_difference()
+df_by_city_name = dashboard_data.city_sales
 metric_col = st.columns(3, gap="large")
 tseries_col = st.columns(1)
 click = alt.selection_point(encodings=["color"])
 col = st.columns((3, 4.5, 3), gap="medium")
 with st.sidebar:
-    city = st.selectbox(
-        "Select City", df["CityName"].unique(), key="city", on_change=st.rerun
-    )
-
-    df_city = get_df_by_city(df, [city])
-    sales_by_day = df_city.groupby("Product")["Sales"].sum().reset_index()
-    sales_by_day = sales_by_day.sort_values(by="Sales", ascending=True)
-    df_city = df[df["CityName"] == city].copy()
-    df_city["street"] = df_city.apply(get_street, axis=1)
-    diff_df = df_city.groupby(["Month", "street"], as_index=False).agg(
-        sales_month_street=("Sales", "sum")
-    )
-    nov_dec_df = diff_df[diff_df["Month"].isin([11, 12])]
-    pivot_df = nov_dec_df.pivot(
-        index="street", columns="Month", values="sales_month_street"
-    )
-    pivot_df["difference"] = (pivot_df[12] - pivot_df[11]) / pivot_df[11]
-    result_df = pivot_df.reset_index()
-
-    total_sales = df_city.groupby(["street"], as_index=False).agg(
-        total_sales=("Sales", "sum")
-    )
-    df_city = df_city.merge(total_sales, on="street", how="right")
-    df_city = df_city.dropna()
-
-    diff_product_df = calculate_difference(
-        df_city, "Month", "Sales", "Product", [11, 12]
-    )
+    sales_by_day = city_view.products.sort_values(by="Sales", ascending=True)
     color = alt.Color(
         "Sales", scale=alt.Scale(scheme="spectral"), legend=None, type="quantitative"
     )
@@ -221,7 +132,7 @@ with st.sidebar:
                 """,
             unsafe_allow_html=True,
         )
-        display_metrics(result_df, 12, "street")
+        display_metrics(city_view.streets, "current", "street")
     with metric_col[1]:
         st.write(
             """
@@ -231,7 +142,7 @@ with st.sidebar:
             ),
             unsafe_allow_html=True,
         )
-        display_metrics(diff_product_df, 12, "Product")
+        display_metrics(city_view.products, "current", "Product")
 
     with metric_col[2]:
         left_col, sales_col, right_col = st.columns(3)
@@ -290,7 +201,7 @@ with st.sidebar:
                 """,
             unsafe_allow_html=True,
         )
-        st_folium(create_heatmap(df_city=df_city), width=400, height=400)
+        st_folium(create_heatmap(df_city=city_view.streets), width=400, height=400)
     with col[2]:
         st.write(
             """
@@ -307,13 +218,13 @@ st.write(
         """,
     unsafe_allow_html=True,
 )
-sales_by_day = get_df_by_city(df, [city]).resample("D").sum(numeric_only=True)
+sales_by_day = downsample(city_view.daily_sales["Sales"], points_budget(CHART_WIDTH)).to_frame()
 fig = px.line(
     sales_by_day,
     x=sales_by_day.index,
     y="Sales",
     markers=True,
-    width=900,
+    width=CHART_WIDTH,
     height=400,
 )
 st.plotly_chart(fig)
@@ -4,25 +4,40 @@ import plotly.express as px
 
 from src.sales_prediction.jobs.inference import InferenceJob
 from sktime.forecasting.base import ForecastingHorizon
-from sales_prediction.training_pipeline.data_prep import prepare_data
+from sales_prediction.training_pipeline.data_prep import load_daily_sales, split_daily_sales
 from sales_prediction.utils import load_config
+from sales_prediction.utils.downsampling import downsample, points_budget
+from sales_prediction.utils.forecast_cache import ForecastCache
 
+
+@st.cache_resource
+def get_forecast_cache(db_name: str) -> ForecastCache:
+    return ForecastCache(db_name)
+
+
+CHART_WIDTH = 900
 start_date = "2020-01-01"
 end_date = "2020-06-01"
 date_range = pd.date_range(start=start_date, end=end_date, freq="D")
 fh_2020 = ForecastingHorizon(date_range, is_relative=False)
 config_path = "src/config/forecasting_config.yaml"
-df = pd.read_csv("data/processed_data/sales_2019.csv", parse_dates=["OrderDate"])
-_, validate_df = prepare_data(df)
 config = load_config.load_config(config_path)
+daily_sales = load_daily_sales(
+    config.get("csv_path"), config.get("parquet_path"), config.get("db_name")
+)
+_, validate_df = split_daily_sales(daily_sales)
 st.set_page_config("ML Forecasting", "📊")
 st.title("ML Forecasting")
-forecaster = InferenceJob.from_path(config.get("model_path2"))
+forecaster = InferenceJob.from_path(
+    config.get("model_path2"), cache=get_forecast_cache(config.get("forecast_cache_path"))
+)
 fh_validate = ForecastingHorizon(validate_df.index, is_relative=False)
-past_prediction = forecaster.predict(fh=fh_validate).resample("D").sum()
-y_pred = forecaster.predict(fh=fh_2020)
-y_pred = y_pred.resample("D").sum()
-fig = px.line(title="Predicted vs Actual Sales by day", width=900, height=400)
+past_prediction, y_pred = forecaster.predict_many([fh_validate, fh_2020])
+max_points = points_budget(CHART_WIDTH)
+past_prediction = downsample(past_prediction.resample("D").sum(), max_points)
+y_pred = downsample(y_pred.resample("D").sum(), max_points)
+validate_df = downsample(validate_df, max_points)
+fig = px.line(title="Predicted vs Actual Sales by day", width=CHART_WIDTH, height=400)
 fig.add_scatter(
     y=validate_df.values, x=validate_df.index, mode="lines+markers", name="Actual Sales"
 )
@@ -1,5 +1,9 @@
+import logging
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from argparse import ArgumentParser
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import pandas as pd
 import shutil as sht
@@ -9,8 +13,14 @@ from sales_prediction.utils.csv_to_dataframe import DataLoader
 
 
 from sales_prediction.data_processing.features_engineering import FeatureEngineeringPipeline
+from sales_prediction.data_processing.instrumentation import StepProfiler
 from sales_prediction.data_loading import loadCsv
-from sales_prediction.utils.db_connector import sqlite_connector
+from sales_prediction.data_loading.csv_output import CsvOutput
+from sales_prediction.data_loading.geocode_cache import Gazetteer, GeocodeCache
+from sales_prediction.data_loading.manifest import IngestionManifest
+from sales_prediction.data_loading.parquet_output import ParquetOutput
+from sales_prediction.data_loading.sales_cube import SalesCube
+from sales_prediction.utils.db_connector import bump_load_version, sqlite_connector
 from sales_prediction.data_processing.features_engineering import (
     ColumnRenaming,
     DataCleaner,
@@ -39,64 +49,447 @@ def parse_args():
         help="Path to the input config file.",
         default="data/processed_data/sales_2019.csv",
     )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        required=False,
+        help="Number of worker processes used to transform the raw files in parallel.",
+        default=None,
+    )
+    parser.add_argument(
+        "--chunksize",
+        "-cs",
+        type=int,
+        required=False,
+        help="Stream each raw file through the pipeline in chunks of this many rows.",
+        default=None,
+    )
+    parser.add_argument(
+        "--incremental",
+        "-i",
+        action="store_true",
+        help="Only load new or changed raw files, based on the ingestion manifest.",
+    )
+    parser.add_argument(
+        "--profile_path",
+        "-p",
+        type=str,
+        required=False,
+        help="Run the transformation steps under cProfile and write its stats to this file.",
+        default=None,
+    )
+    parser.add_argument(
+        "--trace_memory",
+        "-tm",
+        action="store_true",
+        help="Trace the peak memory of every transformation step with tracemalloc.",
+    )
     return parser.parse_args()
 
 
-def main():
-    log_dict = load_config("src/config/log.yaml")
-    data_pipeline_logger = Logging(name="run_data_pipeline", log_dict=log_dict).logger
-    args = parse_args()
-    config = load_config(args.config_path)
+def build_transformation_pipeline(
+    config: dict, logger: logging.Logger, profiler: Optional[StepProfiler] = None
+) -> FeatureEngineeringPipeline:
+    """
+    Build the feature engineering pipeline described by the data processing config
+
+    Args:
+        config (dict): the data processing config
+        logger (logging.Logger): the logger used by the pipeline
+        profiler (Optional[StepProfiler]): measures every step when given
+    Returns:
+        FeatureEngineeringPipeline: the transformation pipeline
+    """
     column_to_rename = config.get("column_renaming", {}).get("column_name_dict", {})
     data_types_map = config.get("data_types_mapping", {})
-    output_path = config.get("data_loader", {}).get("output_path", "")
     sales_column_adder = config.get("sales_column_adder", {})
     quantity_column = sales_column_adder.get("quantity_column", "")
     price_column = sales_column_adder.get("price_column", "")
     address_feature_engineering = config.get("address_feature_engineering", {})
     address_column_name = address_feature_engineering.get("address_column_name", "")
     target_columns = address_feature_engineering.get("target_columns", [])
+    address_delimiter = address_feature_engineering.get("delimiter", ", ")
+    address_cached = address_feature_engineering.get("cached", False)
     date_feature_engineering = config.get("date_feature_engineering", {})
     date_column = date_feature_engineering.get("date_column_name", "")
-    error_folder_path = config.get("data_loader").get("error_folder_path")
-    processed_csv_folder = config.get("data_loader").get("processed_csv_folder")
-    Path(processed_csv_folder).mkdir(parents=True, exist_ok=True)
-    Path(error_folder_path).mkdir(parents=True, exist_ok=True)
-    transformation_pipeline = FeatureEngineeringPipeline(
+    date_format = date_feature_engineering.get("date_format", "%m/%d/%y %H:%M")
+    date_cached = date_feature_engineering.get("cached", False)
+    return FeatureEngineeringPipeline(
         [
             DataCleaner(),
             ColumnRenaming(column_to_rename),
             DataTypeConverter(data_types_map),
             SalesColumnAdder(quantity_column, price_column),
-            DateFeatureEngineering(date_column),
-            AddressFeatureEngineering(address_column_name, target_columns),
-        ], logger=data_pipeline_logger
+            DateFeatureEngineering(date_column, date_format, cached=date_cached),
+            AddressFeatureEngineering(
+                address_column_name, target_columns, address_delimiter, cached=address_cached
+            ),
+        ], logger=logger, profiler=profiler
+    )
+
+
+def transform_file(csv_file_path: Path, transformation_pipeline: FeatureEngineeringPipeline) -> pd.DataFrame:
+    """
+    Load a raw csv file and run it through the transformation pipeline
+
+    Args:
+        csv_file_path (Path): the raw csv file
+        transformation_pipeline (FeatureEngineeringPipeline): the transformation pipeline
+    Returns:
+        pd.DataFrame: the transformed data, tagged with the name of the raw file
+    """
+    raw_df = DataLoader(csv_file_path).load_data()
+    df, _ = transformation_pipeline.transform(df=raw_df, source=csv_file_path.name)
+    df["SourceFile"] = csv_file_path.name
+    return df
+
+
+def transform_file_in_worker(
+    csv_file_path: Path, transformation_pipeline: FeatureEngineeringPipeline
+) -> Tuple[pd.DataFrame, List[Dict]]:
+    """
+    Transform a raw csv file in a worker process, returning the step metrics recorded there
+
+    Args:
+        csv_file_path (Path): the raw csv file
+        transformation_pipeline (FeatureEngineeringPipeline): the transformation pipeline
+    Returns:
+        Tuple[pd.DataFrame, List[Dict]]: the transformed data and the step metrics
+    """
+    df = transform_file(csv_file_path, transformation_pipeline)
+    profiler = transformation_pipeline.profiler
+    return df, profiler.records if profiler is not None else []
+
+
+def stream_file(
+    csv_file_path: Path, transformation_pipeline: FeatureEngineeringPipeline, chunksize: int
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a raw csv file through the transformation pipeline `chunksize` rows at a time
+
+    Args:
+        csv_file_path (Path): the raw csv file
+        transformation_pipeline (FeatureEngineeringPipeline): the transformation pipeline
+        chunksize (int): the number of rows per chunk
+    Returns:
+        Iterator[pd.DataFrame]: the transformed chunks, tagged with the name of the raw file
+    """
+    chunks = DataLoader(csv_file_path).load_chunks(chunksize)
+    for df in transformation_pipeline.transform_chunks(chunks, source=csv_file_path.name):
+        df["SourceFile"] = csv_file_path.name
+        yield df
+
+
+def transform_files(
+    csv_files: List[Path],
+    transformation_pipeline: FeatureEngineeringPipeline,
+    workers: int = 1,
+    chunksize: Optional[int] = None,
+) -> Iterator[Tuple[Path, Iterable[pd.DataFrame], Optional[Exception]]]:
+    """
+    Transform the raw csv files, in a process pool when `workers` is greater than one
+
+    Results are yielded in the order of `csv_files` whatever the order in which the
+    workers finish, so the merged output does not depend on the scheduling. When
+    `chunksize` is set the files are streamed one after the other and the transformed
+    chunks are produced lazily, while they are being written.
+
+    Args:
+        csv_files (List[Path]): the raw csv files
+        transformation_pipeline (FeatureEngineeringPipeline): the transformation pipeline
+        workers (int): the number of worker processes
+        chunksize (Optional[int]): the number of rows per chunk in streaming mode
+    Returns:
+        Iterator[Tuple[Path, Iterable[pd.DataFrame], Optional[Exception]]]: the file, the
+        transformed data and the error raised while processing it
+    """
+    if chunksize:
+        for csv_file_path in csv_files:
+            yield csv_file_path, stream_file(csv_file_path, transformation_pipeline, chunksize), None
+        return
+    if workers <= 1:
+        for csv_file_path in csv_files:
+            try:
+                yield csv_file_path, [transform_file(csv_file_path, transformation_pipeline)], None
+            except Exception as e:
+                yield csv_file_path, [], e
+        return
+    yield from transform_files_in_pool(csv_files, transformation_pipeline, workers)
+
+
+def transform_files_in_pool(
+    csv_files: List[Path], transformation_pipeline: FeatureEngineeringPipeline, workers: int
+) -> Iterator[Tuple[Path, Iterable[pd.DataFrame], Optional[Exception]]]:
+    """
+    Transform the raw csv files in a process pool, collecting the step metrics of the workers
+
+    Args:
+        csv_files (List[Path]): the raw csv files
+        transformation_pipeline (FeatureEngineeringPipeline): the transformation pipeline
+        workers (int): the number of worker processes
+    Returns:
+        Iterator[Tuple[Path, Iterable[pd.DataFrame], Optional[Exception]]]: the file, the
+        transformed data and the error raised while processing it, in the order of `csv_files`
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(transform_file_in_worker, csv_file_path, transformation_pipeline)
+            for csv_file_path in csv_files
+        ]
+        for csv_file_path, future in zip(csv_files, futures):
+            try:
+                df, records = future.result()
+            except Exception as e:
+                yield csv_file_path, [], e
+                continue
+            if transformation_pipeline.profiler is not None:
+                transformation_pipeline.profiler.records.extend(records)
+            yield csv_file_path, [df], None
+
+
+def write_file(
+    csv_file_path: Path,
+    frames: Iterable[pd.DataFrame],
+    file_outputs: List[Union[CsvOutput, ParquetOutput, SalesCube, GeocodeCache]],
+    sales_loader: loadCsv.BulkSqliteLoader,
+    table_name: str,
+    replace: bool,
+) -> int:
+    """
+    Write the transformed data of a raw file to the outputs and the SQLite table
+
+    If writing fails half-way, the rows already written for this file are removed
+    before the error is raised again.
+
+    Args:
+        csv_file_path (Path): the raw csv file
+        frames (Iterable[pd.DataFrame]): the transformed data
+        file_outputs (List[Union[CsvOutput, ParquetOutput, SalesCube, GeocodeCache]]): the csv,
+            Parquet, aggregate and geocoding outputs
+        sales_loader (loadCsv.BulkSqliteLoader): the SQLite loader
+        table_name (str): the name of the sales table
+        replace (bool): rebuild the outputs from this file instead of appending to them
+    Returns:
+        int: the number of rows written
+    """
+    row_count = 0
+    try:
+        for df in frames:
+            for file_output in file_outputs:
+                if replace and not row_count:
+                    file_output.reset()
+                file_output.append(df)
+            if not sales_loader.load_csv_into_table(
+                table_name=table_name, df=df, if_exists="replace" if replace and not row_count else "append"
+            ):
+                raise RuntimeError(f"Could not load {csv_file_path.name} into {table_name}")
+            row_count += len(df)
+    except Exception:
+        sales_loader.delete_source_rows(table_name, csv_file_path.name)
+        for file_output in file_outputs:
+            file_output.delete_source_rows(csv_file_path.name)
+        raise
+    return row_count
+
+
+def build_profiler(config: dict, args, logger: logging.Logger) -> Optional[StepProfiler]:
+    """
+    Build the step profiler when the instrumentation is enabled in the config or asked for on the command line
+
+    Args:
+        config (dict): the data processing config
+        args: the command line arguments
+        logger (logging.Logger): the logger the step metrics are written to
+    Returns:
+        Optional[StepProfiler]: the profiler, None when the instrumentation is off
+    """
+    instrumentation = config.get("instrumentation", {})
+    if not (instrumentation.get("enabled", False) or args.profile_path or args.trace_memory):
+        return None
+    return StepProfiler(
+        logger=logger,
+        metrics_path=instrumentation.get("metrics_path"),
+        trace_memory=args.trace_memory or instrumentation.get("trace_memory", False),
+        profile_path=args.profile_path or instrumentation.get("profile_path"),
+        sample_size=instrumentation.get("sample_size", 1_000),
     )
+
+
+def build_file_outputs(
+    config: dict, connection: sqlite3.Connection
+) -> List[Union[CsvOutput, ParquetOutput, SalesCube, GeocodeCache]]:
+    """
+    Build the outputs every transformed file is appended to, besides the sales table
+
+    Args:
+        config (dict): the data processing config
+        connection (sqlite3.Connection): the connection to the database of the pipeline
+    Returns:
+        List[Union[CsvOutput, ParquetOutput, SalesCube, GeocodeCache]]: the csv, Parquet,
+        aggregate and geocoding outputs
+    """
+    data_loader = config.get("data_loader", {})
+    file_outputs = [CsvOutput(data_loader.get("output_path", ""))]
+    if data_loader.get("parquet_output_path"):
+        file_outputs.append(ParquetOutput(data_loader.get("parquet_output_path")))
+    if data_loader.get("build_aggregates", False):
+        file_outputs.append(SalesCube(connection))
+    geocoding = config.get("geocoding", {})
+    if geocoding.get("gazetteer_path"):
+        file_outputs.append(
+            GeocodeCache(
+                connection,
+                Gazetteer.from_geojson(geocoding.get("gazetteer_path")),
+                table_name=geocoding.get("table_name", "geocodes"),
+                batch_size=geocoding.get("batch_size", 1000),
+            )
+        )
+    return file_outputs
+
+
+def sort_files(
+    csv_files: List[Path], manifest: IngestionManifest, incremental: bool
+) -> Dict[Path, Tuple[str, Tuple[int, str]]]:
+    """
+    Sort the raw files into NEW, CHANGED and UNCHANGED ones against the ingestion manifest
+
+    Args:
+        csv_files (List[Path]): the raw csv files
+        manifest (IngestionManifest): the ingestion manifest
+        incremental (bool): compare with the manifest, otherwise every file is NEW
+    Returns:
+        Dict[Path, Tuple[str, Tuple[int, str]]]: the status and the fingerprint of every file
+    """
+    statuses = {}
+    for csv_file_path in csv_files:
+        fingerprint = manifest.fingerprint(csv_file_path)
+        status = manifest.status(csv_file_path.name, *fingerprint) if incremental else IngestionManifest.NEW
+        statuses[csv_file_path] = (status, fingerprint)
+    return statuses
+
+
+def skip_unchanged_files(
+    statuses: Dict[Path, Tuple[str, Tuple[int, str]]], processed_csv_folder: str, logger: logging.Logger
+) -> List[Path]:
+    """
+    Move the UNCHANGED raw files to the processed folder without loading them again
+
+    Args:
+        statuses (Dict[Path, Tuple[str, Tuple[int, str]]]): the status and the fingerprint of every file
+        processed_csv_folder (str): the folder of the processed raw files
+        logger (logging.Logger): the logger of the pipeline
+    Returns:
+        List[Path]: the NEW and CHANGED files, still to load
+    """
+    csv_files = []
+    for csv_file_path, (status, _) in statuses.items():
+        if status == IngestionManifest.UNCHANGED:
+            logger.info(f"file: {csv_file_path.name} already loaded, skipping")
+            sht.move(str(csv_file_path), f"{processed_csv_folder}/{csv_file_path.name}")
+        else:
+            csv_files.append(csv_file_path)
+    return csv_files
+
+
+def load_file(
+    csv_file_path: Path,
+    frames: Iterable[pd.DataFrame],
+    status: str,
+    file_outputs: List[Union[CsvOutput, ParquetOutput, SalesCube, GeocodeCache]],
+    sales_loader: loadCsv.BulkSqliteLoader,
+    table_name: str,
+    replace: bool,
+) -> int:
+    """
+    Write a transformed file, first removing the rows of its previous version when it CHANGED
+
+    Args:
+        csv_file_path (Path): the raw csv file
+        frames (Iterable[pd.DataFrame]): the transformed data
+        status (str): the status of the file in the ingestion manifest
+        file_outputs (List[Union[CsvOutput, ParquetOutput, SalesCube, GeocodeCache]]): the csv,
+            Parquet, aggregate and geocoding outputs
+        sales_loader (loadCsv.BulkSqliteLoader): the SQLite loader
+        table_name (str): the name of the sales table
+        replace (bool): rebuild the outputs from this file instead of appending to them
+    Returns:
+        int: the number of rows written
+    """
+    if status == IngestionManifest.CHANGED:
+        sales_loader.delete_source_rows(table_name, csv_file_path.name)
+        for file_output in file_outputs:
+            file_output.delete_source_rows(csv_file_path.name)
+    return write_file(csv_file_path, frames, file_outputs, sales_loader, table_name, replace)
+
+
+def main():
+    log_dict = load_config("src/config/log.yaml")
+    data_pipeline_logger = Logging(name="run_data_pipeline", log_dict=log_dict).logger
+    args = parse_args()
+    config = load_config(args.config_path)
+    error_folder_path = config.get("data_loader").get("error_folder_path")
+    processed_csv_folder = config.get("data_loader").get("processed_csv_folder")
+    workers = args.workers or config.get("data_loader").get("workers", 1)
+    incremental = args.incremental or config.get("data_loader").get("incremental", False)
+    chunksize = args.chunksize or config.get("data_loader").get("chunksize")
+    table_name = config.get("data_loader").get("table_name", "sales_2019")
+    db_name = config.get("data_loader", {}).get("db_name")
+    Path(processed_csv_folder).mkdir(parents=True, exist_ok=True)
+    Path(error_folder_path).mkdir(parents=True, exist_ok=True)
+    Path(db_name).parent.mkdir(parents=True, exist_ok=True)
+    profiler = build_profiler(config, args, data_pipeline_logger)
+    transformation_pipeline = build_transformation_pipeline(config, data_pipeline_logger, profiler)
     csv_files_dir = config.get("data_loader", {}).get("raw_path", "")
-    df_list = []
-    for csv_file_path in Path(csv_files_dir).glob("*.csv"):
-        data_pipeline_logger.info(f"Processing file: {csv_file_path.name}...")
-        try:
-            raw_df = DataLoader(csv_file_path).load_data()
-            df, _ = transformation_pipeline.transform(df=raw_df)
-            df_list.append(df)
+    with sqlite_connector(db_name) as connection:
+        manifest = IngestionManifest(connection)
+        sales_loader = loadCsv.BulkSqliteLoader(
+            connection,
+            data_pipeline_logger,
+            batch_size=config.get("data_loader").get("sqlite_batch_size", 50_000),
+            indexes=config.get("data_loader").get("sqlite_indexes", []),
+        )
+        file_outputs = build_file_outputs(config, connection)
+        statuses = sort_files(sorted(Path(csv_files_dir).glob("*.csv")), manifest, incremental)
+        csv_files = skip_unchanged_files(statuses, processed_csv_folder, data_pipeline_logger)
+        data_pipeline_logger.info(
+            f"Streaming {len(csv_files)} files in chunks of {chunksize} rows"
+            if chunksize else f"Processing {len(csv_files)} files with {workers} worker(s)"
+        )
+        rebuild = not incremental
+        loaded_files = 0
+        for csv_file_path, frames, error in transform_files(
+            csv_files, transformation_pipeline, workers, chunksize
+        ):
+            data_pipeline_logger.info(f"Processing file: {csv_file_path.name}...")
+            status, fingerprint = statuses[csv_file_path]
+            try:
+                if error is not None:
+                    raise error
+                row_count = load_file(
+                    csv_file_path, frames, status, file_outputs, sales_loader, table_name, replace=rebuild
+                )
+            except Exception as e:
+                data_pipeline_logger.info(f"file: {csv_file_path.name} ERROR")
+                data_pipeline_logger.error(f"Error while processing {csv_file_path.name}: {e}")
+                manifest.remove(csv_file_path.name)
+                sht.move(str(csv_file_path), f"{error_folder_path}/{csv_file_path.name}")
+                continue
+            if rebuild and row_count:
+                manifest.clear()
+                rebuild = False
+            manifest.record(csv_file_path.name, *fingerprint, row_count=row_count)
+            loaded_files += 1
             sht.move(str(csv_file_path), f"{processed_csv_folder}/{csv_file_path.name}")
             data_pipeline_logger.info(f"file: {csv_file_path.name} OK")
-        except Exception as e:
-            data_pipeline_logger.info(f"file: {csv_file_path.name} ERROR")
-            data_pipeline_logger.error(f"Error while processing {csv_file_path.name}: {e}")
-            sht.move(str(csv_file_path), f"{error_folder_path}/{csv_file_path.name}")
-            continue
-    if not df_list:
+        if loaded_files:
+            sales_loader.create_indexes(table_name)
+        if csv_files:
+            bump_load_version(connection)
+    if profiler is not None:
+        profiler.write()
+    if not loaded_files:
         data_pipeline_logger.warning("No files to process")
-    else:
-        final_df = pd.concat(df_list)
-        final_df.to_csv(output_path, index=False)
-        db_name = config.get("data_loader", {}).get("db_name")
-        connector = sqlite_connector(db_name)
-        loadCsv.CsvToSqliteWithPandas(connector, data_pipeline_logger).load_csv_into_table(
-            table_name="sales_2019", df=df
-        )
 
 
 if __name__ == "__main__":
@@ -9,7 +9,12 @@ from sales_prediction.data_processing import (
 )
 from sales_prediction.data_loading import loadCsv
 from sales_prediction.utils import logger
-from sales_prediction.utils.db_connector import sqlite_connector
+from sales_prediction.utils.db_connector import (
+    SqliteConnectionPool,
+    SqliteReader,
+    get_reader,
+    sqlite_connector,
+)
 from sales_prediction.utils.load_config import load_config
 from sales_prediction.utils.csv_to_dataframe import DataLoader
 
@@ -25,6 +30,9 @@ __all__ = [
     "loadCsv",
     "logger",
     "sqlite_connector",
+    "SqliteConnectionPool",
+    "SqliteReader",
+    "get_reader",
     "load_config",
     "DataLoader",
 ]
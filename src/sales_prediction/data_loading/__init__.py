@@ -1,3 +1,8 @@
-from sales_prediction.data_loading.loadCsv import CsvToSqliteWithPandas
+from sales_prediction.data_loading.loadCsv import BulkSqliteLoader, CsvToSqliteWithPandas
+from sales_prediction.data_loading.csv_output import CsvOutput
+from sales_prediction.data_loading.manifest import IngestionManifest
+from sales_prediction.data_loading.parquet_output import ParquetOutput
+from sales_prediction.data_loading.sales_cube import SalesCube
 
-__all__ = ["CsvToSqliteWithPandas"]
+__all__ = ["BulkSqliteLoader", "CsvToSqliteWithPandas", "CsvOutput", "IngestionManifest",
+           "ParquetOutput", "SalesCube"]
@@ -0,0 +1,67 @@
+import os
+from pathlib import Path
+from typing import List, Optional, Union
+
+import pandas as pd
+
+
+class CsvOutput:
+    """
+    Appends processed data to the pipeline csv output.
+    """
+
+    def __init__(
+        self, csv_path: Union[str, Path], source_column: str = "SourceFile", chunksize: int = 100_000
+    ) -> None:
+        self.csv_path: Path = Path(csv_path)
+        self.source_column: str = source_column
+        self.chunksize: int = chunksize
+
+    def reset(self) -> None:
+        self.csv_path.unlink(missing_ok=True)
+
+    def columns(self) -> Optional[List[str]]:
+        if not self.csv_path.exists():
+            return None
+        return pd.read_csv(self.csv_path, nrows=0).columns.tolist()
+
+    def append(self, df: pd.DataFrame) -> None:
+        """
+        Append a DataFrame to the csv output, writing the header if the file is new
+
+        Args:
+            df (pd.DataFrame): the data to append
+        Returns:
+            None
+        """
+        columns = self.columns()
+        if columns is not None:
+            if sorted(columns) != sorted(df.columns):
+                raise ValueError(
+                    f"Columns {list(df.columns)} do not match the columns of {self.csv_path}: {columns}"
+                )
+            df = df[columns]
+        self.csv_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(self.csv_path, mode="a", header=columns is None, index=False)
+
+    def delete_source_rows(self, source_file: str) -> None:
+        """
+        Remove the rows coming from `source_file`, streaming the csv output chunk by chunk
+
+        Args:
+            source_file (str): the name of the raw file
+        Returns:
+            None
+        """
+        columns = self.columns()
+        if columns is None:
+            return
+        tmp_path = self.csv_path.with_suffix(self.csv_path.suffix + ".tmp")
+        with open(tmp_path, "w", newline="") as f:
+            pd.DataFrame(columns=columns).to_csv(f, index=False)
+            for chunk in pd.read_csv(
+                self.csv_path, dtype=str, keep_default_na=False, chunksize=self.chunksize
+            ):
+                chunk = chunk[chunk[self.source_column] != source_file]
+                chunk.to_csv(f, header=False, index=False)
+        os.replace(tmp_path, self.csv_path)
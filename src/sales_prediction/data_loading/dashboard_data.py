@@ -0,0 +1,199 @@
+import os
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from sales_prediction.data_loading.sales_cube import SalesCube
+from sales_prediction.utils.db_connector import get_load_version, get_reader
+
+CITY = "CityName"
+MAP_POINT_COLUMNS = ["label", "Latitude", "Longitude", "Sales", "Precision", "streets"]
+
+
+def data_fingerprint(db_name: Union[str, Path]) -> str:
+    """
+    A key that changes whenever the data of the dashboard database changes
+
+    Args:
+        db_name (Union[str, Path]): the SQLite database
+    Returns:
+        str: the load version of the database with the size and modification time of its file
+    """
+    stat = os.stat(db_name)
+    with get_reader(db_name).pool.connection() as connection:
+        load_version = get_load_version(connection)
+    return f"{load_version}-{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def map_points(streets: pd.DataFrame, top: int = 10) -> pd.DataFrame:
+    """
+    The locations to draw on the map of a city, the best-selling first
+
+    Streets located by the gazetteer are drawn on their own. Streets only located by their
+    zip code are summed into one point per zip code, labelled as approximate, instead of
+    being drawn as if the centroid of the zip code were their position.
+
+    Args:
+        streets (pd.DataFrame): the streets of a city view, with their Latitude, Longitude and Precision
+        top (int): the number of points
+    Returns:
+        pd.DataFrame: the label, Latitude, Longitude, Sales, Precision and number of streets of every point
+    """
+    if "Latitude" not in streets:
+        return pd.DataFrame(columns=MAP_POINT_COLUMNS)
+    located = streets.dropna(subset=["Latitude", "Longitude"])
+    exact = located[located["Precision"] == "street"]
+    by_zip = (
+        located[located["Precision"] != "street"]
+        .groupby("ZipAddress", as_index=False)
+        .agg(
+            Latitude=("Latitude", "first"),
+            Longitude=("Longitude", "first"),
+            Sales=("Sales", "sum"),
+            streets=("street", "size"),
+        )
+    )
+    by_zip["label"] = by_zip["ZipAddress"] + " (approximate, " + by_zip["streets"].astype(str) + " streets)"
+    points = pd.concat(
+        [exact.assign(label=exact["street"], streets=1)[MAP_POINT_COLUMNS], by_zip.assign(Precision="zip")],
+        ignore_index=True,
+    )
+    return points[MAP_POINT_COLUMNS].sort_values("Sales", ascending=False).head(top).reset_index(drop=True)
+
+
+class CityView(NamedTuple):
+    """
+    The precomputed frames shown for one city
+    """
+
+    daily_sales: pd.DataFrame
+    products: pd.DataFrame
+    streets: pd.DataFrame
+
+
+class DashboardData:
+    """
+    Every aggregate of the sales dashboard, computed once per data version.
+
+    The per-product and per-street frames hold the total sales, the sales of the
+    `previous` and `current` months and their relative difference. They are split by
+    city when built, so showing a city is a dictionary lookup.
+    """
+
+    def __init__(
+        self,
+        city_sales: pd.DataFrame,
+        monthly_metrics: pd.DataFrame,
+        views: Dict[str, CityView],
+    ) -> None:
+        self.city_sales = city_sales
+        self.monthly_metrics = monthly_metrics
+        self.views = views
+
+    @classmethod
+    def build(
+        cls,
+        sales_cube: SalesCube,
+        months: Tuple[str, str] = ("2019-11", "2019-12"),
+        geocodes: Optional[pd.DataFrame] = None,
+    ) -> "DashboardData":
+        """
+        Read the aggregates of the sales cube and precompute the view of every city
+
+        Args:
+            sales_cube (SalesCube): the daily sales aggregates
+            months (Tuple[str, str]): the previous and current months compared, 'YYYY-MM'
+            geocodes (Optional[pd.DataFrame]): the Latitude, Longitude and Precision of the
+                streets, by StreetName and ZipAddress, added to the street frames
+        Returns:
+            DashboardData: the dashboard aggregates
+        """
+        periods = [pd.Period(month, "M") for month in months]
+        daily = sales_cube.query()
+        by_city = sales_cube.query(by=[CITY])
+        by_product = sales_cube.query(by=[CITY, "Product"])
+        by_street = sales_cube.query(by=[CITY, "StreetName", "ZipAddress"])
+
+        city_sales = by_city.groupby(CITY, as_index=False)["Sales"].sum().sort_values("Sales")
+        in_month = daily["Date"].dt.to_period("M")
+        monthly_metrics = pd.DataFrame(
+            [
+                daily.loc[in_month == period, SalesCube.MEASURES]
+                .agg({"Sales": "sum", "QuantityOrdered": "mean", "PriceEach": "mean"})
+                .fillna(0.0)
+                for period in periods
+            ],
+            index=["previous", "current"],
+        )
+
+        dates = pd.date_range(daily["Date"].min(), daily["Date"].max(), freq="D", name="Date")
+        products = cls._split(cls._compare(by_product, ["Product"], periods))
+        streets = cls._compare(by_street, ["StreetName", "ZipAddress"], periods)
+        streets.insert(1, "street", streets["StreetName"] + ", " + streets["ZipAddress"])
+        if geocodes is not None:
+            coordinates = geocodes[["StreetName", "ZipAddress", "Latitude", "Longitude", "Precision"]]
+            streets = streets.merge(coordinates, on=["StreetName", "ZipAddress"], how="left")
+        streets = cls._split(streets)
+        views = {}
+        for city, frame in by_city.groupby(CITY, sort=False):
+            views[city] = CityView(
+                daily_sales=frame.set_index("Date")[SalesCube.MEASURES].reindex(dates, fill_value=0.0),
+                products=products[city],
+                streets=streets[city],
+            )
+        return cls(city_sales, monthly_metrics, views)
+
+    @staticmethod
+    def _compare(df: pd.DataFrame, keys: Sequence[str], periods: List[pd.Period]) -> pd.DataFrame:
+        """
+        Total, previous-month and current-month sales per city and keys
+        """
+        groups = [CITY] + list(keys)
+        in_month = df["Date"].dt.to_period("M")
+        month = np.select([in_month == periods[0], in_month == periods[1]], ["previous", "current"], "")
+        monthly = (
+            df["Sales"].groupby([df[column] for column in groups] + [pd.Series(month, index=df.index)])
+            .sum()
+            .unstack(fill_value=0.0)
+            .reindex(columns=["previous", "current"], fill_value=0.0)
+        )
+        compared = df.groupby(groups)["Sales"].sum().to_frame().join(monthly)
+        compared["difference"] = (
+            (compared["current"] - compared["previous"]) / compared["previous"].where(compared["previous"] != 0)
+        )
+        return compared.reset_index()
+
+    @staticmethod
+    def _split(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        return {
+            city: frame.drop(columns=CITY).reset_index(drop=True)
+            for city, frame in df.groupby(CITY, sort=False)
+        }
+
+    @property
+    def cities(self) -> List[str]:
+        return self.city_sales[CITY].tolist()
+
+    def view(self, city: str) -> CityView:
+        """
+        The precomputed frames of a city
+
+        Args:
+            city (str): the city name
+        Returns:
+            CityView: the daily sales, the products and the streets of the city
+        """
+        try:
+            return self.views[city]
+        except KeyError:
+            raise KeyError(f"No sales for the city {city!r}") from None
+
+    def monthly_difference(self) -> pd.Series:
+        """
+        The relative change of the total sales, average quantity and average price from the
+        previous to the current month, zero where the previous month is zero
+        """
+        previous, current = self.monthly_metrics.loc["previous"], self.monthly_metrics.loc["current"]
+        return ((current - previous) / previous.where(previous != 0)).fillna(0.0)
@@ -0,0 +1,167 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Optional, Set, Tuple, Union
+
+import pandas as pd
+
+from sales_prediction.utils.db_connector import SqliteReader
+
+KEYS = ["StreetName", "ZipAddress"]
+
+
+class Gazetteer:
+    """
+    Known coordinates of zip codes, and optionally of streets within them, read from a
+    local GeoJSON file of Point features.
+
+    A feature with a `StreetName` property locates that street; one without locates the
+    zip code. Streets missing from the gazetteer get the point of their zip code, marked
+    with the 'zip' precision, rather than a made-up position of their own.
+    """
+
+    def __init__(self, places: pd.DataFrame) -> None:
+        self.places = places
+
+    @classmethod
+    def from_geojson(cls, path: Union[str, Path]) -> "Gazetteer":
+        """
+        Read a gazetteer from a GeoJSON FeatureCollection
+
+        Args:
+            path (Union[str, Path]): the GeoJSON file
+        Returns:
+            Gazetteer: the gazetteer
+        """
+        with open(path) as f:
+            features = json.load(f)["features"]
+        places = pd.DataFrame(
+            [
+                {
+                    "StreetName": feature["properties"].get("StreetName", ""),
+                    "ZipAddress": feature["properties"]["ZipAddress"],
+                    "Longitude": feature["geometry"]["coordinates"][0],
+                    "Latitude": feature["geometry"]["coordinates"][1],
+                }
+                for feature in features
+                if feature["geometry"]["type"] == "Point"
+            ],
+            columns=KEYS + ["Longitude", "Latitude"],
+        )
+        return cls(places)
+
+    def geocode(self, addresses: pd.DataFrame) -> pd.DataFrame:
+        """
+        Locate distinct streets, dropping the ones whose zip code is unknown
+
+        Args:
+            addresses (pd.DataFrame): the StreetName and ZipAddress of every street
+        Returns:
+            pd.DataFrame: the streets with their Latitude, Longitude and Precision, 'street'
+            when the gazetteer knows the street and 'zip' when only its zip code is located
+        """
+        streets = self.places[self.places["StreetName"] != ""]
+        zips = self.places[self.places["StreetName"] == ""].drop(columns="StreetName")
+        located = addresses[KEYS].merge(streets, on=KEYS, how="left")
+        known = located["Latitude"].notna().to_numpy()
+        in_zip = located.loc[~known, KEYS].merge(zips, on="ZipAddress", how="inner")
+        return pd.concat(
+            [located[known].assign(Precision="street"), in_zip.assign(Precision="zip")], ignore_index=True
+        )[KEYS + ["Latitude", "Longitude", "Precision"]]
+
+
+class GeocodeCache:
+    """
+    The coordinates of every street of the sales data, stored in SQLite next to the order lines.
+
+    The cache is filled while the data pipeline writes its batches and only the streets not
+    already in the table are geocoded. Streets located by the gazetteer are kept across
+    reloads, the ones only located by their zip code are geocoded again on a full reload so
+    they pick up the streets added to the gazetteer. Reads go through `reader` when one is
+    given.
+    """
+
+    COLUMNS = KEYS + ["Latitude", "Longitude", "Precision"]
+
+    def __init__(
+        self,
+        connector: Optional[sqlite3.Connection] = None,
+        gazetteer: Optional[Gazetteer] = None,
+        table_name: str = "geocodes",
+        batch_size: int = 1000,
+        reader: Optional[SqliteReader] = None,
+    ) -> None:
+        self.connector = connector
+        self.gazetteer = gazetteer
+        self.table_name = table_name
+        self.batch_size = batch_size
+        self.reader = reader
+        self._known: Optional[Set[Tuple[str, str]]] = None
+        if connector is not None:
+            self.create_table()
+
+    def create_table(self) -> None:
+        with self.connector as connection:
+            connection.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.table_name} (
+                    StreetName TEXT NOT NULL,
+                    ZipAddress TEXT NOT NULL,
+                    Latitude REAL NOT NULL,
+                    Longitude REAL NOT NULL,
+                    Precision TEXT NOT NULL,
+                    PRIMARY KEY (StreetName, ZipAddress)
+                )
+                """
+            )
+
+    def append(self, df: pd.DataFrame) -> None:
+        """
+        Geocode the streets of a batch of order lines that are not in the cache yet
+
+        Args:
+            df (pd.DataFrame): the processed order lines
+        Returns:
+            None
+        """
+        if self._known is None:
+            self._known = set(self.connector.execute(f"SELECT StreetName, ZipAddress FROM {self.table_name}"))
+        addresses = df[KEYS].dropna().drop_duplicates().astype(str)
+        new = [key not in self._known for key in zip(addresses["StreetName"], addresses["ZipAddress"])]
+        geocodes = self.gazetteer.geocode(addresses[new])
+        rows = list(geocodes.itertuples(index=False, name=None))
+        with self.connector as connection:
+            for start in range(0, len(rows), self.batch_size):
+                connection.executemany(
+                    f"INSERT OR IGNORE INTO {self.table_name} ({', '.join(self.COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+                    rows[start:start + self.batch_size],
+                )
+        self._known.update(zip(geocodes["StreetName"], geocodes["ZipAddress"]))
+
+    def reset(self) -> None:
+        """
+        Drop the streets only located by their zip code, the others are kept on a full reload
+        """
+        with self.connector as connection:
+            connection.execute(f"DELETE FROM {self.table_name} WHERE Precision = 'zip'")
+        self._known = None
+
+    def delete_source_rows(self, source_file: str) -> None:
+        pass
+
+    def read(self) -> pd.DataFrame:
+        """
+        Every cached street, an empty frame when the table does not exist
+
+        Returns:
+            pd.DataFrame: the StreetName, ZipAddress, Latitude, Longitude and Precision of the streets
+        """
+        sql = "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?"
+        if self._read_sql(sql, (self.table_name,)).empty:
+            return pd.DataFrame(columns=self.COLUMNS)
+        return self._read_sql(f"SELECT {', '.join(self.COLUMNS)} FROM {self.table_name}")
+
+    def _read_sql(self, sql: str, params=()) -> pd.DataFrame:
+        if self.reader is not None:
+            return self.reader.read_sql(sql, params)
+        return pd.read_sql_query(sql, self.connector, params=list(params))
@@ -1,6 +1,9 @@
 import sqlite3
 import logging
+from time import perf_counter
+from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 
@@ -9,22 +12,161 @@ class CsvToSqliteWithPandas:
         self.connector = connector
         self.logger = logger
 
-    def load_csv_into_table(self, df: pd.DataFrame, table_name: str) -> None:
+    def load_csv_into_table(self, df: pd.DataFrame, table_name: str, if_exists: str = "replace") -> bool:
         """
         Load a pandas DataFrame into a SQLite table
 
         Args:
             df (pd.DataFrame): the DataFrame to load
             table_name (str): the name of the table in the SQLite database
+            if_exists (str): 'replace' to rebuild the table, 'append' to add the rows to it
         Returns:
-            None
+            bool: True if the data was loaded
         """
         try:
             self.logger.info(f"Loading data to {table_name} ...")
             with self.connector as connection:
                 df.to_sql(
-                    name=table_name, con=connection, if_exists="replace", index=False
+                    name=table_name, con=connection, if_exists=if_exists, index=False
                 )
             self.logger.info(f"Loading data to {table_name} OK")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error loading data into table '{table_name}': {e}")
+            return False
+
+    def delete_source_rows(self, table_name: str, source_file: str, source_column: str = "SourceFile") -> bool:
+        """
+        Delete the rows of a SQLite table that were loaded from `source_file`
+
+        Args:
+            table_name (str): the name of the table in the SQLite database
+            source_file (str): the name of the raw file
+            source_column (str): the column holding the raw file name
+        Returns:
+            bool: True if the rows were deleted
+        """
+        try:
+            with self.connector as connection:
+                table_exists = connection.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+                ).fetchone()
+                if table_exists is None:
+                    return True
+                cursor = connection.execute(
+                    f'DELETE FROM "{table_name}" WHERE "{source_column}" = ?', (source_file,)
+                )
+            self.logger.info(f"Deleted {cursor.rowcount} rows of {source_file} from {table_name}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error deleting rows of '{source_file}' from table '{table_name}': {e}")
+            return False
+
+
+class BulkSqliteLoader(CsvToSqliteWithPandas):
+    """
+    Loads DataFrames into typed SQLite tables with batched inserts inside one transaction.
+    """
+
+    SQLITE_TYPES = {"i": "INTEGER", "u": "INTEGER", "b": "INTEGER", "f": "REAL", "M": "TEXT"}
+
+    def __init__(
+        self,
+        connector: sqlite3.Connection,
+        logger: logging.Logger,
+        batch_size: int = 50_000,
+        indexes: Optional[List[str]] = None,
+    ) -> None:
+        super().__init__(connector, logger)
+        self.batch_size: int = batch_size
+        self.indexes: List[str] = indexes if indexes is not None else []
+        self.last_load_stats: Dict[str, float] = {}
+
+    @classmethod
+    def sqlite_type(cls, dtype) -> str:
+        if isinstance(dtype, pd.CategoricalDtype):
+            return "TEXT"
+        return cls.SQLITE_TYPES.get(dtype.kind, "TEXT")
+
+    @staticmethod
+    def to_python_values(column: pd.Series) -> list:
+        """
+        Convert a column to the Python values sqlite3 can bind, formatting the distinct dates only
+        """
+        if column.dtype.kind == "M":
+            codes, unique_dates = pd.factorize(column)
+            formatted = np.asarray(unique_dates.strftime("%Y-%m-%d %H:%M:%S"), dtype=object)
+            return np.append(formatted, None)[codes].tolist()
+        if column.hasnans:
+            values = column.to_numpy(dtype=object)
+            values[pd.isna(values)] = None
+            return values.tolist()
+        return column.tolist()
+
+    def create_table(self, df: pd.DataFrame, table_name: str, if_exists: str = "replace") -> None:
+        columns = ", ".join(f'"{column}" {self.sqlite_type(dtype)}' for column, dtype in df.dtypes.items())
+        with self.connector as connection:
+            if if_exists == "replace":
+                connection.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+            connection.execute(f'CREATE TABLE IF NOT EXISTS "{table_name}" ({columns})')
+
+    def create_indexes(self, table_name: str) -> None:
+        """
+        Create the configured indexes, meant to be called once the data has landed
+
+        Args:
+            table_name (str): the name of the table in the SQLite database
+        Returns:
+            None
+        """
+        with self.connector as connection:
+            for column in self.indexes:
+                connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{table_name}_{column}" ON "{table_name}" ("{column}")'
+                )
+
+    def load_csv_into_table(self, df: pd.DataFrame, table_name: str, if_exists: str = "replace") -> bool:
+        """
+        Load a pandas DataFrame into a SQLite table with batched executemany calls
+
+        The journal is switched to WAL and `synchronous` is relaxed for the duration of the load.
+
+        Args:
+            df (pd.DataFrame): the DataFrame to load
+            table_name (str): the name of the table in the SQLite database
+            if_exists (str): 'replace' to rebuild the table, 'append' to add the rows to it
+        Returns:
+            bool: True if the data was loaded
+        """
+        try:
+            self.logger.info(f"Loading data to {table_name} ...")
+            start = perf_counter()
+            self.create_table(df, table_name, if_exists)
+            synchronous = self.connector.execute("PRAGMA synchronous").fetchone()[0]
+            self.connector.execute("PRAGMA journal_mode=WAL")
+            self.connector.execute("PRAGMA synchronous=OFF")
+            columns = ", ".join(f'"{column}"' for column in df.columns)
+            placeholders = ", ".join("?" for _ in df.columns)
+            statement = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders})'
+            try:
+                with self.connector as connection:
+                    for batch_start in range(0, len(df), self.batch_size):
+                        batch = df.iloc[batch_start:batch_start + self.batch_size]
+                        values = [self.to_python_values(batch[column]) for column in batch.columns]
+                        connection.executemany(statement, zip(*values))
+            finally:
+                self.connector.execute(f"PRAGMA synchronous={synchronous}")
+            seconds = perf_counter() - start
+            self.last_load_stats = {
+                "rows": len(df),
+                "seconds": seconds,
+                "rows_per_second": len(df) / seconds if seconds else float("inf"),
+            }
+            self.logger.info(
+                f"Loading data to {table_name} OK: {len(df)} rows in {seconds:.2f}s "
+                f"({self.last_load_stats['rows_per_second']:.0f} rows/s)"
+            )
+            return True
         except Exception as e:
             self.logger.error(f"Error loading data into table '{table_name}': {e}")
+            return False
@@ -0,0 +1,96 @@
+import hashlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+
+class IngestionManifest:
+    """
+    Keeps track of the raw files already loaded into the SQLite database.
+    """
+
+    NEW = "new"
+    CHANGED = "changed"
+    UNCHANGED = "unchanged"
+
+    def __init__(self, connector: sqlite3.Connection, table_name: str = "ingestion_manifest") -> None:
+        self.connector = connector
+        self.table_name = table_name
+        self.create_table()
+
+    def create_table(self) -> None:
+        with self.connector as connection:
+            connection.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.table_name} (
+                    file_name TEXT PRIMARY KEY,
+                    file_size INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    loaded_at TEXT NOT NULL
+                )
+                """
+            )
+
+    @staticmethod
+    def fingerprint(file_path: Union[str, Path], block_size: int = 1 << 20) -> Tuple[int, str]:
+        """
+        Compute the size and the sha256 of a file
+
+        Args:
+            file_path (Union[str, Path]): the file to fingerprint
+            block_size (int): the size of the blocks read from the file
+        Returns:
+            Tuple[int, str]: the file size in bytes and its content hash
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+        return Path(file_path).stat().st_size, digest.hexdigest()
+
+    def get(self, file_name: str) -> Optional[Dict[str, Union[str, int]]]:
+        cursor = self.connector.execute(
+            f"SELECT file_name, file_size, content_hash, row_count, loaded_at "
+            f"FROM {self.table_name} WHERE file_name = ?",
+            (file_name,),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip(["file_name", "file_size", "content_hash", "row_count", "loaded_at"], row))
+
+    def status(self, file_name: str, file_size: int, content_hash: str) -> str:
+        """
+        Compare a file with its manifest entry
+
+        Args:
+            file_name (str): the name of the file
+            file_size (int): the size of the file
+            content_hash (str): the content hash of the file
+        Returns:
+            str: 'new', 'changed' or 'unchanged'
+        """
+        entry = self.get(file_name)
+        if entry is None:
+            return self.NEW
+        if entry["file_size"] == file_size and entry["content_hash"] == content_hash:
+            return self.UNCHANGED
+        return self.CHANGED
+
+    def record(self, file_name: str, file_size: int, content_hash: str, row_count: int) -> None:
+        with self.connector as connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO {self.table_name} "
+                f"(file_name, file_size, content_hash, row_count, loaded_at) VALUES (?, ?, ?, ?, ?)",
+                (file_name, file_size, content_hash, row_count, datetime.now().isoformat(timespec="seconds")),
+            )
+
+    def remove(self, file_name: str) -> None:
+        with self.connector as connection:
+            connection.execute(f"DELETE FROM {self.table_name} WHERE file_name = ?", (file_name,))
+
+    def clear(self) -> None:
+        with self.connector as connection:
+            connection.execute(f"DELETE FROM {self.table_name}")
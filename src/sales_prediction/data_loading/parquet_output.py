@@ -0,0 +1,70 @@
+import shutil
+from pathlib import Path
+from typing import List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+class ParquetOutput:
+    """
+    Appends processed data to a Parquet dataset partitioned by year and month.
+
+    Every write produces one fragment per partition, named after the raw file it comes
+    from, so the rows of a raw file can be replaced without rewriting the dataset.
+    """
+
+    def __init__(
+        self,
+        dataset_path: Union[str, Path],
+        partition_cols: Optional[List[str]] = None,
+        source_column: str = "SourceFile",
+    ) -> None:
+        self.dataset_path: Path = Path(dataset_path)
+        if partition_cols is None:
+            partition_cols = ["Year", "Month"]
+        self.partition_cols: List[str] = partition_cols
+        self.source_column: str = source_column
+        self._part: int = 0
+
+    def reset(self) -> None:
+        shutil.rmtree(self.dataset_path, ignore_errors=True)
+
+    def append(self, df: pd.DataFrame) -> None:
+        """
+        Write a DataFrame to the dataset, one fragment per partition and raw file
+
+        Args:
+            df (pd.DataFrame): the data to append
+        Returns:
+            None
+        """
+        if df.empty:
+            return
+        source_files = df[self.source_column].unique()
+        if len(source_files) > 1:
+            for source_file in source_files:
+                self.append(df[df[self.source_column] == source_file])
+            return
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_to_dataset(
+            table,
+            root_path=str(self.dataset_path),
+            partition_cols=self.partition_cols,
+            basename_template=f"{source_files[0]}.part{self._part}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        self._part += 1
+
+    def delete_source_rows(self, source_file: str) -> None:
+        """
+        Remove the fragments written from `source_file`
+
+        Args:
+            source_file (str): the name of the raw file
+        Returns:
+            None
+        """
+        for fragment in self.dataset_path.glob(f"**/{source_file}.part*.parquet"):
+            fragment.unlink()
@@ -0,0 +1,211 @@
+import sqlite3
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from sales_prediction.data_loading.loadCsv import BulkSqliteLoader
+from sales_prediction.utils.db_connector import SqliteReader
+
+
+class SalesCube:
+    """
+    Daily sales aggregates stored in SQLite next to the order lines.
+
+    Aggregates are kept per raw file so the rows of a replaced file can be removed;
+    queries sum them across files. Every table holds one row per day, keys and file,
+    the batches of a streamed file being added to it. Queries go through `reader` when
+    one is given.
+    """
+
+    TABLES = {
+        "daily_sales": [],
+        "daily_sales_by_city": ["CityName"],
+        "daily_sales_by_product": ["Product"],
+        "daily_sales_by_city_product": ["CityName", "Product"],
+        "daily_sales_by_street": ["CityName", "StreetName", "ZipAddress"],
+    }
+    MEASURES = ["Sales", "QuantityOrdered", "PriceEach"]
+
+    def __init__(
+        self,
+        connector: Optional[sqlite3.Connection] = None,
+        date_column: str = "OrderDate",
+        source_column: str = "SourceFile",
+        reader: Optional[SqliteReader] = None,
+    ) -> None:
+        self.connector = connector
+        self.reader = reader
+        self.date_column = date_column
+        self.source_column = source_column
+
+    def aggregate(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Compute the daily aggregates of every table from order lines
+
+        Args:
+            df (pd.DataFrame): the processed order lines
+        Returns:
+            Dict[str, pd.DataFrame]: the aggregates by table name
+        """
+        lines = df[self.MEASURES].assign(
+            Date=df[self.date_column].dt.normalize(),
+            **{column: df[column] for column in self._key_columns() + [self.source_column]},
+        )
+        aggregates = {}
+        for table_name, keys in self.TABLES.items():
+            aggregate = (
+                lines.groupby(["Date"] + keys + [self.source_column], observed=True, sort=False)
+                .agg(
+                    Sales=("Sales", "sum"),
+                    QuantityOrdered=("QuantityOrdered", "sum"),
+                    PriceEach=("PriceEach", "sum"),
+                    Orders=("Sales", "size"),
+                )
+                .reset_index()
+            )
+            aggregate["Date"] = aggregate["Date"].dt.strftime("%Y-%m-%d")
+            aggregates[table_name] = aggregate
+        return aggregates
+
+    def reset(self) -> None:
+        with self.connector as connection:
+            for table_name in self.TABLES:
+                connection.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+
+    def append(self, df: pd.DataFrame) -> None:
+        """
+        Add the aggregates of a batch of order lines to the aggregate tables
+
+        Args:
+            df (pd.DataFrame): the processed order lines
+        Returns:
+            None
+        """
+        for table_name, aggregate in self.aggregate(df).items():
+            self.create_table(table_name, aggregate)
+            columns = ", ".join(f'"{column}"' for column in aggregate.columns)
+            keys = ", ".join(f'"{column}"' for column in self._row_key(table_name))
+            updates = ", ".join(
+                f'"{column}" = "{column}" + excluded."{column}"' for column in self.MEASURES + ["Orders"]
+            )
+            rows = zip(*[BulkSqliteLoader.to_python_values(aggregate[column]) for column in aggregate.columns])
+            with self.connector as connection:
+                connection.executemany(
+                    f'INSERT INTO "{table_name}" ({columns}) VALUES ({", ".join("?" for _ in aggregate.columns)}) '
+                    f"ON CONFLICT ({keys}) DO UPDATE SET {updates}",
+                    rows,
+                )
+
+    def create_table(self, table_name: str, aggregate: pd.DataFrame) -> None:
+        """
+        Create an aggregate table with a unique key on the day, the keys and the file
+
+        Args:
+            table_name (str): the name of the aggregate table
+            aggregate (pd.DataFrame): aggregates giving the columns and their types
+        Returns:
+            None
+        """
+        columns = ", ".join(
+            f'"{column}" {BulkSqliteLoader.sqlite_type(dtype)}' for column, dtype in aggregate.dtypes.items()
+        )
+        keys = ", ".join(f'"{column}"' for column in self._row_key(table_name))
+        with self.connector as connection:
+            connection.execute(f'CREATE TABLE IF NOT EXISTS "{table_name}" ({columns})')
+            connection.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "idx_{table_name}_key" ON "{table_name}" ({keys})')
+            connection.execute(
+                f'CREATE INDEX IF NOT EXISTS "idx_{table_name}_{self.source_column}" '
+                f'ON "{table_name}" ("{self.source_column}")'
+            )
+
+    def delete_source_rows(self, source_file: str) -> None:
+        with self.connector as connection:
+            for table_name in self._existing_tables():
+                connection.execute(
+                    f'DELETE FROM "{table_name}" WHERE "{self.source_column}" = ?', (source_file,)
+                )
+
+    def query(
+        self,
+        by: Sequence[str] = (),
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        filters: Optional[Dict[str, List[str]]] = None,
+    ) -> pd.DataFrame:
+        """
+        Daily sales grouped by `by`, read from the smallest aggregate table holding the needed keys
+
+        Args:
+            by (Sequence[str]): the keys to group by, among CityName, Product, StreetName and ZipAddress
+            start (Optional[str]): the first day to read, 'YYYY-MM-DD'
+            end (Optional[str]): the last day to read, 'YYYY-MM-DD'
+            filters (Optional[Dict[str, List[str]]]): the values to keep for some keys
+        Returns:
+            pd.DataFrame: the Date, the keys and the summed measures, ordered by date
+        """
+        filters = filters or {}
+        table_name = self._table_for(set(by) | set(filters))
+        columns = ["Date"] + list(by)
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("Date >= ?")
+            params.append(str(start))
+        if end is not None:
+            conditions.append("Date <= ?")
+            params.append(str(end))
+        for column, values in filters.items():
+            conditions.append(f'"{column}" IN ({", ".join("?" for _ in values)})')
+            params.extend(values)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        select = ", ".join(f'"{column}"' for column in columns)
+        sql = (
+            f"SELECT {select}, SUM(Sales) AS Sales, SUM(QuantityOrdered) AS QuantityOrdered, "
+            f"SUM(PriceEach) AS PriceEach, SUM(Orders) AS Orders "
+            f'FROM "{table_name}" {where} GROUP BY {select} ORDER BY {select}'
+        )
+        df = self._read_sql(sql, params)
+        df["Date"] = pd.to_datetime(df["Date"], format="%Y-%m-%d")
+        return df
+
+    def daily_sales(self, start: Optional[str] = None, end: Optional[str] = None) -> pd.Series:
+        """
+        The total sales per day, with the days without orders set to zero
+
+        Args:
+            start (Optional[str]): the first day to read, 'YYYY-MM-DD'
+            end (Optional[str]): the last day to read, 'YYYY-MM-DD'
+        Returns:
+            pd.Series: the daily sales indexed by date
+        """
+        if not self.is_built():
+            return pd.Series(dtype=float, name="Sales", index=pd.DatetimeIndex([], name=self.date_column))
+        df = self.query(start=start, end=end)
+        daily_sales = df.set_index("Date")["Sales"].asfreq("D", fill_value=0.0)
+        daily_sales.index.name = self.date_column
+        return daily_sales
+
+    def is_built(self) -> bool:
+        return "daily_sales" in self._existing_tables()
+
+    def _row_key(self, table_name: str) -> List[str]:
+        return ["Date"] + self.TABLES[table_name] + [self.source_column]
+
+    def _key_columns(self) -> List[str]:
+        return sorted({column for keys in self.TABLES.values() for column in keys})
+
+    def _table_for(self, keys: set) -> str:
+        candidates = [
+            table_name for table_name, table_keys in self.TABLES.items() if keys <= set(table_keys)
+        ]
+        if not candidates:
+            raise ValueError(f"No aggregate table holds the keys {sorted(keys)}")
+        return min(candidates, key=lambda table_name: len(self.TABLES[table_name]))
+
+    def _read_sql(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        if self.reader is not None:
+            return self.reader.read_sql(sql, params)
+        return pd.read_sql_query(sql, self.connector, params=list(params))
+
+    def _existing_tables(self) -> List[str]:
+        names = self._read_sql("SELECT name FROM sqlite_master WHERE type = 'table'")["name"]
+        return [name for name in names if name in self.TABLES]
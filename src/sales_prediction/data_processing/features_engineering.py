@@ -1,17 +1,133 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 import logging
 
 from sales_prediction.data_processing.base_features_engineering import FeatureEngineering
-from sales_prediction.data_processing.validate_ouput import validate_output
+from sales_prediction.data_processing.instrumentation import StepProfiler
+from sales_prediction.data_processing.validate_ouput import SALES_OUTPUT_VALIDATOR
+from sales_prediction.schema_validator.frame_validator import FrameValidator, ValidationReport
 from sales_prediction.utils.logger import Logging
 from sales_prediction.utils.load_config import load_config
 
 
+_DIRECTIVE_WIDTHS = {"%Y": 4, "%y": 2, "%m": 2, "%d": 2, "%H": 2, "%M": 2, "%S": 2}
+
+
+def _fixed_width_offsets(date_format: str) -> Optional[Tuple[Dict[str, int], int]]:
+    """
+    The offset of every directive of a zero-padded date format such as '%m/%d/%y %H:%M'
+
+    Args:
+        date_format (str): the format of the dates
+    Returns:
+        Optional[Tuple[Dict[str, int], int]]: the offset of every directive and of every literal,
+        keyed by the directive or by the literal's own position, and the width of the dates, or None
+        when the format is not made of the fixed-width directives and literals only
+    """
+    offsets: Dict[str, int] = {}
+    width, i = 0, 0
+    while i < len(date_format):
+        directive = date_format[i:i + 2]
+        if directive in _DIRECTIVE_WIDTHS:
+            offsets[directive] = width
+            width, i = width + _DIRECTIVE_WIDTHS[directive], i + 2
+        elif date_format[i] == "%":
+            return None
+        else:
+            offsets[f"{width}:{date_format[i]}"] = width
+            width, i = width + 1, i + 1
+    return offsets, width
+
+
+def _fixed_width_fields(values: pd.Index, date_format: str) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Split zero-padded date strings into the digit bytes of every directive of their format
+
+    Args:
+        values (pd.Index): the date strings
+        date_format (str): a format made of %Y or %y, %m, %d, optionally %H, %M, %S, and literals
+    Returns:
+        Optional[Dict[str, np.ndarray]]: the (n, width) uint8 digits of every directive, or None
+        when the format is not supported or one of the values does not match it exactly
+    """
+    layout = _fixed_width_offsets(date_format)
+    if layout is None or values.dtype != object:
+        return None
+    offsets, width = layout
+    if not {"%m", "%d"} <= offsets.keys() or ("%Y" in offsets) == ("%y" in offsets):
+        return None
+    try:
+        raw = np.asarray(values).astype(f"S{width + 1}")
+    except (UnicodeEncodeError, TypeError, ValueError):
+        return None
+    buffer = raw.view(np.uint8).reshape(len(raw), width + 1)
+    literals = [(offset, key[-1]) for key, offset in offsets.items() if not key.startswith("%")]
+    if buffer[:, width].any() or any((buffer[:, offset] != ord(literal)).any() for offset, literal in literals):
+        return None
+    fields = {
+        directive: buffer[:, offset:offset + _DIRECTIVE_WIDTHS[directive]]
+        for directive, offset in offsets.items()
+        if directive.startswith("%")
+    }
+    if any(((field < ord("0")) | (field > ord("9"))).any() for field in fields.values()):
+        return None
+    return fields
+
+
+def _parse_fixed_width_dates(values: pd.Index, date_format: str) -> Optional[pd.DatetimeIndex]:
+    """
+    Parse zero-padded date strings such as '04/19/19 08:46' with NumPy byte arithmetic.
+
+    Two-digit years follow strptime, 69 to 99 being the 20th century and 00 to 68 the 21st.
+    A day past the end of its month moves the date to the next month, which is how such
+    values are told apart from valid ones.
+
+    Args:
+        values (pd.Index): the date strings
+        date_format (str): a format made of %Y or %y, %m, %d, optionally %H, %M, %S, and literals
+    Returns:
+        Optional[pd.DatetimeIndex]: the parsed dates, or None when the format or one of the values
+        is not supported, in which case the caller falls back to pd.to_datetime
+    """
+    fields = _fixed_width_fields(values, date_format)
+    if fields is None:
+        return None
+    numbers = {
+        directive: (digits.astype(np.int64) - ord("0")) @ (10 ** np.arange(digits.shape[1] - 1, -1, -1))
+        for directive, digits in fields.items()
+    }
+    year = numbers.get("%Y")
+    if year is None:
+        year = numbers["%y"] + np.where(numbers["%y"] < 69, 2000, 1900)
+    month, day = numbers["%m"], numbers["%d"]
+    hour, minute, second = (numbers.get(directive, np.zeros_like(year)) for directive in ("%H", "%M", "%S"))
+    month_start = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+    days = month_start.astype("datetime64[D]") + (day - 1)
+    valid = (month >= 1) & (month <= 12) & (day >= 1) & (days.astype("datetime64[M]") == month_start)
+    if not (valid & (hour < 24) & (minute < 60) & (second < 60)).all():
+        return None
+    return pd.DatetimeIndex(days + (hour * 3600 + minute * 60 + second) * np.timedelta64(1, "s"))
+
+
 class DateFeatureEngineering(FeatureEngineering):
-    def __init__(self, date_column_name: str) -> None:
+    DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+    def __init__(
+        self, date_column_name: str, date_format: str = "%m/%d/%y %H:%M", cached: bool = False
+    ) -> None:
+        """
+        Initializes the DateFeatureEngineering class.
+
+        Args:
+            date_column_name (str): The name of the column containing the order date.
+            date_format (str, optional): The format of the order date. Defaults to '%m/%d/%y %H:%M'.
+            cached (bool, optional): Parse each distinct date once and emit compact dtypes. Defaults to False.
+        """
         super().__init__()
         self.date_column_name = date_column_name
+        self.date_format = date_format
+        self.cached = cached
 
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -21,8 +137,12 @@ class DateFeatureEngineering(FeatureEngineering):
         Returns:
             - pd.DataFrame, the transformed DataFrame with added columns
         """
+        if self.cached:
+            codes, unique_dates = pd.factorize(df[self.date_column_name])
+            if (codes >= 0).all():
+                return self._transform_unique_dates(df, codes, unique_dates)
         df[self.date_column_name] = pd.to_datetime(
-            df[self.date_column_name], format="%m/%d/%y %H:%M"
+            df[self.date_column_name], format=self.date_format
         )
         df["Hour"] = df[self.date_column_name].dt.hour
         df["Month"] = df[self.date_column_name].dt.month
@@ -31,6 +151,28 @@ class DateFeatureEngineering(FeatureEngineering):
         df["Year"] = df[self.date_column_name].dt.year
         return df
 
+    def _transform_unique_dates(
+        self, df: pd.DataFrame, codes: np.ndarray, unique_dates: pd.Index
+    ) -> pd.DataFrame:
+        """
+        Parse the distinct dates only and broadcast the features back through the factorized codes.
+
+        Hour, Month and Day are emitted as int8, Year as int16 and DayName as a categorical
+        whose codes are the weekday numbers.
+        """
+        dates = _parse_fixed_width_dates(unique_dates, self.date_format)
+        if dates is None:
+            dates = pd.DatetimeIndex(pd.to_datetime(unique_dates, format=self.date_format))
+        df[self.date_column_name] = dates.take(codes)
+        df["Hour"] = dates.hour.to_numpy(dtype=np.int8)[codes]
+        df["Month"] = dates.month.to_numpy(dtype=np.int8)[codes]
+        df["Day"] = dates.day.to_numpy(dtype=np.int8)[codes]
+        df["DayName"] = pd.Categorical.from_codes(
+            dates.dayofweek.to_numpy(dtype=np.int8)[codes], categories=self.DAY_NAMES
+        )
+        df["Year"] = dates.year.to_numpy(dtype=np.int16)[codes]
+        return df
+
 
 class AddressFeatureEngineering(FeatureEngineering):
     def __init__(
@@ -38,7 +180,20 @@ class AddressFeatureEngineering(FeatureEngineering):
         address_column_name: str,
         target_columns: Optional[List[str]] = None,
         delimiter: str = ", ",
+        cached: bool = False,
+        categorical_columns: Optional[List[str]] = None,
     ) -> None:
+        """
+        Initializes the AddressFeatureEngineering class.
+
+        Args:
+            address_column_name (str): The name of the column containing the purchase address.
+            target_columns (List[str], optional): The columns receiving the parts of the address.
+            delimiter (str, optional): The delimiter between the parts of the address. Defaults to ', '.
+            cached (bool, optional): Parse each distinct address of a frame once. Defaults to False.
+            categorical_columns (List[str], optional): The columns emitted as categoricals in cached mode.
+                Defaults to CityName, StateCode and ZipCode.
+        """
         super().__init__()
         self.address_column_name = address_column_name
         self.delimiter = delimiter
@@ -48,8 +203,19 @@ class AddressFeatureEngineering(FeatureEngineering):
                     "StreetAddress", "CityName", "ZipAddress",
                 ]
         self.target_columns: List[str] = target_columns
+        self.cached = cached
+        if categorical_columns is None:
+            categorical_columns = ["CityName", "StateCode", "ZipCode"]
+        self.categorical_columns: List[str] = categorical_columns
 
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.cached:
+            codes, unique_addresses = pd.factorize(df[self.address_column_name])
+            if (codes >= 0).all():
+                return self._transform_unique_addresses(df, codes, unique_addresses)
+        return self._split_addresses(df)
+
+    def _split_addresses(self, df: pd.DataFrame) -> pd.DataFrame:
         splits = df[self.address_column_name].str.split(self.delimiter, expand=True)
         num_columns = min(len(self.target_columns), splits.shape[1])
         df[self.target_columns[:num_columns]] = splits.iloc[:, :num_columns]
@@ -61,6 +227,49 @@ class AddressFeatureEngineering(FeatureEngineering):
         df["StateCode"] = zip_df.str[0]
         return df
 
+    def _split_address(self, address: str, street_index: int, zip_index: int) -> Tuple:
+        """
+        Split one address the same way _split_addresses splits a column.
+        """
+        num_columns = len(self.target_columns)
+        parts = address.split(self.delimiter, num_columns)[:num_columns]
+        if len(parts) < num_columns:
+            parts += [None] * (num_columns - len(parts))
+        street, zip_address = parts[street_index], parts[zip_index]
+        if street is None:
+            street_name, street_number = np.nan, np.nan
+        else:
+            street_number, _, street_name = street.partition(" ")
+        if zip_address is None:
+            state_code, zip_code = np.nan, np.nan
+        else:
+            zip_parts = zip_address.split(" ", 2)
+            state_code, zip_code = zip_parts[0], zip_parts[1] if len(zip_parts) > 1 else np.nan
+        return (*parts, street_name, street_number, zip_code, state_code)
+
+    def _transform_unique_addresses(
+        self, df: pd.DataFrame, codes: np.ndarray, unique_addresses: pd.Index
+    ) -> pd.DataFrame:
+        """
+        Split the distinct addresses of the frame and broadcast their parts back to the rows
+        through the factorized codes. Nothing is kept between calls, so the memory stays
+        bounded by the size of the frame.
+        """
+        if not {"StreetAddress", "ZipAddress"} <= set(self.target_columns):
+            return self._split_addresses(df)
+        street_index = self.target_columns.index("StreetAddress")
+        zip_index = self.target_columns.index("ZipAddress")
+        columns = self.target_columns + ["StreetName", "StreetNumber", "ZipCode", "StateCode"]
+        parts = zip(*[self._split_address(address, street_index, zip_index) for address in unique_addresses])
+        for column, values in zip(columns, parts):
+            values = np.array(values, dtype=object)
+            if column in self.categorical_columns:
+                categories = pd.Categorical(values)
+                df[column] = pd.Categorical.from_codes(categories.codes[codes], categories.categories)
+            else:
+                df[column] = values[codes]
+        return df
+
 
 class ColumnRenaming(FeatureEngineering):
     def __init__(self, column_name_dict: Dict[str, str]) -> None:
@@ -144,29 +353,77 @@ class DataTypeConverter(FeatureEngineering):
 
 class FeatureEngineeringPipeline:
 
-    def __init__(self, feature_engineering_steps: List[FeatureEngineering], logger: logging.Logger) -> None:
+    def __init__(
+        self,
+        feature_engineering_steps: List[FeatureEngineering],
+        logger: logging.Logger,
+        validator: FrameValidator = SALES_OUTPUT_VALIDATOR,
+        profiler: Optional[StepProfiler] = None,
+    ) -> None:
         self.feature_engineering_steps: List[
             FeatureEngineering
         ] = feature_engineering_steps
         self.logger = logger
+        self.validator = validator
+        self.profiler = profiler
+        self.stream_error: Optional[str] = None
+        self.validation_report: Optional[ValidationReport] = None
 
-    def transform(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[str]]:
+    def transform(self, df: pd.DataFrame, source: Optional[str] = None) -> Tuple[pd.DataFrame, Optional[str]]:
 
         """
         Performs feature engineering on the input DataFrame.
 
         Args:
             df (pd.DataFrame): The DataFrame to perform feature engineering on.
+            source (Optional[str]): The file the DataFrame comes from, in the step metrics.
+
+        Returns:
+            pd.DataFrame: The transformed DataFrame, and the json report of the rows breaking
+            the validation rules, if any.
+        """
+        df = self._apply_steps(df, source)
+        self.validation_report = self.validator.validate(df)
+        return df, self._report_error(self.validation_report)
+
+    def transform_chunks(
+        self, chunks: Iterable[pd.DataFrame], source: Optional[str] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Performs feature engineering chunk by chunk, so only one chunk is held in memory.
+
+        Every chunk is validated; the merged report is kept in `validation_report` and its
+        json in `stream_error` once the chunks are exhausted.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): The chunks to perform feature engineering on.
+            source (Optional[str]): The file the chunks come from, in the step metrics.
 
         Returns:
-            pd.DataFrame: The transformed DataFrame.
+            Iterator[pd.DataFrame]: The transformed chunks.
         """
+        self.stream_error = None
+        report = ValidationReport(0, sample_size=self.validator.sample_size)
+        for index, chunk in enumerate(chunks):
+            df = self._apply_steps(chunk, f"{source}[{index}]" if source is not None else str(index))
+            report.merge(self.validator.validate(df))
+            yield df
+        self.validation_report = report
+        self.stream_error = self._report_error(report)
+
+    def _report_error(self, report: ValidationReport) -> Optional[str]:
+        if report.is_valid:
+            return None
+        self.logger.warning(f"The transformed data breaks validation rules: {report}")
+        return report.to_json()
+
+    def _apply_steps(self, df: pd.DataFrame, source: Optional[str] = None) -> pd.DataFrame:
         for feature_engineering in self.feature_engineering_steps:
-            df = feature_engineering.transform(df)
-        validate_df, error = validate_output(df)
-        if error:
-            self.logger.warning("An error occurred during the dataframe loading.")
-        return validate_df, error
+            if self.profiler is None:
+                df = feature_engineering.transform(df)
+            else:
+                df = self.profiler.measure(feature_engineering, df, source)
+        return df
 
 
 if __name__ == "__main__":
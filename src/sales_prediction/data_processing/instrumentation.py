@@ -0,0 +1,175 @@
+import cProfile
+import json
+import logging
+import tracemalloc
+import weakref
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from sales_prediction.data_processing.base_features_engineering import FeatureEngineering
+
+
+def column_bytes(df: pd.DataFrame, sample_size: Optional[int] = 1_000) -> Dict[str, int]:
+    """
+    The memory held by every column of a frame
+
+    Object columns are measured on `sample_size` evenly spaced rows and scaled up, since
+    measuring every Python string costs about as much as a pipeline step.
+
+    Args:
+        df (pd.DataFrame): the frame
+        sample_size (Optional[int]): the rows measured for object columns, all of them if None
+    Returns:
+        Dict[str, int]: the bytes of every column
+    """
+    if sample_size is None or len(df) <= sample_size:
+        usage = df.memory_usage(deep=True, index=False)
+    else:
+        usage = df.memory_usage(deep=False, index=False)
+        objects = df.columns[df.dtypes == object]
+        if len(objects):
+            sample = df[objects].iloc[:: len(df) // sample_size]
+            usage[objects] = sample.memory_usage(deep=True, index=False) * len(df) / len(sample)
+    return {str(column): int(size) for column, size in usage.items()}
+
+
+class StepProfiler:
+    """
+    Measures every step of a FeatureEngineeringPipeline: wall time, rows in and out, the
+    bytes of the frame and of each of its columns after the step, and, when
+    `trace_memory` is set, the peak memory traced by tracemalloc during the step.
+
+    Every step is logged and kept in `records`, which `write` saves as JSON or CSV
+    depending on the extension of `metrics_path`. With `profile_path` set the steps also
+    run under cProfile, whose stats `write` dumps there. Memory is measured outside the
+    timed part, so the times are those of the steps alone.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        metrics_path: Optional[Union[str, Path]] = None,
+        trace_memory: bool = False,
+        profile_path: Optional[Union[str, Path]] = None,
+        sample_size: Optional[int] = 1_000,
+    ) -> None:
+        self.logger = logger
+        self.metrics_path = Path(metrics_path) if metrics_path else None
+        self.trace_memory = trace_memory
+        self.profile_path = Path(profile_path) if profile_path else None
+        self.sample_size = sample_size
+        self.records: List[Dict] = []
+        self._profile: Optional[cProfile.Profile] = None
+        self._last_output: Optional[tuple] = None
+        self._started_tracing = False
+
+    def __getstate__(self) -> Dict:
+        # The copies sent to worker processes start empty and without a profiler
+        state = self.__dict__.copy()
+        state.update(records=[], _profile=None, _last_output=None, _started_tracing=False)
+        return state
+
+    def _frame_bytes(self, df: pd.DataFrame) -> int:
+        if self._last_output is not None and self._last_output[0]() is df:
+            return self._last_output[1]
+        return sum(column_bytes(df, self.sample_size).values())
+
+    def measure(self, step: FeatureEngineering, df: pd.DataFrame, source: Optional[str] = None) -> pd.DataFrame:
+        """
+        Run one step on a frame and record its metrics
+
+        Args:
+            step (FeatureEngineering): the step to run
+            df (pd.DataFrame): the input of the step
+            source (Optional[str]): the file or chunk the frame comes from
+        Returns:
+            pd.DataFrame: the output of the step
+        """
+        rows_in, bytes_in = len(df), self._frame_bytes(df)
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        if self.profile_path is not None and self._profile is None:
+            self._profile = cProfile.Profile()
+        if self._profile is not None:
+            self._profile.enable()
+        start = perf_counter()
+        df = step.transform(df)
+        seconds = perf_counter() - start
+        if self._profile is not None:
+            self._profile.disable()
+        peak = tracemalloc.get_traced_memory()[1] - traced_before if self.trace_memory else None
+        columns = column_bytes(df, self.sample_size)
+        bytes_out = sum(columns.values())
+        self._last_output = (weakref.ref(df), bytes_out)
+        record = {
+            "source": source,
+            "step": type(step).__name__,
+            "seconds": seconds,
+            "rows_in": rows_in,
+            "rows_out": len(df),
+            "bytes_in": bytes_in,
+            "bytes_out": bytes_out,
+            "memory_delta_bytes": bytes_out - bytes_in,
+            "peak_memory_bytes": peak,
+            "column_bytes": columns,
+        }
+        self.records.append(record)
+        if self.logger is not None:
+            self.logger.info(self._describe(record))
+        return df
+
+    @staticmethod
+    def _describe(record: Dict) -> str:
+        message = (
+            f"{record['step']}: {record['seconds'] * 1000:.1f} ms, {record['rows_in']} -> {record['rows_out']} rows, "
+            f"{record['bytes_out'] / 1e6:.1f} MB ({record['memory_delta_bytes'] / 1e6:+.1f} MB)"
+        )
+        if record["peak_memory_bytes"] is not None:
+            message += f", peak {record['peak_memory_bytes'] / 1e6:.1f} MB"
+        return message
+
+    def summary(self) -> pd.DataFrame:
+        """
+        The total time, rows and peak memory of every step, the slowest first
+        """
+        if not self.records:
+            return pd.DataFrame()
+        metrics = pd.DataFrame(self.records)
+        summary = metrics.groupby("step", sort=False).agg(
+            seconds=("seconds", "sum"),
+            rows_in=("rows_in", "sum"),
+            rows_out=("rows_out", "sum"),
+            max_bytes_out=("bytes_out", "max"),
+            max_peak_memory_bytes=("peak_memory_bytes", "max"),
+        )
+        summary["share"] = summary["seconds"] / summary["seconds"].sum()
+        return summary.sort_values("seconds", ascending=False)
+
+    def write(self) -> None:
+        """
+        Save the records to `metrics_path` and the cProfile stats to `profile_path`
+        """
+        if self.logger is not None and self.records:
+            self.logger.info(f"Time per step:\n{self.summary()[['seconds', 'share']].to_string()}")
+        if self.metrics_path is not None:
+            self.metrics_path.parent.mkdir(parents=True, exist_ok=True)
+            if self.metrics_path.suffix == ".csv":
+                pd.json_normalize(self.records).to_csv(self.metrics_path, index=False)
+            else:
+                with open(self.metrics_path, "w") as f:
+                    json.dump(self.records, f, indent=2)
+        if self._profile is not None:
+            self.profile_path.parent.mkdir(parents=True, exist_ok=True)
+            self._profile.dump_stats(self.profile_path)
+            if self.logger is not None:
+                self.logger.info(f"cProfile stats of the steps written to {self.profile_path}")
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
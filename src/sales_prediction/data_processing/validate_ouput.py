@@ -1,44 +1,43 @@
-from datetime import datetime
 import pandas as pd
-from pydantic import BaseModel, ValidationError
-from typing import List, Optional, Tuple
+from typing import Optional, Tuple
 
+from sales_prediction.schema_validator.frame_validator import ColumnRule, FrameValidator
 
-def validate_output(df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[str]]:
+# the pydantic schema this replaces had every column optional, so a missing column is allowed
+SALES_OUTPUT_VALIDATOR = FrameValidator(
+    [
+        ColumnRule("OrderID", nullable=False, pattern=r"\d+", required=False),
+        ColumnRule("Product", dtype="string", nullable=False, required=False),
+        ColumnRule("QuantityOrdered", dtype="integer", nullable=False, min_value=1, required=False),
+        ColumnRule("PriceEach", dtype="float", nullable=False, min_value=0, required=False),
+        ColumnRule("OrderDate", dtype="datetime", nullable=False, min_date="2000-01-01", required=False),
+        ColumnRule(
+            "PurchaseAddress", dtype="string", nullable=False, pattern=r"[^,]+, [^,]+, [A-Z]{2} \d{5}", required=False
+        ),
+        ColumnRule("Sales", dtype="float", nullable=False, min_value=0, required=False),
+        ColumnRule("Hour", dtype="integer", min_value=0, max_value=23, required=False),
+        ColumnRule("Month", dtype="integer", min_value=1, max_value=12, required=False),
+        ColumnRule("Day", dtype="integer", min_value=1, max_value=31, required=False),
+        ColumnRule("Year", dtype="integer", min_value=2000, max_value=2100, required=False),
+        ColumnRule("CityName", dtype="string", nullable=False, required=False),
+        ColumnRule("StateCode", pattern=r"[A-Z]{2}", required=False),
+        ColumnRule("ZipCode", pattern=r"\d{5}", required=False),
+    ]
+)
+
+
+def validate_output(
+    df: pd.DataFrame, validator: FrameValidator = SALES_OUTPUT_VALIDATOR
+) -> Tuple[pd.DataFrame, Optional[str]]:
     """
-    Validate the output data from the pipeline
+    Validate every row of the output data from the pipeline
     Args:
         df (pd.DataFrame): output data from the pipeline
+        validator (FrameValidator): the rules of the output columns
 
     Returns:
-        pd.DataFrame: the validated output data
+        pd.DataFrame: the validated output data, and the violation report as json when a
+        rule is broken
     """
-    records: List = df.head().to_dict(orient="records")
-    errors: Optional[str] = None
-    try:
-        SalesOutputDataSchema(outputs=records)
-    except ValidationError as e:
-        errors = e.json()
-    return df, errors
-
-
-class OutputDataSchema(BaseModel):
-    OrderID: Optional[int]
-    Product: Optional[str]
-    QuantityOrdered: Optional[int]
-    PriceEach: Optional[float]
-    OrderDate: Optional[datetime]
-    PurchaseAddress: Optional[str]
-    Sales: Optional[float]
-    hour: Optional[int]
-    month: Optional[int]
-    day: Optional[int]
-    day_name: Optional[str]
-    year: Optional[int]
-    street_name: Optional[str]
-    street_number: Optional[str]
-    city: Optional[str]
-
-
-class SalesOutputDataSchema(OutputDataSchema):
-    outputs: List[OutputDataSchema]
+    report = validator.validate(df)
+    return df, None if report.is_valid else report.to_json()
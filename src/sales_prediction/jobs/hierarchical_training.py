@@ -0,0 +1,86 @@
+import json
+from argparse import ArgumentParser
+from pathlib import Path
+
+import pandas as pd
+from sktime.forecasting.base import ForecastingHorizon
+
+from sales_prediction.training_pipeline.data_prep import load_sales_panel, split_daily_sales
+from sales_prediction.training_pipeline.hierarchical import TOTAL, HierarchicalForecaster
+from sales_prediction.training_pipeline.modelling import create_model
+from sales_prediction.utils import load_config
+
+
+class HierarchicalTrainingJob:
+    def __init__(self, forecaster: HierarchicalForecaster):
+        self.forecaster = forecaster
+
+    def run(self, panel: pd.DataFrame) -> HierarchicalForecaster:
+        return self.forecaster.fit(panel)
+
+    def evaluate(self, df_test: pd.DataFrame) -> pd.Series:
+        """
+        Mean absolute error of the bottom series and of every total over the test period
+        """
+        fh = ForecastingHorizon(df_test.index, is_relative=False)
+        predictions = self.forecaster.predict(fh)
+        actuals = self.forecaster.aggregate(df_test)
+        return (predictions - actuals).abs().mean().rename("mae")
+
+
+def cli():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--config_path",
+        "-c",
+        type=str,
+        required=False,
+        help="Path to the input config file.",
+        default="src/config/forecasting_config.yaml",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        required=False,
+        help="Number of processes fitting the series, overrides the config.",
+        default=None,
+    )
+    parser.add_argument(
+        "--trace_memory",
+        "-tm",
+        action="store_true",
+        help="Measure the peak memory of every fit with tracemalloc, which fits every series twice.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = cli()
+    config = load_config.load_config(args.config_path)
+    hierarchy = config.get("hierarchical", {})
+    panel = load_sales_panel(
+        config.get("csv_path"),
+        config.get("parquet_path"),
+        config.get("db_name"),
+        levels=hierarchy.get("levels", ["CityName", "Product"]),
+    )
+    df_train, df_test = split_daily_sales(panel)
+    forecaster = HierarchicalForecaster(
+        create_model,
+        reconciliation=hierarchy.get("reconciliation", "bottom_up"),
+        workers=args.workers or hierarchy.get("workers", 1),
+        trace_memory=args.trace_memory or hierarchy.get("trace_memory", False),
+    )
+    job = HierarchicalTrainingJob(forecaster)
+    job.run(df_train)
+    model_path = Path(hierarchy.get("model_path", "models/hierarchical_model.pkl"))
+    forecaster.save(model_path)
+    forecaster.fit_report_.to_csv(model_path.with_suffix(".fit_report.csv"), index=False)
+    print(json.dumps(forecaster.capacity_report(), indent=2))
+    mae = job.evaluate(df_test)
+    print(mae[[key for key in mae.index if TOTAL in (key if isinstance(key, tuple) else (key,))]])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from argparse import ArgumentParser
-from typing import Optional, Dict
+from typing import Optional, Dict, Union
 import pandas as pd
 from sktime.performance_metrics.base import BaseMetric
 from sktime.performance_metrics.forecasting import mean_absolute_error
@@ -11,7 +11,12 @@ from sktime.forecasting.model_selection import (
     ForecastingRandomizedSearchCV,
 )
 from sales_prediction.utils.registries import ModelRegistry
-from sales_prediction.training_pipeline.data_prep import prepare_data
+from sales_prediction.training_pipeline.hyperparmaters_tuning import (
+    SharedTransformSearchCV,
+    SuccessiveHalvingSearchCV,
+)
+from sales_prediction.training_pipeline.compact_series import CompactSeries, as_series
+from sales_prediction.training_pipeline.data_prep import load_daily_sales, split_daily_sales
 from sales_prediction.training_pipeline.modelling import create_tuning_model
 from sales_prediction.utils import load_config
 
@@ -24,36 +29,79 @@ class TuningHyperParamsJob:
         param_grid: Dict[str, str],
         metric: Optional[BaseMetric] = None,
         searchers: Optional[str] = "grid",
+        backend: Optional[str] = "loky",
+        n_jobs: Optional[int] = None,
+        share_transforms: bool = False,
+        n_iter: int = 10,
+        halving_factor: int = 3,
+        min_resource: int = 10,
     ):
         self.forecaster = forecaster
         self.cv = cv
         self.searchers = searchers
         self.metric = metric
         self.param_grid = param_grid
+        self.backend = backend
+        self.n_jobs = n_jobs
+        self.share_transforms = share_transforms
+        self.n_iter = n_iter
+        self.halving_factor = halving_factor
+        self.min_resource = min_resource
 
-    def run(self, y):
-        if self.searchers == "grid":
+    def run(self, y: Union[pd.Series, CompactSeries]):
+        y = as_series(y)
+        if self.searchers not in ("grid", "random", "halving"):
+            raise ValueError("The searchers should be 'grid', 'random' or 'halving'")
+        if self.searchers == "halving":
+            search_cv = SuccessiveHalvingSearchCV(
+                forecaster=self.forecaster,
+                cv=self.cv,
+                param_grid=self.param_grid,
+                scoring=self.metric,
+                backend=self.backend,
+                n_jobs=self.n_jobs if self.n_jobs is not None else -1,
+                factor=self.halving_factor,
+                min_resource=self.min_resource,
+            )
+        elif self.share_transforms and isinstance(self.forecaster, TransformedTargetForecaster):
+            search_cv = SharedTransformSearchCV(
+                forecaster=self.forecaster,
+                cv=self.cv,
+                param_grid=self.param_grid,
+                scoring=self.metric,
+                n_iter=self.n_iter if self.searchers == "random" else None,
+                backend=self.backend,
+                n_jobs=self.n_jobs if self.n_jobs is not None else -1,
+            )
+        elif self.searchers == "grid":
             search_cv = ForecastingGridSearchCV(
                 forecaster=self.forecaster,
                 cv=self.cv,
                 param_grid=self.param_grid,
                 scoring=self.metric,
                 error_score="raise",
+                backend=self.backend,
+                backend_params=self.backend_params,
             )
-        elif self.searchers == "random":
+        else:
             search_cv = ForecastingRandomizedSearchCV(
                 forecaster=self.forecaster,
                 cv=self.cv,
                 scoring=self.metric,
-                param_grid=self.param_grid,
+                param_distributions=self.param_grid,
+                n_iter=self.n_iter,
                 error_score="raise",
+                backend=self.backend,
+                backend_params=self.backend_params,
             )
-        else:
-            raise ValueError("The searchers should be 'grid' or 'random'")
         search_cv.fit(y=y)
 
         return search_cv
 
+    @property
+    def backend_params(self) -> Optional[Dict[str, int]]:
+        return {"n_jobs": self.n_jobs} if self.n_jobs is not None else None
+
 
 def cli():
     parser = ArgumentParser()
@@ -71,11 +119,15 @@ def cli():
 def main():
     args = cli()
     config = load_config.load_config(args.config_path)
-    df = pd.read_csv(config.get("csv_path"), parse_dates=["OrderDate"])
+    daily_sales = load_daily_sales(
+        config.get("csv_path"), config.get("parquet_path"), config.get("db_name")
+    )
     forecaster = create_tuning_model()
     model_path = config.get("model_path")
     model_path2 = config.get("model_path2")
-    df_train, df_test = prepare_data(df)
+    df_train, df_test = split_daily_sales(daily_sales)
+    if config.get("compact_series", False):
+        df_train = CompactSeries.from_series(df_train)
     param_grid = {
         "forecaster__estimator__learning_rate": [0.1, 0.01],
         "forecaster__estimator__l2_regularization": [0.1, 0.01],
@@ -85,10 +137,17 @@ def main():
         initial_window=30,
         step_length=7,
     )
+    tuning_config = config.get("tuning", {})
     gridcv_forecaster = TuningHyperParamsJob(
         forecaster=forecaster,
         cv=cv,
         param_grid=param_grid,
+        searchers=tuning_config.get("searchers", "grid"),
+        backend=tuning_config.get("backend", "loky"),
+        n_jobs=tuning_config.get("n_jobs"),
+        share_transforms=tuning_config.get("share_transforms", False),
+        halving_factor=tuning_config.get("halving_factor", 3),
+        min_resource=tuning_config.get("min_resource", 10),
     )
     best_forecaster = gridcv_forecaster.run(y=df_train)
     print(best_forecaster.best_params_)
@@ -102,4 +161,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,19 +1,38 @@
 from argparse import ArgumentParser
+from typing import List, Optional, Sequence, Union
 import pandas as pd
 from sktime.forecasting.base import ForecastingHorizon
-from sales_prediction.training_pipeline.data_prep import prepare_data
+from sales_prediction.training_pipeline.data_prep import load_daily_sales, split_daily_sales
+from sales_prediction.utils.forecast_cache import ForecastCache
 from sales_prediction.utils.registries import ModelRegistry
 from sales_prediction.utils import load_config
 
 
 class InferenceJob:
-    def __init__(self, forecaster):
-        self.forecaster = forecaster
+    def __init__(
+        self,
+        forecaster=None,
+        model_path: Optional[str] = None,
+        cache: Optional[ForecastCache] = None,
+    ):
+        self._forecaster = forecaster
+        self.model_path = model_path
+        self.cache = cache
 
     @classmethod
-    def from_path(cls, model_path):
-        forecaster = ModelRegistry.load_model(model_path)
-        return cls(forecaster)
+    def from_path(cls, model_path, cache: Optional[ForecastCache] = None):
+        """
+        Serve the model saved at `model_path`, only loading it when a forecast is not cached
+        """
+        if cache is None:
+            return cls(ModelRegistry.load_model(model_path), model_path=model_path)
+        return cls(model_path=model_path, cache=cache)
+
+    @property
+    def forecaster(self):
+        if self._forecaster is None:
+            self._forecaster = ModelRegistry.load_model(self.model_path)
+        return self._forecaster
 
     def predict(self, fh: int) -> pd.DataFrame:
         """
@@ -26,7 +45,54 @@ class InferenceJob:
         Returns:
             pd.DataFrame: The forecasted data
         """
-        return self.forecaster.predict(fh)
+        if self.cache is None or self.model_path is None:
+            return self.forecaster.predict(fh)
+        return self.predict_many([fh])[0]
+
+    def predict_many(
+        self, horizons: Sequence[Union[int, list, pd.Index, ForecastingHorizon]]
+    ) -> List[pd.Series]:
+        """
+        Forecast several horizons with a single call to the forecaster
+
+        The recursive forecast runs once over every step from the cutoff to the furthest
+        step asked for, then each horizon gets its own slice of it. Running over the
+        contiguous steps also keeps the Differencer inverse anchored on the last observed
+        value when a horizon starts after a gap.
+
+        Args:
+            horizons (Sequence): The forecasting horizons, relative or absolute
+
+        Returns:
+            List[pd.Series]: The forecasted data of each horizon, in the same order
+        """
+        if self.cache is None or self.model_path is None:
+            return self._predict_many(horizons)
+        model_hash = ModelRegistry.artifact_hash(self.model_path)
+        keys = [ForecastCache.horizon_key(fh) for fh in horizons]
+        predictions = [self.cache.get(self.model_path, model_hash, key) for key in keys]
+        missing = [position for position, y_pred in enumerate(predictions) if y_pred is None]
+        if missing:
+            computed = self._predict_many([horizons[position] for position in missing])
+            for position, y_pred in zip(missing, computed):
+                self.cache.put(self.model_path, model_hash, keys[position], y_pred)
+                predictions[position] = y_pred
+        return predictions
+
+    def _predict_many(
+        self, horizons: Sequence[Union[int, list, pd.Index, ForecastingHorizon]]
+    ) -> List[pd.Series]:
+        cutoff = self.forecaster.cutoff
+        horizons = [fh if isinstance(fh, ForecastingHorizon) else ForecastingHorizon(fh) for fh in horizons]
+        absolute = [fh.to_absolute(cutoff).to_pandas() for fh in horizons]
+        if not absolute:
+            return []
+        furthest = max(fh.to_relative(cutoff).to_pandas().max() for fh in horizons)
+        steps = ForecastingHorizon(range(1, max(furthest, 0) + 1)).to_absolute(cutoff).to_pandas()
+        for index in absolute:
+            steps = steps.union(index)
+        y_pred = self.forecaster.predict(ForecastingHorizon(steps, is_relative=False))
+        return [y_pred.loc[index] for index in absolute]
 
 
 def cli():
@@ -45,13 +111,15 @@ def cli():
 def main():
     args = cli()
     config = load_config.load_config(args.config_path)
-    df = pd.read_csv(config.get("csv_path"), parse_dates=["OrderDate"])
+    daily_sales = load_daily_sales(
+        config.get("csv_path"), config.get("parquet_path"), config.get("db_name")
+    )
     forecaster = InferenceJob.from_path(config.get("model_path2"))
-    _, df_test = prepare_data(df)
+    _, df_test = split_daily_sales(daily_sales)
     fh = ForecastingHorizon(df_test.index, is_relative=False)
     predictions = forecaster.predict(fh)
     print(predictions)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
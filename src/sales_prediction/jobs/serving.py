@@ -0,0 +1,256 @@
+import asyncio
+import json
+from argparse import ArgumentParser
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+from sktime.forecasting.base import ForecastingHorizon
+
+from sales_prediction.jobs.inference import InferenceJob
+from sales_prediction.utils import load_config
+
+MAX_HEADER_LINES = 100
+
+
+class MicroBatcher:
+    """
+    Coalesces the horizons submitted within `window` seconds into one `predict_many` call.
+
+    The prediction runs in the default executor so the event loop keeps accepting requests.
+    When the batched call fails, every horizon is forecast on its own so only the requests
+    that cannot be served get the error.
+    """
+
+    def __init__(self, job: InferenceJob, window: float = 0.005, max_batch_size: int = 64) -> None:
+        self.job = job
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.requests = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, fh: ForecastingHorizon) -> pd.Series:
+        """
+        Queue a horizon and wait for its slice of the next batched forecast
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((fh, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[ForecastingHorizon, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            self.batches += 1
+            self.requests += len(batch)
+            horizons = [fh for fh, _ in batch]
+            try:
+                predictions = await loop.run_in_executor(None, self.job.predict_many, horizons)
+            except Exception as e:
+                predictions = [e] if len(batch) == 1 else await self._predict_each(horizons)
+            for (_, future), y_pred in zip(batch, predictions):
+                if future.done():
+                    continue
+                if isinstance(y_pred, Exception):
+                    future.set_exception(y_pred)
+                else:
+                    future.set_result(y_pred)
+
+    async def _predict_each(self, horizons: List[ForecastingHorizon]) -> List[Union[pd.Series, Exception]]:
+        """
+        Forecast the horizons of a failed batch one at a time
+
+        Args:
+            horizons (List[ForecastingHorizon]): the horizons of the batch
+        Returns:
+            List[Union[pd.Series, Exception]]: the forecast of every horizon, or the error it raised
+        """
+        loop = asyncio.get_running_loop()
+        predictions = []
+        for fh in horizons:
+            try:
+                predictions.append((await loop.run_in_executor(None, self.job.predict_many, [fh]))[0])
+            except Exception as e:
+                predictions.append(e)
+        return predictions
+
+
+class ForecastServer:
+    """
+    A minimal HTTP/1.1 server answering `GET /forecast?start=YYYY-MM-DD&end=YYYY-MM-DD`.
+
+    Ranges must start after the cutoff of the model and end at most `max_days` days after it.
+    """
+
+    def __init__(self, batcher: MicroBatcher, max_days: int = 366) -> None:
+        self.batcher = batcher
+        self.max_days = max_days
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000) -> asyncio.AbstractServer:
+        self.batcher.start()
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        server = await self.start(host, port)
+        print(f"Serving forecasts on http://{host}:{port}/forecast")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                status, body = await self.handle_request(request_line.decode("latin-1"))
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self.write_response(writer, status, body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, request_line: str) -> Tuple[int, Dict]:
+        parts = request_line.split()
+        if len(parts) != 3:
+            return 400, {"error": "malformed request line"}
+        method, target, _ = parts
+        url = urlsplit(target)
+        if url.path == "/health":
+            return 200, {"status": "ok", "batches": self.batcher.batches, "requests": self.batcher.requests}
+        if url.path != "/forecast":
+            return 404, {"error": f"unknown path {url.path}"}
+        if method != "GET":
+            return 405, {"error": "only GET is supported"}
+        dates, error = self.parse_range(url.query)
+        if error is not None:
+            return error
+        try:
+            y_pred = await self.batcher.submit(ForecastingHorizon(dates, is_relative=False))
+        except Exception as e:
+            return 500, {"error": str(e)}
+        return 200, {
+            "start": dates[0].strftime("%Y-%m-%d"),
+            "end": dates[-1].strftime("%Y-%m-%d"),
+            "forecast": [
+                {"date": date.strftime("%Y-%m-%d"), "sales": float(value)}
+                for date, value in zip(y_pred.index, y_pred.values)
+            ],
+        }
+
+    def parse_range(self, query: str) -> Tuple[pd.DatetimeIndex, Optional[Tuple[int, Dict]]]:
+        """
+        The days of the start and end parameters of a forecast request
+
+        Args:
+            query (str): the query string of the request
+        Returns:
+            Tuple[pd.DatetimeIndex, Optional[Tuple[int, Dict]]]: the days, and the status and error
+            body of the response when the range is not a valid one
+        """
+        params = parse_qs(query)
+        try:
+            dates = pd.date_range(params["start"][0], params["end"][0], freq="D")
+        except (KeyError, ValueError) as e:
+            return pd.DatetimeIndex([]), (400, {"error": f"start and end must be dates: {e}"})
+        if len(dates) == 0:
+            return dates, (400, {"error": "the range must hold at least 1 day"})
+        cutoff = self.batcher.job.forecaster.cutoff[0]
+        if dates[0] <= cutoff:
+            return dates, (400, {"error": f"the range must start after the cutoff {cutoff:%Y-%m-%d}"})
+        if (dates[-1] - cutoff).days > self.max_days:
+            return dates, (
+                400, {"error": f"the range must end within {self.max_days} days of the cutoff {cutoff:%Y-%m-%d}"}
+            )
+        return dates, None
+
+    @staticmethod
+    def write_response(writer: asyncio.StreamWriter, status: int, body: Dict, keep_alive: bool) -> None:
+        payload = json.dumps(body).encode()
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+
+
+def cli():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--config_path",
+        "-c",
+        type=str,
+        required=False,
+        help="Path to the input config file.",
+        default="src/config/forecasting_config.yaml",
+    )
+    parser.add_argument("--host", type=str, required=False, default="127.0.0.1")
+    parser.add_argument("--port", "-p", type=int, required=False, default=8000)
+    parser.add_argument(
+        "--window_ms",
+        type=float,
+        required=False,
+        help="How long to wait for concurrent requests before predicting.",
+        default=5.0,
+    )
+    parser.add_argument("--max_batch_size", type=int, required=False, default=64)
+    return parser.parse_args()
+
+
+def main():
+    args = cli()
+    config = load_config.load_config(args.config_path)
+    job = InferenceJob.from_path(config.get("model_path2"))
+    batcher = MicroBatcher(job, window=args.window_ms / 1000, max_batch_size=args.max_batch_size)
+    try:
+        asyncio.run(ForecastServer(batcher).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
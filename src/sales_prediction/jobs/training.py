@@ -1,15 +1,20 @@
+import json
 from argparse import ArgumentParser
+from pathlib import Path
+from time import perf_counter
 import mlflow
 import pandas as pd
 from sktime.forecasting.base import ForecastingHorizon
 from sales_prediction.schema_validator.validate_time_series import validate_time_series
 from sales_prediction.training_pipeline.train import (
     BaseTrainingPipeline,
+    IncrementalTrainingPipeline,
     TrainingPipeline,
     ModelEvaluator,
 )
 from sales_prediction.utils.registries import ModelRegistry
-from sales_prediction.training_pipeline.data_prep import prepare_data
+from sales_prediction.training_pipeline.compact_series import CompactSeries
+from sales_prediction.training_pipeline.data_prep import load_daily_sales, split_daily_sales
 from sales_prediction.training_pipeline.modelling import create_model
 from sales_prediction.utils import load_config
 
@@ -27,6 +32,31 @@ class TrainingJob:
         return metrics
 
 
+RETRAINING_STATE_FILE = "retraining.json"
+
+
+def load_retraining_state(model_path: str) -> dict:
+    """
+    The number of incremental updates since the last full refit of a saved model
+    """
+    state_path = Path(model_path) / RETRAINING_STATE_FILE
+    if not state_path.is_file():
+        return {"updates_since_refit": 0}
+    with open(state_path) as file:
+        return json.load(file)
+
+
+def save_retraining_state(model_path: str, train_pipeline: IncrementalTrainingPipeline, seconds: float) -> None:
+    state = {
+        "mode": train_pipeline.mode_,
+        "updates_since_refit": train_pipeline.updates_since_refit_,
+        "drift_error": train_pipeline.drift_error_,
+        "fit_seconds": seconds,
+    }
+    with open(Path(model_path) / RETRAINING_STATE_FILE, "w") as file:
+        json.dump(state, file)
+
+
 def cli():
     parser = ArgumentParser()
     parser.add_argument(
@@ -37,17 +67,54 @@ def cli():
         help="Path to the input config file.",
         default="src/config/forecasting_config.yaml",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Update the saved model with the new days instead of training a new one.",
+    )
     return parser.parse_args()
 
 
+def run_incremental(config: dict, df_train: pd.Series) -> IncrementalTrainingPipeline:
+    """
+    Update the saved model with the days after its cutoff, or refit it when it is due
+    """
+    model_path = config.get("model_path2")
+    retraining = config.get("retraining", {})
+    previous = None
+    if Path(model_path).exists():
+        previous = ModelRegistry.load_model(model_path, use_cache=False)
+    train_pipeline = IncrementalTrainingPipeline(
+        create_model(),
+        df_train,
+        previous=previous,
+        updates_since_refit=load_retraining_state(model_path)["updates_since_refit"],
+        extra_iter=retraining.get("extra_iter", 50),
+        refit_every=retraining.get("refit_every", 7),
+        drift_threshold=retraining.get("drift_threshold", 0.3),
+    )
+    start = perf_counter()
+    forecaster = train_pipeline.fit()
+    seconds = perf_counter() - start
+    if train_pipeline.mode_ != "unchanged":
+        ModelRegistry.save_model(forecaster, model_path, overwrite=True)
+        save_retraining_state(model_path, train_pipeline, seconds)
+    print(f"{train_pipeline.mode_} in {seconds:.2f} s, drift error {train_pipeline.drift_error_}")
+    return train_pipeline
+
+
 def main():
     args = cli()
     config = load_config.load_config(args.config_path)
     experiment_name = config.get("experiment_name")
-    df = pd.read_csv(config.get("csv_path"), parse_dates=["OrderDate"])
+    daily_sales = load_daily_sales(
+        config.get("csv_path"), config.get("parquet_path"), config.get("db_name")
+    )
     forecaster = create_model()
-    df_train, df_test = prepare_data(df)
+    df_train, df_test = split_daily_sales(daily_sales)
     df_train, errors_train = validate_time_series(df_train)
+    if config.get("compact_series", False):
+        df_train = CompactSeries.from_series(df_train)
     train_pipeline = TrainingPipeline(forecaster, df_train)
     fh = ForecastingHorizon(df_test.index, is_relative=False)
     metrics = ModelEvaluator()
@@ -61,6 +128,11 @@ def main():
     mlflow.set_experiment(experiment_id)
     with mlflow.start_run():
         mlflow.log_params(config)
+        if args.incremental:
+            train_pipeline = run_incremental(config, df_train)
+            metrics = train_job.evaluate(df_test=df_test, predictions=train_pipeline.forecast(fh))
+            print(metrics)
+            return
         train_job.run()
         ModelRegistry.save_model(forecaster, config.get("model_path2"))
         predictions = train_pipeline.forecast(fh)
@@ -69,4 +141,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
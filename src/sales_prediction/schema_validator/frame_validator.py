@@ -0,0 +1,221 @@
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api import types
+
+
+class ColumnRule:
+    """
+    The declarative checks of one column, each evaluated as a mask over the whole column.
+
+    `dtype` is one of "integer", "float", "string" or "datetime"; values of an object column
+    that do not convert to it count as violations. Range and date bounds are inclusive, and
+    `pattern` must match the whole value. Regexes run once per distinct value.
+    """
+
+    DTYPES = ("integer", "float", "string", "datetime")
+
+    def __init__(
+        self,
+        column: str,
+        dtype: Optional[str] = None,
+        nullable: bool = True,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        pattern: Optional[str] = None,
+        min_date: Optional[Union[str, pd.Timestamp]] = None,
+        max_date: Optional[Union[str, pd.Timestamp]] = None,
+        required: bool = True,
+    ) -> None:
+        if dtype is not None and dtype not in self.DTYPES:
+            raise ValueError(f"The dtype should be one of {self.DTYPES}")
+        self.column = column
+        self.dtype = dtype
+        self.nullable = nullable
+        self.min_value = min_value
+        self.max_value = max_value
+        self.pattern = re.compile(pattern) if pattern is not None else None
+        self.min_date = pd.Timestamp(min_date) if min_date is not None else None
+        self.max_date = pd.Timestamp(max_date) if max_date is not None else None
+        self.required = required
+
+    def masks(self, series: pd.Series) -> Dict[str, np.ndarray]:
+        """
+        The rows breaking each check of the rule
+
+        Args:
+            series (pd.Series): the column
+        Returns:
+            Dict[str, np.ndarray]: a boolean mask per check name
+        """
+        masks = {}
+        distinct = _Distinct(series)
+        missing = series.isna().to_numpy()
+        if not self.nullable:
+            masks["nullable"] = missing
+        values = series
+        if self.dtype in ("integer", "float"):
+            values, masks["dtype"] = self._as_numeric(series, missing)
+        elif self.dtype == "datetime":
+            values, masks["dtype"] = self._as_datetime(series, missing)
+        elif self.dtype == "string":
+            masks["dtype"] = self._not_strings(series, missing, distinct)
+        if self.min_value is not None or self.max_value is not None:
+            masks["range"] = self._out_of_range(values, self.min_value, self.max_value)
+        if self.min_date is not None or self.max_date is not None:
+            masks["date_range"] = self._out_of_range(values, self.min_date, self.max_date)
+        if self.pattern is not None:
+            masks["pattern"] = self._not_matching(distinct)
+        return masks
+
+    def _as_numeric(self, series: pd.Series, missing: np.ndarray):
+        if types.is_bool_dtype(series.dtype) or not (
+            types.is_numeric_dtype(series.dtype) or series.dtype == object
+        ):
+            return series, ~missing
+        values = series if types.is_numeric_dtype(series.dtype) else pd.to_numeric(series, errors="coerce")
+        invalid = values.isna().to_numpy() & ~missing
+        if self.dtype == "integer" and types.is_float_dtype(values.dtype):
+            array = values.to_numpy()
+            invalid |= ~missing & ~np.isnan(array) & (np.floor(array) != array)
+        return values, invalid
+
+    def _as_datetime(self, series: pd.Series, missing: np.ndarray):
+        if types.is_datetime64_any_dtype(series.dtype):
+            return series, np.zeros(len(series), dtype=bool)
+        if series.dtype != object:
+            return series, ~missing
+        values = pd.to_datetime(series, errors="coerce")
+        return values, values.isna().to_numpy() & ~missing
+
+    @staticmethod
+    def _not_strings(series: pd.Series, missing: np.ndarray, distinct: "_Distinct") -> np.ndarray:
+        if types.is_string_dtype(series.dtype) and series.dtype != object:
+            return np.zeros(len(series), dtype=bool)
+        if series.dtype != object and not isinstance(series.dtype, pd.CategoricalDtype):
+            return ~missing
+        return distinct.broadcast(lambda value: not isinstance(value, str))
+
+    @staticmethod
+    def _out_of_range(values: pd.Series, low, high) -> np.ndarray:
+        if not (types.is_numeric_dtype(values.dtype) or types.is_datetime64_any_dtype(values.dtype)):
+            return np.zeros(len(values), dtype=bool)
+        invalid = np.zeros(len(values), dtype=bool)
+        if low is not None:
+            invalid |= (values < low).to_numpy()
+        if high is not None:
+            invalid |= (values > high).to_numpy()
+        return invalid
+
+    def _not_matching(self, distinct: "_Distinct") -> np.ndarray:
+        return distinct.broadcast(lambda value: self.pattern.fullmatch(str(value)) is None)
+
+
+class _Distinct:
+    """
+    The distinct values of a column and the code of every row, computed on first use, so
+    per-value checks run once per distinct value.
+    """
+
+    def __init__(self, series: pd.Series) -> None:
+        self.series = series
+        self._codes: Optional[np.ndarray] = None
+
+    def broadcast(self, check) -> np.ndarray:
+        """
+        The rows whose non-missing value fails `check`
+        """
+        if self._codes is None:
+            if isinstance(self.series.dtype, pd.CategoricalDtype):
+                self._codes, self._uniques = self.series.cat.codes.to_numpy(), self.series.cat.categories
+            else:
+                self._codes, self._uniques = pd.factorize(self.series)
+        failed = np.fromiter((check(value) for value in self._uniques), dtype=bool, count=len(self._uniques))
+        return (self._codes >= 0) & failed[np.maximum(self._codes, 0)]
+
+
+class ValidationReport:
+    """
+    The violations of a validation, each with its row count and a sample of the row labels.
+    """
+
+    def __init__(self, n_rows: int, violations: Optional[List[Dict]] = None, sample_size: int = 5) -> None:
+        self.n_rows = n_rows
+        self.violations: List[Dict] = violations if violations is not None else []
+        self.sample_size = sample_size
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.violations
+
+    def merge(self, other: "ValidationReport") -> "ValidationReport":
+        """
+        Add the violations of another part of the same data, such as the next chunk
+        """
+        by_check = {(violation["column"], violation["rule"]): violation for violation in self.violations}
+        for violation in other.violations:
+            key = (violation["column"], violation["rule"])
+            if key not in by_check:
+                by_check[key] = dict(violation, sample_index=list(violation["sample_index"]))
+                self.violations.append(by_check[key])
+                continue
+            merged = by_check[key]
+            merged["count"] += violation["count"]
+            room = self.sample_size - len(merged["sample_index"])
+            merged["sample_index"].extend(violation["sample_index"][:max(room, 0)])
+        self.n_rows += other.n_rows
+        return self
+
+    def to_json(self) -> str:
+        return json.dumps({"rows": self.n_rows, "violations": self.violations}, default=str)
+
+    def __str__(self) -> str:
+        if self.is_valid:
+            return f"{self.n_rows} rows, no violation"
+        lines = [f"{self.n_rows} rows, {len(self.violations)} violated checks"]
+        for violation in self.violations:
+            lines.append(
+                f"{violation['column']}.{violation['rule']}: {violation['count']} rows, "
+                f"e.g. {violation['sample_index']}"
+            )
+        return "\n".join(lines)
+
+
+class FrameValidator:
+    """
+    Validates every row of a frame against column rules in one vectorized pass.
+    """
+
+    def __init__(self, rules: Iterable[ColumnRule], sample_size: int = 5) -> None:
+        self.rules: List[ColumnRule] = list(rules)
+        self.sample_size = sample_size
+
+    def validate(self, df: pd.DataFrame) -> ValidationReport:
+        """
+        Check all the rows of the frame
+
+        Args:
+            df (pd.DataFrame): the frame to validate
+        Returns:
+            ValidationReport: the violations by column and check, with up to `sample_size`
+            row labels each
+        """
+        violations = []
+        for rule in self.rules:
+            if rule.column not in df.columns:
+                if rule.required:
+                    violations.append(
+                        {"column": rule.column, "rule": "required", "count": len(df), "sample_index": []}
+                    )
+                continue
+            for check, mask in rule.masks(df[rule.column]).items():
+                count = int(np.count_nonzero(mask))
+                if count:
+                    sample = df.index[np.flatnonzero(mask)[:self.sample_size]].tolist()
+                    violations.append(
+                        {"column": rule.column, "rule": check, "count": count, "sample_index": sample}
+                    )
+        return ValidationReport(len(df), violations, self.sample_size)
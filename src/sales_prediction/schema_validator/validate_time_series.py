@@ -1,39 +1,25 @@
-from typing import Optional, Tuple, List, Dict
-from datetime import datetime
+from typing import Optional, Tuple
 import pandas as pd
-from pydantic import BaseModel, ValidationError, validator
 
+from sales_prediction.schema_validator.frame_validator import ColumnRule, FrameValidator
 
-class SalesSchema(BaseModel):
-    dt: Optional[datetime]
-    sales: Optional[float]
-
-    @validator("dt")
-    def validate_date(cls, v):
-        if isinstance(v, pd.Timestamp):
-            return v.to_pydatetime()
-        return v
-
-
-class TimeSeriesSchema(BaseModel):
-    outputs: List[SalesSchema]
+TIME_SERIES_VALIDATOR = FrameValidator(
+    [
+        ColumnRule("dt", dtype="datetime", nullable=False),
+        ColumnRule("sales", dtype="float", nullable=False, min_value=0),
+    ]
+)
 
 
 def validate_time_series(df: pd.Series) -> Tuple[pd.Series, Optional[str]]:
     """
-    Validate the output data from the pipeline
+    Validate every day of the daily sales series
     Args:
-        df (pd.DataFrame): output data from the pipeline
+        df (pd.Series): the daily sales indexed by date
 
     Returns:
-        pd.DataFrame: the validated output data
+        pd.Series: the validated series, and the violation report as json when a rule is broken
     """
-    records: Dict[pd.Timestamp, float] = df.head().to_dict()
-    errors: Optional[str] = None
-    try:
-        TimeSeriesSchema(
-            outputs=[SalesSchema(dt=dt, sales=sales) for dt, sales in records.items()]
-        )
-    except ValidationError as e:
-        errors = e.json()
-    return df, errors
+    frame = pd.DataFrame({"dt": df.index, "sales": df.to_numpy()})
+    report = TIME_SERIES_VALIDATOR.validate(frame)
+    return df, None if report.is_valid else report.to_json()
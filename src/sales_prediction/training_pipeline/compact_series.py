@@ -0,0 +1,84 @@
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class CompactSeries:
+    """
+    A regular time series kept as float64 values, its first timestamp and its frequency.
+
+    The index is only materialized when a pandas view is requested, and the values are
+    shared with every view and window rather than copied. The values keep the float64
+    dtype of the sales, so training on a compact series gives the same model.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        start: Union[str, pd.Timestamp],
+        freq: str = "D",
+        name: Optional[str] = None,
+        index_name: Optional[str] = None,
+    ) -> None:
+        self.values = np.asarray(values, dtype=np.float64)
+        if self.values.ndim != 1:
+            raise ValueError("A CompactSeries holds one-dimensional values")
+        self.start = pd.Timestamp(start)
+        self.freq = freq
+        self.name = name
+        self.index_name = index_name
+        self._index: Optional[pd.DatetimeIndex] = None
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "CompactSeries":
+        """
+        Build a compact series from a pandas series with a regular DatetimeIndex
+
+        Args:
+            series (pd.Series): the series, without missing dates
+        Returns:
+            CompactSeries: the series, sharing the values when they are already float64
+        """
+        index = series.index
+        freq = index.freqstr if index.freq is not None else pd.infer_freq(index) if len(index) > 2 else "D"
+        if freq is None:
+            raise ValueError("The series index has no regular frequency")
+        return cls(series.to_numpy(), index[0], freq, series.name, index.name)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, key: slice) -> "CompactSeries":
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("A CompactSeries only supports contiguous slices")
+        start, stop, _ = key.indices(len(self))
+        return CompactSeries(
+            self.values[start:stop], self.index_at(start), self.freq, self.name, self.index_name
+        )
+
+    def index_at(self, position: int) -> pd.Timestamp:
+        return self.start + position * pd.tseries.frequencies.to_offset(self.freq)
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        if self._index is None:
+            self._index = pd.date_range(self.start, periods=len(self), freq=self.freq, name=self.index_name)
+        return self._index
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+    def to_series(self) -> pd.Series:
+        """
+        A pandas view of the series, sharing the float64 values
+        """
+        return pd.Series(self.values, index=self.index, name=self.name, copy=False)
+
+
+def as_series(y: Union[pd.Series, CompactSeries]) -> pd.Series:
+    """
+    The pandas series sktime expects, a view for a CompactSeries
+    """
+    return y.to_series() if isinstance(y, CompactSeries) else y
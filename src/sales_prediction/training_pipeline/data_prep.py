@@ -1,6 +1,12 @@
-from typing import Tuple
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, TypeVar, Union
 import pandas as pd
 from sktime.split import temporal_train_test_split
+from sales_prediction.data_loading.sales_cube import SalesCube
+from sales_prediction.utils.db_connector import get_reader
+from sales_prediction.utils.parquet_loader import load_sales_data
+
+SeriesOrPanel = TypeVar("SeriesOrPanel", pd.Series, pd.DataFrame)
 
 
 def prepare_data(data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -14,7 +20,77 @@ def prepare_data(data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
         pd.DataFrame: The prepared data
     """
     df = data.set_index(keys=["OrderDate"])
-    y_train, y_test = temporal_train_test_split(y=df["Sales"].resample("D").sum(), test_size=0.15)
+    return split_daily_sales(df["Sales"].resample("D").sum())
+
+
+def split_daily_sales(daily_sales: SeriesOrPanel) -> Tuple[SeriesOrPanel, SeriesOrPanel]:
+    """
+    Split the daily sales into a training and a test series
+
+    Args:
+        daily_sales (SeriesOrPanel): The daily sales indexed by date, one column per series for a panel
+
+    Returns:
+        Tuple[SeriesOrPanel, SeriesOrPanel]: The training and test series
+    """
+    y_train, y_test = temporal_train_test_split(y=daily_sales, test_size=0.15)
     y_test = y_test.drop(index="2020-01-01")
 
     return y_train, y_test
+
+
+def load_daily_sales(
+    csv_path: Union[str, Path],
+    parquet_path: Optional[Union[str, Path]] = None,
+    db_name: Optional[Union[str, Path]] = None,
+) -> pd.Series:
+    """
+    Load the daily sales, from the aggregate tables when the database has them
+
+    Args:
+        csv_path (Union[str, Path]): The csv output of the data pipeline
+        parquet_path (Optional[Union[str, Path]]): The Parquet output of the data pipeline
+        db_name (Optional[Union[str, Path]]): The SQLite database of the data pipeline
+
+    Returns:
+        pd.Series: The daily sales indexed by date
+    """
+    if db_name is not None and Path(db_name).exists():
+        daily_sales = SalesCube(reader=get_reader(db_name)).daily_sales()
+        if len(daily_sales):
+            return daily_sales
+    df = load_sales_data(csv_path, parquet_path, columns=["OrderDate", "Sales"])
+    return df.set_index(keys=["OrderDate"])["Sales"].resample("D").sum()
+
+
+def load_sales_panel(
+    csv_path: Union[str, Path],
+    parquet_path: Optional[Union[str, Path]] = None,
+    db_name: Optional[Union[str, Path]] = None,
+    levels: Sequence[str] = ("CityName", "Product"),
+) -> pd.DataFrame:
+    """
+    Load the daily sales of every series of a hierarchy, from the aggregate tables when the database has them
+
+    Args:
+        csv_path (Union[str, Path]): The csv output of the data pipeline
+        parquet_path (Optional[Union[str, Path]]): The Parquet output of the data pipeline
+        db_name (Optional[Union[str, Path]]): The SQLite database of the data pipeline
+        levels (Sequence[str]): The columns identifying a series, from the top of the hierarchy
+
+    Returns:
+        pd.DataFrame: The daily sales indexed by date, one column per series, zero on days without orders
+    """
+    levels: List[str] = list(levels)
+    df = None
+    if db_name is not None and Path(db_name).exists():
+        sales_cube = SalesCube(reader=get_reader(db_name))
+        if sales_cube.is_built():
+            df = sales_cube.query(by=levels).rename(columns={"Date": "OrderDate"})
+    if df is None or not len(df):
+        df = load_sales_data(csv_path, parquet_path, columns=["OrderDate", "Sales"] + levels)
+        df["OrderDate"] = df["OrderDate"].dt.normalize()
+    panel = df.pivot_table(
+        index="OrderDate", columns=levels, values="Sales", aggfunc="sum", fill_value=0.0, observed=True
+    )
+    return panel.asfreq("D", fill_value=0.0).astype(float)
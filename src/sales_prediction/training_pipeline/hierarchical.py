@@ -0,0 +1,239 @@
+import pickle
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from sktime.forecasting.base import BaseForecaster, ForecastingHorizon
+
+from sales_prediction.training_pipeline.modelling import create_model
+
+TOTAL = "__total"
+
+
+def traced_peak_memory(fit: Callable[[], BaseForecaster]) -> float:
+    """
+    The peak memory traced by tracemalloc while running `fit`, in bytes
+
+    Tracing is only started and stopped here when it was not already on, so an outer
+    tracing session keeps running.
+    """
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    traced_before = tracemalloc.get_traced_memory()[0]
+    try:
+        fit()
+        return tracemalloc.get_traced_memory()[1] - traced_before
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def fit_series(
+    model_factory: Callable[[], BaseForecaster], key: Hashable, y: pd.Series, trace_memory: bool = False
+) -> Tuple[Hashable, BaseForecaster, Dict[str, float]]:
+    """
+    Fit a new pipeline on one series and measure the fit
+
+    The fit is timed without tracing. With `trace_memory` a second pipeline is fitted under
+    tracemalloc to measure the peak memory, which doubles the fit time.
+
+    Args:
+        model_factory (Callable[[], BaseForecaster]): builds an unfitted pipeline
+        key (Hashable): the column of the series in the panel
+        y (pd.Series): the daily sales of the series
+        trace_memory (bool): also measure the peak memory of the fit
+    Returns:
+        Tuple[Hashable, BaseForecaster, Dict[str, float]]: the key, the fitted pipeline and its
+        fit time, and peak traced memory when traced
+    """
+    start = perf_counter()
+    model = model_factory().fit(y)
+    stats = {"n_obs": len(y), "fit_seconds": perf_counter() - start}
+    if trace_memory:
+        stats["peak_memory_mb"] = traced_peak_memory(lambda: model_factory().fit(y)) / 1e6
+    return key, model, stats
+
+
+class HierarchicalForecaster:
+    """
+    One forecasting pipeline per bottom series of a panel, with reconciled totals.
+
+    The panel has one column per bottom series (a MultiIndex over the hierarchy levels).
+    With `bottom_up` every total is the sum of the bottom forecasts. With `top_down` an
+    extra pipeline forecasts the grand total, which is split over the bottom series in
+    proportion to their own forecasts (or to their training sales on days where those sum
+    to zero), and the intermediate totals are summed from the split.
+    Predictions carry the bottom series plus `__total` columns for every aggregate.
+
+    The fit report holds the fit time of every series, its peak memory with `trace_memory`,
+    and the pickled size of its pipeline once the forecaster has been saved.
+    """
+
+    RECONCILIATIONS = ("bottom_up", "top_down")
+
+    def __init__(
+        self,
+        model_factory: Callable[[], BaseForecaster] = create_model,
+        reconciliation: str = "bottom_up",
+        workers: int = 1,
+        trace_memory: bool = False,
+    ) -> None:
+        if reconciliation not in self.RECONCILIATIONS:
+            raise ValueError(f"The reconciliation should be one of {self.RECONCILIATIONS}")
+        self.model_factory = model_factory
+        self.reconciliation = reconciliation
+        self.workers = workers
+        self.trace_memory = trace_memory
+
+    def __getstate__(self) -> Dict:
+        # Every pipeline is pickled on its own, which gives its size for the fit report of the state
+        state = self.__dict__.copy()
+        if "models_" in state:
+            models = {
+                key: pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL) for key, model in self.models_.items()
+            }
+            model_mb = [len(models[key]) / 1e6 for key in self.fit_report_["series"]]
+            state.update(models_=models, fit_report_=self.fit_report_.assign(model_mb=model_mb))
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        if "models_" in state:
+            state["models_"] = {key: pickle.loads(model) for key, model in state["models_"].items()}
+        self.__dict__.update(state)
+
+    def _fit_all(self, series: List[Tuple[Hashable, pd.Series]]):
+        if self.workers <= 1:
+            for key, y in series:
+                yield fit_series(self.model_factory, key, y, self.trace_memory)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(fit_series, self.model_factory, key, y, self.trace_memory) for key, y in series
+            ]
+            for future in futures:
+                yield future.result()
+
+    def fit(self, panel: pd.DataFrame):
+        """
+        Fit every bottom series of the panel, and the grand total in top-down mode
+
+        Args:
+            panel (pd.DataFrame): the daily sales, one column per bottom series
+        Returns:
+            HierarchicalForecaster: the fitted forecaster
+        """
+        self.columns_ = panel.columns
+        series = [(key, panel[key]) for key in panel.columns]
+        if self.reconciliation == "top_down":
+            series.append((TOTAL, panel.sum(axis=1)))
+            totals = panel.sum()
+            self.proportions_ = totals / totals.sum() if totals.sum() else totals
+        start = perf_counter()
+        self.models_: Dict[Hashable, BaseForecaster] = {}
+        report = []
+        for key, model, stats in self._fit_all(series):
+            self.models_[key] = model
+            report.append({"series": key, **stats})
+        self.fit_seconds_ = perf_counter() - start
+        self.fit_report_ = pd.DataFrame(report)
+        return self
+
+    def predict_bottom(self, fh) -> pd.DataFrame:
+        """
+        The reconciled forecasts of the bottom series
+        """
+        bottom = pd.concat([self.models_[key].predict(fh) for key in self.columns_], axis=1)
+        bottom.columns = self.columns_
+        if self.reconciliation == "bottom_up":
+            return bottom
+        total = self.models_[TOTAL].predict(fh).to_numpy()
+        shares = bottom.clip(lower=0).to_numpy()
+        sums = shares.sum(axis=1, keepdims=True)
+        shares = np.where(sums > 0, shares / np.where(sums > 0, sums, 1), self.proportions_.to_numpy())
+        return pd.DataFrame(shares * total[:, None], index=bottom.index, columns=self.columns_)
+
+    def predict(self, fh: Union[int, list, pd.Index, ForecastingHorizon]) -> pd.DataFrame:
+        """
+        Forecast every bottom series and every total of the hierarchy
+
+        Args:
+            fh: The forecasting horizon
+        Returns:
+            pd.DataFrame: one column per bottom series and per total, `__total` standing for
+            all the values of a level
+        """
+        return self.aggregate(self.predict_bottom(fh))
+
+    def aggregate(self, bottom: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add the totals of every level of the hierarchy to values of the bottom series
+
+        Args:
+            bottom (pd.DataFrame): one column per bottom series, as the fitted panel
+        Returns:
+            pd.DataFrame: the bottom series followed by the `__total` columns
+        """
+        if not isinstance(self.columns_, pd.MultiIndex):
+            return pd.concat([bottom, bottom.sum(axis=1).rename(TOTAL)], axis=1)
+        frames = [bottom]
+        n_levels = self.columns_.nlevels
+        for depth in range(n_levels - 1, -1, -1):
+            if depth:
+                aggregate = bottom.T.groupby(level=list(range(depth))).sum().T
+                keys = aggregate.columns if depth > 1 else [(key,) for key in aggregate.columns]
+            else:
+                aggregate = bottom.sum(axis=1).to_frame()
+                keys = [()]
+            aggregate.columns = pd.MultiIndex.from_tuples(
+                [tuple(key) + (TOTAL,) * (n_levels - depth) for key in keys], names=self.columns_.names
+            )
+            frames.append(aggregate)
+        return pd.concat(frames, axis=1)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the fitted forecaster, all its pipelines included, to a single pickle file
+
+        The pickled size of every pipeline is added to the fit report as `model_mb`.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = self.__getstate__()
+        with open(path, "wb") as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        if "models_" in state:
+            self.fit_report_ = state["fit_report_"]
+
+    @staticmethod
+    def load(path: Union[str, Path]) -> "HierarchicalForecaster":
+        with open(path, "rb") as file:
+            state = pickle.load(file)
+        forecaster = HierarchicalForecaster.__new__(HierarchicalForecaster)
+        forecaster.__setstate__(state)
+        return forecaster
+
+    def capacity_report(self) -> Dict[str, Optional[float]]:
+        """
+        Fit time and memory per series, to size the machines running the fit
+
+        The memory is None unless the fit was traced, and the artifact size is None until
+        the forecaster has been saved.
+        """
+        report = self.fit_report_
+        traced = "peak_memory_mb" in report
+        return {
+            "series": len(report),
+            "workers": self.workers,
+            "wall_seconds": self.fit_seconds_,
+            "mean_fit_seconds": float(report["fit_seconds"].mean()),
+            "max_fit_seconds": float(report["fit_seconds"].max()),
+            "mean_peak_memory_mb": float(report["peak_memory_mb"].mean()) if traced else None,
+            "max_peak_memory_mb": float(report["peak_memory_mb"].max()) if traced else None,
+            "artifact_mb": float(report["model_mb"].sum()) if "model_mb" in report else None,
+        }
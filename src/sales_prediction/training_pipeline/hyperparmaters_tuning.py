@@ -1,17 +1,33 @@
 from abc import ABC, abstractmethod
-from sklearn.model_selection import BaseCrossValidator
-from sktime.forecasting.base import BaseForecaster
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.model_selection import BaseCrossValidator, ParameterGrid, ParameterSampler
+from sktime.forecasting.base import BaseForecaster, ForecastingHorizon
+from sktime.forecasting.compose import TransformedTargetForecaster
 from sktime.forecasting.model_selection import (ForecastingGridSearchCV,
                                                 ForecastingRandomizedSearchCV)
+from sktime.performance_metrics.forecasting import MeanAbsolutePercentageError
+
+from sales_prediction.training_pipeline.compact_series import CompactSeries, as_series
 
 
 class AbstractTuningHyperParams(ABC):
     def __init__(self, forecaster: BaseForecaster, cv: BaseCrossValidator,
-                 metric, param_grid):
+                 metric, param_grid, backend: Optional[str] = "loky", n_jobs: Optional[int] = None):
         self.forecaster = forecaster
         self.cv = cv
         self.metric = metric
         self.param_grid = param_grid
+        self.backend = backend
+        self.n_jobs = n_jobs
+
+    @property
+    def backend_params(self) -> Optional[Dict[str, int]]:
+        return {"n_jobs": self.n_jobs} if self.n_jobs is not None else None
 
     @abstractmethod
     def fit(self, y_train):
@@ -22,7 +38,8 @@ class GridSearchTuning(AbstractTuningHyperParams):
     def fit(self, y_train):
         search_cv = ForecastingGridSearchCV(forecaster=self.forecaster, cv=self.cv,
                                             param_grid=self.param_grid,
-                                            scoring=self.metric)
+                                            scoring=self.metric, backend=self.backend,
+                                            backend_params=self.backend_params)
         search_cv.fit(y_train)
         return self
 
@@ -31,6 +48,260 @@ class RandomizedSearchTuning(AbstractTuningHyperParams):
     def fit(self, y_train):
         search_cv = ForecastingRandomizedSearchCV(forecaster=self.forecaster, cv=self.cv,
                                                   param_distributions=self.param_grid,
-                                                  scoring=self.metric)
+                                                  scoring=self.metric, backend=self.backend,
+                                                  backend_params=self.backend_params)
         search_cv.fit(y_train)
         return self
+
+
+# A fold whose target transformations are fitted: (fitted transformers, transformed train, test)
+Fold = Tuple[List[BaseForecaster], pd.Series, pd.Series]
+
+
+def take(y: pd.Series, positions: np.ndarray) -> pd.Series:
+    """
+    The values of `y` at `positions`, a view rather than a copy when they are contiguous
+    """
+    if len(positions) and np.all(np.diff(positions) == 1):
+        return y.iloc[positions[0]:positions[-1] + 1]
+    return y.iloc[positions]
+
+
+def split_params(pipeline: TransformedTargetForecaster, params: Dict) -> Tuple[Dict, Dict]:
+    """
+    Split pipeline parameters into the ones of the target transformations and the ones
+    of the final forecaster, the latter without their step prefix
+    """
+    forecaster_name = pipeline.steps[-1][0]
+    prefix = f"{forecaster_name}__"
+    transformer_params = {key: value for key, value in params.items() if not key.startswith(prefix)}
+    forecaster_params = {key[len(prefix):]: value for key, value in params.items() if key.startswith(prefix)}
+    return transformer_params, forecaster_params
+
+
+def fit_fold_transforms(
+    pipeline: TransformedTargetForecaster, y_train: pd.Series, y_test: pd.Series, transformer_params: Dict
+) -> Fold:
+    """
+    Fit the target transformations of the pipeline on a training window
+    """
+    steps = clone(pipeline).set_params(**transformer_params).steps[:-1]
+    transformers = []
+    yt_train = y_train
+    for _, transformer in steps:
+        transformer = clone(transformer)
+        yt_train = transformer.fit_transform(yt_train)
+        transformers.append(transformer)
+    return transformers, yt_train, y_test
+
+
+def score_on_fold(forecaster: BaseForecaster, forecaster_params: Dict, fold: Fold, scoring) -> float:
+    """
+    Fit the final forecaster on the transformed training window and score its
+    inverse-transformed forecast against the test window
+    """
+    transformers, yt_train, y_test = fold
+    model = clone(forecaster).set_params(**forecaster_params).fit(yt_train)
+    y_pred = model.predict(ForecastingHorizon(y_test.index, is_relative=False))
+    for transformer in reversed(transformers):
+        y_pred = transformer.inverse_transform(y_pred)
+    return scoring(y_test, y_pred)
+
+
+class SharedTransformSearchCV:
+    """
+    Grid or random search over a TransformedTargetForecaster that fits the target
+    transformations once per fold and shares them across candidates.
+
+    Every candidate x fold fit of the final forecaster runs as its own joblib task.
+    Scores are errors, the lowest mean wins, and the best candidate is refitted on
+    the whole series.
+    """
+
+    def __init__(
+        self,
+        forecaster: TransformedTargetForecaster,
+        cv,
+        param_grid: Dict,
+        scoring=None,
+        n_iter: Optional[int] = None,
+        random_state: Optional[int] = None,
+        backend: Optional[str] = "loky",
+        n_jobs: int = -1,
+    ):
+        self.forecaster = forecaster
+        self.cv = cv
+        self.param_grid = param_grid
+        self.scoring = scoring if scoring is not None else MeanAbsolutePercentageError()
+        self.n_iter = n_iter
+        self.random_state = random_state
+        self.backend = backend
+        self.n_jobs = n_jobs
+
+    def candidates(self) -> List[Dict]:
+        if self.n_iter is None:
+            return list(ParameterGrid(self.param_grid))
+        return list(ParameterSampler(self.param_grid, n_iter=self.n_iter, random_state=self.random_state))
+
+    def folds(self, y: pd.Series, transformer_params: Dict, fold_indices: Optional[List[int]] = None) -> List[Fold]:
+        splits = list(self.cv.split(y))
+        if fold_indices is not None:
+            splits = [splits[index] for index in fold_indices]
+        return [
+            fit_fold_transforms(self.forecaster, take(y, train), take(y, test), transformer_params)
+            for train, test in splits
+        ]
+
+    def parallel(self) -> Parallel:
+        if self.backend is None:
+            return Parallel(n_jobs=1)
+        return Parallel(n_jobs=self.n_jobs, backend=self.backend)
+
+    def score(self, y: pd.Series, candidates: List[Dict], fold_indices: Optional[List[int]] = None) -> np.ndarray:
+        """
+        Score candidates on folds
+
+        Args:
+            y (pd.Series): the training series
+            candidates (List[Dict]): the pipeline parameters of each candidate
+            fold_indices (Optional[List[int]]): the folds to score on, all of them if None
+        Returns:
+            np.ndarray: the scores, one row per candidate and one column per fold
+        """
+        split = [split_params(self.forecaster, params) for params in candidates]
+        folds_by_transform = {}
+        for transformer_params, _ in split:
+            key = repr(sorted(transformer_params.items()))
+            if key not in folds_by_transform:
+                folds_by_transform[key] = self.folds(y, transformer_params, fold_indices)
+        final_forecaster = self.forecaster.steps[-1][1]
+        tasks = []
+        for transformer_params, forecaster_params in split:
+            key = repr(sorted(transformer_params.items()))
+            for fold in folds_by_transform[key]:
+                tasks.append(delayed(score_on_fold)(final_forecaster, forecaster_params, fold, self.scoring))
+        scores = self.parallel()(tasks)
+        return np.asarray(scores, dtype=float).reshape(len(candidates), -1)
+
+    def fit(self, y: Union[pd.Series, CompactSeries]):
+        y = as_series(y)
+        candidates = self.candidates()
+        scores = self.score(y, candidates)
+        self.cv_results_ = pd.DataFrame({"params": candidates, "mean_test_score": scores.mean(axis=1)})
+        for fold_index in range(scores.shape[1]):
+            self.cv_results_[f"split{fold_index}_test_score"] = scores[:, fold_index]
+        self.cv_results_["rank_test_score"] = self.cv_results_["mean_test_score"].rank(method="min").astype(int)
+        best_index = int(np.argmin(scores.mean(axis=1)))
+        self.best_params_ = candidates[best_index]
+        self.best_score_ = float(scores[best_index].mean())
+        self.best_forecaster_ = clone(self.forecaster).set_params(**self.best_params_).fit(y)
+        return self
+
+    def predict(self, fh):
+        return self.best_forecaster_.predict(fh)
+
+    def save(self, path=None):
+        return self.best_forecaster_.save(path)
+
+
+class SuccessiveHalvingSearchCV(SharedTransformSearchCV):
+    """
+    Successive halving over a TransformedTargetForecaster, with the `max_iter` of the
+    final estimator as the budget.
+
+    Every rung scores the remaining candidates with a larger budget on more folds, taking
+    the earliest (cheapest) folds first, and keeps the best `1 / factor` of them. The last
+    rung uses `max_resource` on every fold.
+    """
+
+    def __init__(
+        self,
+        forecaster: TransformedTargetForecaster,
+        cv,
+        param_grid: Dict,
+        scoring=None,
+        n_iter: Optional[int] = None,
+        random_state: Optional[int] = None,
+        backend: Optional[str] = "loky",
+        n_jobs: int = -1,
+        factor: int = 3,
+        resource: str = "forecaster__estimator__max_iter",
+        min_resource: int = 10,
+        max_resource: Optional[int] = None,
+        min_folds: int = 3,
+    ):
+        super().__init__(forecaster, cv, param_grid, scoring, n_iter, random_state, backend, n_jobs)
+        self.factor = factor
+        self.resource = resource
+        self.min_resource = min_resource
+        self.max_resource = max_resource
+        self.min_folds = min_folds
+
+    def schedule(self, n_candidates: int, n_folds: int) -> List[Tuple[int, int]]:
+        """
+        The budget and the number of folds of every rung
+
+        Args:
+            n_candidates (int): the number of candidates of the first rung
+            n_folds (int): the number of folds of the splitter
+        Returns:
+            List[Tuple[int, int]]: (budget, number of folds) per rung
+        """
+        max_resource = self.max_resource or self.forecaster.get_params()[self.resource]
+        n_rungs = 1
+        while self.min_resource * self.factor ** n_rungs <= max_resource and self.factor ** n_rungs <= n_candidates:
+            n_rungs += 1
+        rungs = []
+        for rung in range(n_rungs):
+            shrink = self.factor ** (n_rungs - 1 - rung)
+            budget = max(int(max_resource / shrink), 1)
+            folds = min(max(int(np.ceil(n_folds / shrink)), self.min_folds), n_folds)
+            rungs.append((budget, folds))
+        return rungs
+
+    def fit(self, y: Union[pd.Series, CompactSeries]):
+        y = as_series(y)
+        candidates = self.candidates()
+        n_folds = self.cv.get_n_splits(y)
+        results = []
+        alive = list(range(len(candidates)))
+        for rung, (budget, folds) in enumerate(self.schedule(len(candidates), n_folds)):
+            params = [dict(candidates[index], **{self.resource: budget}) for index in alive]
+            scores = self.score(y, params, list(range(folds))).mean(axis=1)
+            for index, score in zip(alive, scores):
+                results.append(
+                    {"rung": rung, "budget": budget, "n_folds": folds,
+                     "params": candidates[index], "mean_test_score": score}
+                )
+            keep = max(int(np.ceil(len(alive) / self.factor)), 1)
+            order = np.argsort(scores, kind="stable")
+            best_score = float(scores[order[0]])
+            alive = [alive[position] for position in order[:keep]]
+        self.cv_results_ = pd.DataFrame(results)
+        self.best_params_ = dict(candidates[alive[0]], **{self.resource: budget})
+        self.best_score_ = best_score
+        self.best_forecaster_ = clone(self.forecaster).set_params(**self.best_params_).fit(y)
+        return self
+
+
+class SuccessiveHalvingTuning(AbstractTuningHyperParams):
+    def __init__(self, forecaster: BaseForecaster, cv: BaseCrossValidator,
+                 metric, param_grid, backend: Optional[str] = "loky", n_jobs: Optional[int] = None,
+                 factor: int = 3, min_resource: int = 10, max_resource: Optional[int] = None,
+                 n_iter: Optional[int] = None, random_state: Optional[int] = None):
+        super().__init__(forecaster, cv, metric, param_grid, backend, n_jobs)
+        self.factor = factor
+        self.min_resource = min_resource
+        self.max_resource = max_resource
+        self.n_iter = n_iter
+        self.random_state = random_state
+
+    def fit(self, y_train):
+        self.search_cv = SuccessiveHalvingSearchCV(
+            forecaster=self.forecaster, cv=self.cv, param_grid=self.param_grid,
+            scoring=self.metric, n_iter=self.n_iter, random_state=self.random_state,
+            backend=self.backend, n_jobs=self.n_jobs if self.n_jobs is not None else -1,
+            factor=self.factor, min_resource=self.min_resource, max_resource=self.max_resource,
+        )
+        self.search_cv.fit(y_train)
+        return self
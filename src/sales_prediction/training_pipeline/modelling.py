@@ -1,6 +1,11 @@
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
 from sktime.transformations.series.difference import Differencer
 from sktime.transformations.series.detrend import Deseasonalizer
 from sklearn.ensemble import HistGradientBoostingRegressor
+from sktime.forecasting.base import ForecastingHorizon
 from sktime.forecasting.compose import make_reduction
 from sktime.forecasting.compose import TransformedTargetForecaster
 
@@ -51,3 +56,127 @@ def create_tuning_model() -> TransformedTargetForecaster:
         ]
     )
     return forecaster_pipeline
+
+
+class GlobalLagForecaster:
+    """
+    A single gradient boosting model shared by every series of a panel.
+
+    Each row of the design matrix is one (day, series) pair: the lags and rolling means of
+    the series scaled by its mean level, the calendar of the day and the log of the level.
+    The target is the scaled sales of the day, so series of any size share the model.
+    Features are built for all series at once with array operations into a float32 matrix,
+    and the forecast is recursive, with one batched `predict` per step for all the series.
+    """
+
+    def __init__(
+        self,
+        lags: Sequence[int] = (1, 2, 3, 7, 14, 28),
+        windows: Sequence[int] = (7, 28),
+        estimator: Optional[HistGradientBoostingRegressor] = None,
+    ) -> None:
+        self.lags = tuple(lags)
+        self.windows = tuple(windows)
+        self.estimator = estimator if estimator is not None else HistGradientBoostingRegressor(random_state=42)
+        self.history_length = max(self.lags + self.windows)
+
+    @property
+    def feature_names(self):
+        return (
+            [f"lag_{lag}" for lag in self.lags]
+            + [f"rolling_mean_{window}" for window in self.windows]
+            + ["day_of_week", "day_of_month", "month", "log_level"]
+        )
+
+    def features(self, values: np.ndarray, positions: np.ndarray, dates: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Build the design matrix of the days at `positions`
+
+        Args:
+            values (np.ndarray): the scaled sales, one row per day and one column per series
+            positions (np.ndarray): the rows of the days to describe, from `history_length` on
+            dates (pd.DatetimeIndex): the dates of those days
+        Returns:
+            np.ndarray: a float32 matrix with one row per day and series, days first
+        """
+        n_series = values.shape[1]
+        cumsum = np.zeros((values.shape[0] + 1, n_series))
+        np.cumsum(values, axis=0, out=cumsum[1:])
+        matrix = np.empty((len(positions), n_series, len(self.feature_names)), dtype=np.float32)
+        for column, lag in enumerate(self.lags):
+            matrix[:, :, column] = values[positions - lag]
+        column = len(self.lags)
+        for offset, window in enumerate(self.windows):
+            matrix[:, :, column + offset] = (cumsum[positions] - cumsum[positions - window]) / window
+        column += len(self.windows)
+        matrix[:, :, column] = dates.dayofweek.to_numpy()[:, None]
+        matrix[:, :, column + 1] = dates.day.to_numpy()[:, None]
+        matrix[:, :, column + 2] = dates.month.to_numpy()[:, None]
+        matrix[:, :, column + 3] = self.log_level_
+        return matrix.reshape(-1, matrix.shape[2])
+
+    def fit(self, panel: pd.DataFrame):
+        """
+        Fit the shared model on every series of the panel
+
+        Args:
+            panel (pd.DataFrame): the daily sales, one column per series
+        Returns:
+            GlobalLagForecaster: the fitted forecaster
+        """
+        if len(panel) <= self.history_length:
+            raise ValueError(f"The panel needs more than {self.history_length} days")
+        values = panel.to_numpy(dtype=np.float64)
+        self.columns_ = panel.columns
+        self.scale_ = np.maximum(values.mean(axis=0), 1e-6)
+        self.log_level_ = np.log1p(self.scale_).astype(np.float32)
+        scaled = values / self.scale_
+        positions = np.arange(self.history_length, len(panel))
+        X = self.features(scaled, positions, panel.index[positions])
+        y = scaled[positions].reshape(-1).astype(np.float32)
+        self.estimator.fit(X, y)
+        self.history_ = scaled[-self.history_length:]
+        self.cutoff_ = panel.index[-1]
+        return self
+
+    def predict(self, fh: Union[int, list, pd.Index, ForecastingHorizon]) -> pd.DataFrame:
+        """
+        Forecast every series of the panel
+
+        Args:
+            fh: The forecasting horizon, relative to the end of the panel or absolute dates
+        Returns:
+            pd.DataFrame: the forecasts, one column per series
+        """
+        if not isinstance(fh, ForecastingHorizon):
+            fh = ForecastingHorizon(fh, is_relative=not isinstance(fh, pd.DatetimeIndex))
+        steps = fh.to_relative(self.cutoff_).to_numpy()
+        if steps.min() < 1:
+            raise ValueError("Only future days can be forecasted")
+        dates = pd.date_range(self.cutoff_ + pd.Timedelta(days=1), periods=int(steps.max()), freq="D")
+        history = np.empty((self.history_length + len(dates), len(self.columns_)))
+        history[:self.history_length] = self.history_
+        for step, date in enumerate(dates):
+            position = self.history_length + step
+            window = history[position - self.history_length:position]
+            X = self.features(window, np.array([self.history_length]), dates[step:step + 1])
+            history[position] = self.estimator.predict(X)
+        forecast = history[self.history_length:] * self.scale_
+        return pd.DataFrame(forecast[steps - 1], index=dates[steps - 1], columns=self.columns_)
+
+
+def create_global_model() -> GlobalLagForecaster:
+    """
+    Create the global forecasting model shared by all the series of a panel
+
+    Args:
+        None
+
+    Returns:
+        GlobalLagForecaster: The global forecasting model
+    """
+    return GlobalLagForecaster(
+        estimator=HistGradientBoostingRegressor(
+            max_iter=300, random_state=42, learning_rate=0.1, max_bins=100, early_stopping=False
+        ),
+    )
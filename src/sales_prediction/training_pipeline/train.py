@@ -1,12 +1,18 @@
+import copy
+import numpy as np
 import pandas as pd
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, Optional, Union
 import mlflow
+from sktime.forecasting.base import ForecastingHorizon
+from sktime.forecasting.compose import TransformedTargetForecaster
 from sktime.performance_metrics.forecasting import (
     mean_squared_percentage_error,
     mean_absolute_percentage_error,
     mean_absolute_error,
 )
+from sktime.transformations.series.difference import Differencer
+from sales_prediction.training_pipeline.compact_series import CompactSeries, as_series
 
 
 class BaseTrainingPipeline(ABC):
@@ -20,7 +26,7 @@ class BaseTrainingPipeline(ABC):
 
 
 class TrainingPipeline(BaseTrainingPipeline):
-    def __init__(self, forecaster, train_df: pd.Series):
+    def __init__(self, forecaster, train_df: Union[pd.Series, CompactSeries]):
         self.forecaster = forecaster
         self.train_df = train_df
 
@@ -30,12 +36,12 @@ class TrainingPipeline(BaseTrainingPipeline):
 
         Args:
             forecaster (ForecastingPipeline): The forecasting pipeline
-            train_df (pd.DataFrame): The training data
+            train_df (Union[pd.Series, CompactSeries]): The training data
 
         Returns:
             the fitted pipeline
         """
-        self._pipeline = self.forecaster.fit(self.train_df)
+        self._pipeline = self.forecaster.fit(as_series(self.train_df))
         return self._pipeline
 
     def forecast(self, fh: int):
@@ -52,8 +58,115 @@ class TrainingPipeline(BaseTrainingPipeline):
         return self.forecaster.predict(fh)
 
 
+def warm_start_update(
+    pipeline: TransformedTargetForecaster, y: pd.Series, y_new: pd.Series, extra_iter: int
+) -> TransformedTargetForecaster:
+    """
+    Move a fitted pipeline forward over new observations without refitting it
+
+    The target transformations keep their fitted parameters: the Deseasonalizer keeps its
+    seasonal components and the Differencer only moves the last level it inverts from. The
+    final HistGradientBoostingRegressor adds `extra_iter` boosting iterations (warm start)
+    fitted on the windows of the whole transformed series.
+
+    Args:
+        pipeline (TransformedTargetForecaster): the fitted pipeline, updated in place
+        y (pd.Series): the whole series, new observations included
+        y_new (pd.Series): the observations after the cutoff of the pipeline
+        extra_iter (int): the number of boosting iterations to add
+    Returns:
+        TransformedTargetForecaster: the updated pipeline
+    """
+    pipeline.update(y_new, update_params=False)
+    # the pipeline hands the transformations data frames, which their memory keeps
+    yt_new = y_new.to_frame()
+    for _, transformer in pipeline.transformers_pre_:
+        yt_next = transformer.transform(yt_new)
+        if isinstance(transformer, Differencer):
+            transformer.fit(yt_new)
+        yt_new = yt_next
+    yt = y.to_frame()
+    for _, transformer in pipeline.transformers_pre_:
+        yt = transformer.transform(yt)
+    reducer = pipeline.forecaster_
+    window_length = reducer.window_length
+    values = yt.iloc[:, 0].to_numpy(dtype=float)
+    X = np.lib.stride_tricks.sliding_window_view(values[:-1], window_length)
+    estimator = reducer.estimator_
+    estimator.set_params(warm_start=True, max_iter=estimator.n_iter_ + extra_iter)
+    estimator.fit(X, values[window_length:])
+    estimator.set_params(warm_start=False)
+    return pipeline
+
+
+class IncrementalTrainingPipeline(BaseTrainingPipeline):
+    """
+    Retrains the previous model on the days observed after its cutoff.
+
+    A copy of the previous pipeline is updated with `warm_start_update`, so the previous one,
+    which may be shared through the model registry, is never left half updated. It is replaced
+    by a full refit of `forecaster` when there is no previous model, every `refit_every` updates,
+    or when its MAPE on the new days exceeds `drift_threshold`.
+    """
+
+    def __init__(
+        self,
+        forecaster,
+        train_df: Union[pd.Series, CompactSeries],
+        previous: Optional[TransformedTargetForecaster] = None,
+        updates_since_refit: int = 0,
+        extra_iter: int = 50,
+        refit_every: int = 7,
+        drift_threshold: float = 0.3,
+    ):
+        self.forecaster = forecaster
+        self.train_df = train_df
+        self.previous = previous
+        self.updates_since_refit = updates_since_refit
+        self.extra_iter = extra_iter
+        self.refit_every = refit_every
+        self.drift_threshold = drift_threshold
+
+    def fit(self):
+        """
+        Update the previous model, or refit the forecaster on the whole training data
+
+        Returns:
+            the fitted pipeline, with `mode_` set to "refit", "update" or "unchanged"
+        """
+        self.drift_error_ = None
+        self.train_df = as_series(self.train_df)
+        if self.previous is None:
+            return self._refit()
+        y_new = self.train_df[self.train_df.index > self.previous.cutoff[0]]
+        if y_new.empty:
+            self.mode_ = "unchanged"
+            self.updates_since_refit_ = self.updates_since_refit
+            self._pipeline = self.forecaster = self.previous
+            return self._pipeline
+        fh = ForecastingHorizon(y_new.index, is_relative=False)
+        self.drift_error_ = float(mean_absolute_percentage_error(y_new, self.previous.predict(fh)))
+        if self.drift_error_ > self.drift_threshold or self.updates_since_refit + 1 >= self.refit_every:
+            return self._refit()
+        self.mode_ = "update"
+        self.updates_since_refit_ = self.updates_since_refit + 1
+        self._pipeline = self.forecaster = warm_start_update(
+            copy.deepcopy(self.previous), self.train_df, y_new, self.extra_iter
+        )
+        return self._pipeline
+
+    def _refit(self):
+        self.mode_ = "refit"
+        self.updates_since_refit_ = 0
+        self._pipeline = self.forecaster.fit(self.train_df)
+        return self._pipeline
+
+    def forecast(self, fh: int):
+        return self._pipeline.predict(fh)
+
+
 class ModelEvaluator:
-    def evaluate(self, test_df: pd.Series, predictions: pd.Series) -> Dict[str, float]:
+    def evaluate(self, test_df: Union[pd.Series, CompactSeries], predictions: pd.Series) -> Dict[str, float]:
         """
         Evaluate the forecasting pipeline
 
@@ -64,6 +177,7 @@ class ModelEvaluator:
         Returns:
             pd.DataFrame: The evaluation metrics
         """
+        test_df = as_series(test_df)
 
         metrics = {
             "mse": mean_squared_percentage_error(test_df, predictions),
@@ -72,4 +186,4 @@ class ModelEvaluator:
         }
         for metric_name, metric_value in metrics.items():
             mlflow.log_metric(metric_name, metric_value)
-        return metrics
\ No newline at end of file
+        return metrics
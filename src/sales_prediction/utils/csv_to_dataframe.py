@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
 import pandas as pd
 from pathlib import Path
 
@@ -18,6 +18,26 @@ class DataLoader:
         )
         return df
 
+    def load_chunks(
+        self, chunksize: int, parse_dates: Optional[List[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read the csv file lazily, `chunksize` rows at a time
+
+        Args:
+            chunksize (int): the number of rows per chunk
+            parse_dates (Optional[List[str]]): the columns to parse as dates
+        Returns:
+            Iterator[pd.DataFrame]: the chunks of the csv file
+        """
+        with pd.read_csv(
+            self.csv_path,
+            delimiter=self.delimiter,
+            parse_dates=parse_dates,
+            chunksize=chunksize,
+        ) as reader:
+            yield from reader
+
     @property
     def csv_path(self) -> Path:
         return self._csv_path
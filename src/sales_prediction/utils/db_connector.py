@@ -1,5 +1,12 @@
+import queue
 import sqlite3
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
 
 
 @contextmanager
@@ -9,3 +16,188 @@ def sqlite_connector(db_name: str):
         yield conn
     finally:
         conn.close()
+
+
+def get_load_version(connection: sqlite3.Connection) -> int:
+    """
+    The load version of the database, bumped by the data pipeline after every load
+    """
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def bump_load_version(connection: sqlite3.Connection) -> int:
+    """
+    Increment the load version so the readers drop their cached results
+
+    Args:
+        connection (sqlite3.Connection): a writable connection to the database
+    Returns:
+        int: the new load version
+    """
+    load_version = get_load_version(connection) + 1
+    with connection:
+        connection.execute(f"PRAGMA user_version = {load_version}")
+    return load_version
+
+
+class SqliteConnectionPool:
+    """
+    A fixed-size pool of SQLite connections that threads check out and give back.
+
+    Connections are opened lazily, read-only through a `mode=ro` URI unless `read_only` is False.
+    """
+
+    def __init__(
+        self,
+        db_name: Union[str, Path],
+        size: int = 4,
+        read_only: bool = True,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.db_name: Path = Path(db_name)
+        self.size: int = size
+        self.read_only: bool = read_only
+        self.timeout: Optional[float] = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            uri = f"{self.db_name.resolve().as_uri()}?mode=ro"
+            return sqlite3.connect(uri, uri=True, check_same_thread=False)
+        return sqlite3.connect(self.db_name, check_same_thread=False)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a connection for the duration of the block, waiting for one when all are in use
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                conn = self._connect() if len(self._opened) < self.size else None
+                if conn is not None:
+                    self._opened.append(conn)
+            if conn is None:
+                conn = self._idle.get(timeout=self.timeout)
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._opened:
+                conn.close()
+            self._opened = []
+            self._idle = queue.LifoQueue()
+
+
+class SqliteReader:
+    """
+    Parameterized read queries over a connection pool, with their results cached.
+
+    The cache is keyed by SQL and parameters and is emptied when the load version changes.
+    """
+
+    def __init__(self, pool: SqliteConnectionPool, cache_size: int = 128) -> None:
+        self.pool: SqliteConnectionPool = pool
+        self.cache_size: int = cache_size
+        self._cache: "OrderedDict[Tuple[str, tuple], pd.DataFrame]" = OrderedDict()
+        self._load_version: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def read_sql(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        """
+        Run a read query, answering from the cache when the database has not been reloaded
+
+        Args:
+            sql (str): the query, with `?` placeholders
+            params (Sequence): the values bound to the placeholders
+        Returns:
+            pd.DataFrame: a copy of the query result
+        """
+        key = (sql, tuple(params))
+        with self.pool.connection() as connection:
+            load_version = get_load_version(connection)
+            with self._lock:
+                if load_version != self._load_version:
+                    self._cache.clear()
+                    self._load_version = load_version
+                df = self._cache.get(key)
+                if df is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return df.copy()
+                self.misses += 1
+            df = pd.read_sql_query(sql, connection, params=list(params))
+        with self._lock:
+            if self._load_version == load_version:
+                self._cache[key] = df
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return df.copy()
+
+    def select(
+        self,
+        table_name: str,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Sequence]] = None,
+        order_by: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Read a filtered slice of a table
+
+        Args:
+            table_name (str): the table to read
+            columns (Optional[Sequence[str]]): the columns to read, all of them if None
+            filters (Optional[Dict[str, Sequence]]): the values to keep for some columns
+            order_by (Optional[Sequence[str]]): the columns to sort by
+        Returns:
+            pd.DataFrame: the rows of the table matching the filters
+        """
+        select = ", ".join(f'"{column}"' for column in columns) if columns else "*"
+        sql = f'SELECT {select} FROM "{table_name}"'
+        params: list = []
+        if filters:
+            conditions = []
+            for column, values in filters.items():
+                conditions.append(f'"{column}" IN ({", ".join("?" for _ in values)})')
+                params.extend(values)
+            sql += f" WHERE {' AND '.join(conditions)}"
+        if order_by:
+            sql += " ORDER BY " + ", ".join(f'"{column}"' for column in order_by)
+        return self.read_sql(sql, params)
+
+    def table_names(self) -> List[str]:
+        return self.read_sql("SELECT name FROM sqlite_master WHERE type = 'table'")["name"].tolist()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+_readers: Dict[Path, SqliteReader] = {}
+_readers_lock = threading.Lock()
+
+
+def get_reader(db_name: Union[str, Path], pool_size: int = 4, cache_size: int = 128) -> SqliteReader:
+    """
+    The process-wide read-only reader of a database, created on first use
+
+    Args:
+        db_name (Union[str, Path]): the SQLite database
+        pool_size (int): the number of pooled connections
+        cache_size (int): the number of cached query results
+    Returns:
+        SqliteReader: the reader shared by every caller of this process
+    """
+    db_path = Path(db_name).resolve()
+    with _readers_lock:
+        if db_path not in _readers:
+            _readers[db_path] = SqliteReader(SqliteConnectionPool(db_path, size=pool_size), cache_size)
+        return _readers[db_path]
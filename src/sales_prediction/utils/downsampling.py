@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+METHODS = ("lttb", "minmax")
+
+
+def points_budget(width: int, points_per_pixel: float = 2.0) -> int:
+    """
+    The number of points worth sending for a chart `width` pixels wide
+    """
+    return max(int(width * points_per_pixel), 3)
+
+
+def lttb_positions(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    The positions kept by Largest-Triangle-Three-Buckets
+
+    The first and last points are kept, the others are split into `max_points - 2` buckets,
+    and each bucket keeps the point forming the largest triangle with the point kept in the
+    previous bucket and the mean of the next one. Bucket means are computed for all buckets
+    at once, and each bucket's triangle areas in one vectorized expression.
+
+    Args:
+        x (np.ndarray): the increasing x values, as floats
+        y (np.ndarray): the y values
+        max_points (int): the number of points to keep, at least 3
+    Returns:
+        np.ndarray: the sorted positions of the kept points
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    starts, stops = edges[:-1], edges[1:]
+    counts = stops - starts
+    next_x = np.append(np.add.reduceat(x[:n - 1], starts)[1:] / counts[1:], x[n - 1])
+    next_y = np.append(np.add.reduceat(y[:n - 1], starts)[1:] / counts[1:], y[n - 1])
+    positions = np.empty(max_points, dtype=np.int64)
+    positions[0], positions[-1] = 0, n - 1
+    kept = 0
+    for bucket, (start, stop) in enumerate(zip(starts, stops)):
+        area = np.abs(
+            (x[kept] - next_x[bucket]) * (y[start:stop] - y[kept])
+            - (x[kept] - x[start:stop]) * (next_y[bucket] - y[kept])
+        )
+        kept = start + int(np.argmax(area))
+        positions[bucket + 1] = kept
+    return positions
+
+
+def minmax_positions(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    The positions of the minimum and maximum of equal-width buckets, plus the first and last points
+
+    Args:
+        y (np.ndarray): the y values, missing values being ignored
+        max_points (int): the number of points to keep, at least 3
+    Returns:
+        np.ndarray: the sorted positions of the kept points
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    bucket_size = int(np.ceil(n / max(max_points // 2 - 1, 1)))
+    n_buckets = int(np.ceil(n / bucket_size))
+    padding = n_buckets * bucket_size - n
+    missing = np.isnan(y)
+    low = np.append(np.where(missing, np.inf, y), np.full(padding, np.inf)).reshape(n_buckets, bucket_size)
+    high = np.append(np.where(missing, -np.inf, y), np.full(padding, -np.inf)).reshape(n_buckets, bucket_size)
+    offsets = np.arange(n_buckets) * bucket_size
+    return np.unique(np.concatenate([[0, n - 1], offsets + low.argmin(axis=1), offsets + high.argmax(axis=1)]))
+
+
+def downsample(series: pd.Series, max_points: int, method: str = "lttb") -> pd.Series:
+    """
+    Reduce a series to at most `max_points` points that keep the shape of its line chart
+
+    Args:
+        series (pd.Series): the series, indexed by increasing dates or numbers
+        max_points (int): the point budget, see `points_budget`
+        method (str): 'lttb' (Largest-Triangle-Three-Buckets) or 'minmax' (the extremes of
+            each bucket, which keeps every spike)
+    Returns:
+        pd.Series: the kept points, the series itself when it already fits the budget
+    """
+    if method not in METHODS:
+        raise ValueError(f"The method should be one of {METHODS}")
+    max_points = max(max_points, 3)
+    if len(series) <= max_points:
+        return series
+    y = series.to_numpy(dtype=float)
+    if method == "minmax":
+        return series.iloc[minmax_positions(y, max_points)]
+    index = series.index
+    x = index.asi8 if isinstance(index, pd.DatetimeIndex) else index.to_numpy()
+    return series.iloc[lttb_positions(np.asarray(x, dtype=float), np.nan_to_num(y), max_points)]
@@ -0,0 +1,142 @@
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+from sktime.forecasting.base import ForecastingHorizon
+
+from sales_prediction.utils.registries import ModelRegistry
+
+
+class ForecastCache:
+    """
+    Forecasts persisted in SQLite, keyed by the hash of the model artifact and the horizon.
+
+    The least recently used entries are evicted past `max_entries` or `max_bytes`, and the
+    entries of a model are dropped when ModelRegistry saves a new one at the same path.
+    """
+
+    def __init__(
+        self,
+        db_name: Union[str, Path],
+        max_entries: int = 256,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+    ) -> None:
+        self.db_name: Path = Path(db_name)
+        self.max_entries: int = max_entries
+        self.max_bytes: Optional[int] = max_bytes
+        self.db_name.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.db_name, check_same_thread=False)
+        self.create_table()
+        ModelRegistry.register_save_hook(self.invalidate)
+
+    def create_table(self) -> None:
+        with self._lock, self._connection as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS forecast_cache ("
+                "key TEXT PRIMARY KEY, model_path TEXT, model_hash TEXT, "
+                "value BLOB, size INTEGER, last_used REAL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_forecast_cache_model_path ON forecast_cache (model_path)"
+            )
+
+    @staticmethod
+    def horizon_key(fh: Union[int, list, pd.Index, ForecastingHorizon]) -> str:
+        """
+        A stable digest of a forecasting horizon
+        """
+        if not isinstance(fh, ForecastingHorizon):
+            fh = ForecastingHorizon(fh)
+        values = fh.to_pandas()
+        text = f"{fh.is_relative}|{values.dtype}|{','.join(map(str, values))}"
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    @staticmethod
+    def model_key(model_path: Union[str, Path]) -> str:
+        return str(Path(model_path).resolve())
+
+    def get(self, model_path: Union[str, Path], model_hash: str, horizon_key: str) -> Optional[pd.Series]:
+        """
+        The cached forecast of a model for a horizon, None when it is not cached
+
+        Args:
+            model_path (Union[str, Path]): the path of the saved model
+            model_hash (str): the hash of the saved model
+            horizon_key (str): the digest of the horizon
+        Returns:
+            Optional[pd.Series]: the forecast
+        """
+        key = f"{model_hash}:{horizon_key}"
+        with self._lock, self._connection as connection:
+            row = connection.execute("SELECT value FROM forecast_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                connection.execute(
+                    "DELETE FROM forecast_cache WHERE model_path = ? AND model_hash != ?",
+                    (self.model_key(model_path), model_hash),
+                )
+                return None
+            connection.execute("UPDATE forecast_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        return pickle.loads(row[0])
+
+    def put(self, model_path: Union[str, Path], model_hash: str, horizon_key: str, forecast: pd.Series) -> None:
+        """
+        Store the forecast of a model for a horizon, then evict past the size caps
+
+        Args:
+            model_path (Union[str, Path]): the path of the saved model
+            model_hash (str): the hash of the saved model
+            horizon_key (str): the digest of the horizon
+            forecast (pd.Series): the forecast
+        Returns:
+            None
+        """
+        value = pickle.dumps(forecast, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._connection as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO forecast_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    f"{model_hash}:{horizon_key}",
+                    self.model_key(model_path),
+                    model_hash,
+                    value,
+                    len(value),
+                    time.time(),
+                ),
+            )
+            self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        connection.execute(
+            "DELETE FROM forecast_cache WHERE key NOT IN "
+            "(SELECT key FROM forecast_cache ORDER BY last_used DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+        if self.max_bytes is not None:
+            connection.execute(
+                "DELETE FROM forecast_cache WHERE key IN (SELECT key FROM ("
+                "SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS total FROM forecast_cache"
+                ") WHERE total > ?)",
+                (self.max_bytes,),
+            )
+
+    def invalidate(self, model_path: Union[str, Path]) -> None:
+        """
+        Drop the cached forecasts of the model saved at `model_path`
+        """
+        with self._lock, self._connection as connection:
+            connection.execute("DELETE FROM forecast_cache WHERE model_path = ?", (self.model_key(model_path),))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM forecast_cache").fetchone()[0]
+
+    def close(self) -> None:
+        ModelRegistry.unregister_save_hook(self.invalidate)
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,67 @@
+from pathlib import Path
+from typing import List, Optional, Union
+
+import pandas as pd
+
+
+class ParquetLoader:
+    """
+    Loads data from a Parquet dataset partitioned by year and month.
+    """
+
+    PARTITION_DTYPES = {"Year": "int16", "Month": "int8"}
+
+    def __init__(self, dataset_path: Union[str, Path]) -> None:
+        self.dataset_path: Path = Path(dataset_path)
+
+    def load_data(
+        self,
+        columns: Optional[List[str]] = None,
+        years: Optional[List[int]] = None,
+        months: Optional[List[int]] = None,
+    ) -> pd.DataFrame:
+        """
+        Read the dataset, only opening the partitions and the columns that are asked for
+
+        Args:
+            columns (Optional[List[str]]): the columns to read, all of them if None
+            years (Optional[List[int]]): the years to read, all of them if None
+            months (Optional[List[int]]): the months to read, all of them if None
+        Returns:
+            pd.DataFrame: the data
+        """
+        filters = []
+        if years is not None:
+            filters.append(("Year", "in", list(years)))
+        if months is not None:
+            filters.append(("Month", "in", list(months)))
+        df = pd.read_parquet(
+            self.dataset_path, engine="pyarrow", columns=columns, filters=filters or None
+        )
+        for column, dtype in self.PARTITION_DTYPES.items():
+            if column in df.columns:
+                df[column] = df[column].astype(dtype)
+        return df
+
+
+def load_sales_data(
+    csv_path: Union[str, Path],
+    parquet_path: Optional[Union[str, Path]] = None,
+    columns: Optional[List[str]] = None,
+    date_column: str = "OrderDate",
+) -> pd.DataFrame:
+    """
+    Load the processed sales, from the Parquet dataset when it exists and from the csv output otherwise
+
+    Args:
+        csv_path (Union[str, Path]): the csv output of the data pipeline
+        parquet_path (Optional[Union[str, Path]]): the Parquet output of the data pipeline
+        columns (Optional[List[str]]): the columns to read, all of them if None
+        date_column (str): the column parsed as a date when reading the csv output
+    Returns:
+        pd.DataFrame: the processed sales
+    """
+    if parquet_path is not None and Path(parquet_path).exists():
+        return ParquetLoader(parquet_path).load_data(columns=columns)
+    parse_dates = [date_column] if columns is None or date_column in columns else None
+    return pd.read_csv(csv_path, usecols=columns, parse_dates=parse_dates)
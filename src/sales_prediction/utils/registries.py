@@ -1,11 +1,173 @@
-from sktime.utils import mlflow_sktime
+import hashlib
+import os
+import pickle
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple, Union
 
 
 class ModelRegistry:
-    @staticmethod
-    def load_model(name: str):
+    """
+    Saves and loads the forecasting models.
+
+    Loaded models are kept in memory by path and reloaded only when a file of the artifact
+    changes. Next to the mlflow artifact, `save_model` writes the fitted pipeline as a plain
+    pickle that loads without importing mlflow.
+    """
+
+    FAST_FORMAT_FILE = "forecaster.pkl"
+    _save_hooks: List[Callable[[str], None]] = []
+    _artifact_hashes: Dict[str, Tuple[tuple, str]] = {}
+    _models: Dict[str, Tuple[tuple, object]] = {}
+    _load_locks: Dict[str, threading.Lock] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def load_model(cls, name: str, use_cache: bool = True):
+        """
+        Load a saved model, from memory when its artifact has not changed since the last load
+
+        The cached model is shared by every caller of this process, including the warm-up thread
+        and the serving jobs, and must not be changed in place. Callers that update a model load
+        it with `use_cache=False`, which reads a private copy and leaves the cache untouched, or
+        take a `copy.deepcopy` of it.
+
+        Args:
+            name (str): the path of the saved model
+            use_cache (bool): False to read the artifact into a model of the caller's own
+        Returns:
+            the fitted forecaster
+        """
+        key = str(Path(name).resolve())
+        with cls._lock:
+            load_lock = cls._load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            if not use_cache:
+                return cls._read_model(name)
+            stat = cls.artifact_stat(name)
+            cached = cls._models.get(key)
+            if cached is not None and cached[0] == stat:
+                return cached[1]
+            model = cls._read_model(name)
+            cls._models[key] = (stat, model)
+        return model
+
+    @classmethod
+    def _read_model(cls, name: str):
+        fast_format_path = Path(name) / cls.FAST_FORMAT_FILE
+        if fast_format_path.is_file():
+            with open(fast_format_path, "rb") as file:
+                return pickle.load(file)
+        from sktime.utils import mlflow_sktime
+
         return mlflow_sktime.load_model(name)
 
+    @classmethod
+    def save_model(cls, model, name: str, fast_format: bool = True, overwrite: bool = False):
+        """
+        Save a model, replacing an existing artifact only when `overwrite` is set
+
+        The replacing artifact is written next to the existing one and swapped in once complete.
+        """
+        from sktime.utils import mlflow_sktime
+
+        path = Path(name)
+        target = path.with_name(f"{path.name}.saving") if overwrite and path.exists() else path
+        if target != path and target.exists():
+            shutil.rmtree(target)
+        mlflow_sktime.save_model(model, str(target))
+        if fast_format:
+            with open(target / cls.FAST_FORMAT_FILE, "wb") as file:
+                pickle.dump(model, file, protocol=pickle.HIGHEST_PROTOCOL)
+        if target != path:
+            shutil.rmtree(path)
+            os.replace(target, path)
+        with cls._lock:
+            cls._models.pop(str(Path(name).resolve()), None)
+        for hook in list(cls._save_hooks):
+            hook(name)
+
+    @classmethod
+    def warm_up(cls, names: Iterable[str]) -> None:
+        """
+        Load the saved models that exist among `names` into memory
+        """
+        for name in names:
+            if name and Path(name).exists():
+                cls.load_model(name)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        with cls._lock:
+            cls._models.clear()
+
+    @classmethod
+    def register_save_hook(cls, hook: Callable[[str], None]) -> None:
+        """
+        Call `hook` with the model path every time a model is saved
+        """
+        with cls._lock:
+            if hook not in cls._save_hooks:
+                cls._save_hooks.append(hook)
+
+    @classmethod
+    def unregister_save_hook(cls, hook: Callable[[str], None]) -> None:
+        with cls._lock:
+            if hook in cls._save_hooks:
+                cls._save_hooks.remove(hook)
+
     @staticmethod
-    def save_model(model, name: str):
-        mlflow_sktime.save_model(model, name)
+    def _artifact_files(name: Union[str, Path]) -> List[Path]:
+        path = Path(name)
+        if path.is_file():
+            return [path]
+        return sorted(file_path for file_path in path.rglob("*") if file_path.is_file())
+
+    @classmethod
+    def artifact_stat(cls, name: Union[str, Path]) -> tuple:
+        """
+        The relative path, size and mtime of every file of a saved model
+        """
+        path = Path(name)
+        stats = []
+        for file_path in cls._artifact_files(path):
+            stat = file_path.stat()
+            stats.append((os.path.relpath(file_path, path), stat.st_size, stat.st_mtime_ns))
+        return tuple(stats)
+
+    @classmethod
+    def artifact_hash(cls, name: Union[str, Path]) -> str:
+        """
+        The sha256 of the files of a saved model, only recomputed when one of them changes
+
+        Args:
+            name (Union[str, Path]): the path of the saved model
+        Returns:
+            str: the hex digest of the artifact
+        """
+        path = Path(name)
+        stat = cls.artifact_stat(path)
+        key = str(path.resolve())
+        with cls._lock:
+            cached = cls._artifact_hashes.get(key)
+        if cached is not None and cached[0] == stat:
+            return cached[1]
+        digest = hashlib.sha256()
+        for file_path in cls._artifact_files(path):
+            digest.update(os.path.relpath(file_path, path).encode())
+            with open(file_path, "rb") as file:
+                for block in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(block)
+        with cls._lock:
+            cls._artifact_hashes[key] = (stat, digest.hexdigest())
+        return digest.hexdigest()
+
+
+WARM_UP_ENV_VAR = "SALES_PREDICTION_WARM_MODELS"
+if os.environ.get(WARM_UP_ENV_VAR):
+    threading.Thread(
+        target=ModelRegistry.warm_up,
+        args=(os.environ[WARM_UP_ENV_VAR].split(os.pathsep),),
+        daemon=True,
+    ).start()
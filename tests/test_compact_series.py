@@ -0,0 +1,39 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sales_prediction.training_pipeline.compact_series import CompactSeries, as_series
+from sales_prediction.training_pipeline.hyperparmaters_tuning import take
+
+
+class TestCompactSeries(unittest.TestCase):
+    def setUp(self):
+        index = pd.date_range("2019-01-01", periods=10, freq="D", name="OrderDate")
+        self.series = pd.Series(np.arange(10, dtype=float) * 1.5, index=index, name="Sales")
+        self.compact = CompactSeries.from_series(self.series)
+
+    def test_roundtrip(self):
+        series = self.compact.to_series()
+        self.assertEqual(series.dtype, np.float64)
+        self.assertTrue(np.shares_memory(series.to_numpy(), self.compact.values))
+        self.assertTrue(np.shares_memory(self.compact.values, self.series.to_numpy()))
+        pd.testing.assert_series_equal(series, self.series, check_freq=False)
+        self.assertEqual(series.index.freqstr, "D")
+        self.assertEqual(self.compact.nbytes, 80)
+
+    def test_window_is_a_view(self):
+        window = self.compact[3:7]
+        self.assertTrue(np.shares_memory(window.values, self.compact.values))
+        pd.testing.assert_series_equal(as_series(window), as_series(self.compact).iloc[3:7], check_freq=False)
+        with self.assertRaises(TypeError):
+            self.compact[::2]
+
+    def test_take_contiguous_positions(self):
+        series = self.compact.to_series()
+        self.assertTrue(np.shares_memory(take(series, np.arange(2, 6)).to_numpy(), series.to_numpy()))
+        pd.testing.assert_series_equal(take(series, np.array([1, 4])), series.iloc[[1, 4]])
+
+
+if __name__ == "__main__":
+    unittest.main()
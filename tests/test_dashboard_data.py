@@ -0,0 +1,89 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from sales_prediction.data_loading.dashboard_data import DashboardData, data_fingerprint, map_points
+from sales_prediction.data_loading.sales_cube import SalesCube
+from sales_prediction.utils.db_connector import bump_load_version
+
+
+class TestDashboardData(unittest.TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.sales_cube = SalesCube(self.connection)
+        self.sales_cube.append(
+            pd.DataFrame(
+                {
+                    "OrderDate": pd.to_datetime(
+                        ["2019-11-02", "2019-11-02", "2019-12-01", "2019-12-03", "2019-12-03"]
+                    ),
+                    "Product": ["iPhone", "Monitor", "iPhone", "iPhone", "Monitor"],
+                    "QuantityOrdered": [1, 2, 1, 2, 1],
+                    "PriceEach": [700.0, 100.0, 700.0, 700.0, 100.0],
+                    "Sales": [700.0, 200.0, 700.0, 1400.0, 100.0],
+                    "CityName": ["Dallas", "Boston", "Dallas", "Boston", "Boston"],
+                    "StreetName": ["917 1st St", "682 Chestnut St", "917 1st St", "10 Main St", "682 Chestnut St"],
+                    "ZipAddress": ["TX 75001", "MA 02215", "TX 75001", "MA 02215", "MA 02215"],
+                    "SourceFile": ["2019.csv"] * 5,
+                }
+            )
+        )
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_build(self):
+        data = DashboardData.build(self.sales_cube)
+        self.assertEqual(data.cities, ["Dallas", "Boston"])
+        self.assertEqual(data.monthly_metrics.loc["previous", "Sales"], 900.0)
+        self.assertEqual(data.monthly_metrics.loc["current", "Sales"], 2200.0)
+        self.assertAlmostEqual(data.monthly_difference()["Sales"], 13 / 9)
+
+        boston = data.view("Boston")
+        self.assertEqual(len(boston.daily_sales), 32)
+        self.assertEqual(boston.daily_sales["Sales"].sum(), 1700.0)
+        products = boston.products.set_index("Product")
+        self.assertEqual(products.loc["Monitor", ["Sales", "previous", "current"]].tolist(), [300.0, 200.0, 100.0])
+        self.assertAlmostEqual(products.loc["Monitor", "difference"], -0.5)
+        self.assertTrue(np.isnan(products.loc["iPhone", "difference"]))
+        streets = boston.streets.set_index("street")
+        self.assertEqual(streets.loc["10 Main St, MA 02215", "Sales"], 1400.0)
+        self.assertEqual(streets.loc["682 Chestnut St, MA 02215", "ZipAddress"], "MA 02215")
+        with self.assertRaises(KeyError):
+            data.view("Austin")
+
+    def test_map_points(self):
+        geocodes = pd.DataFrame(
+            {
+                "StreetName": ["917 1st St", "682 Chestnut St", "10 Main St"],
+                "ZipAddress": ["TX 75001", "MA 02215", "MA 02215"],
+                "Latitude": [33.0, 42.35, 42.35],
+                "Longitude": [-96.8, -71.1, -71.1],
+                "Precision": ["street", "zip", "zip"],
+            }
+        )
+        data = DashboardData.build(self.sales_cube, geocodes=geocodes)
+        points = map_points(data.view("Boston").streets)
+        self.assertEqual(
+            points[["label", "Sales", "Precision", "streets"]].values.tolist(),
+            [["MA 02215 (approximate, 2 streets)", 1700.0, "zip", 2]],
+        )
+        points = map_points(data.view("Dallas").streets)
+        self.assertEqual(points[["label", "Precision"]].values.tolist(), [["917 1st St, TX 75001", "street"]])
+        self.assertTrue(map_points(DashboardData.build(self.sales_cube).view("Dallas").streets).empty)
+
+    def test_data_fingerprint(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_name = Path(tmp_dir) / "sales.sqlite"
+            with sqlite3.connect(db_name) as connection:
+                connection.execute("CREATE TABLE daily_sales (Date TEXT)")
+            fingerprint = data_fingerprint(db_name)
+            self.assertEqual(data_fingerprint(db_name), fingerprint)
+            connection = sqlite3.connect(db_name)
+            bump_load_version(connection)
+            connection.close()
+            self.assertNotEqual(data_fingerprint(db_name), fingerprint)
@@ -0,0 +1,67 @@
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from sales_prediction.utils.db_connector import (
+    SqliteConnectionPool,
+    SqliteReader,
+    bump_load_version,
+    sqlite_connector,
+)
+
+
+class TestSqliteReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_name = Path(self.tmp_dir.name) / "sales.sqlite"
+        with sqlite_connector(str(self.db_name)) as connection:
+            with connection:
+                connection.execute("CREATE TABLE sales (CityName TEXT, Sales REAL)")
+                connection.executemany(
+                    "INSERT INTO sales VALUES (?, ?)", [("Dallas", 10.0), ("Boston", 20.0)]
+                )
+        self.pool = SqliteConnectionPool(self.db_name, size=2)
+        self.reader = SqliteReader(self.pool)
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmp_dir.cleanup()
+
+    def test_read_only(self):
+        with self.pool.connection() as connection:
+            with self.assertRaises(sqlite3.OperationalError):
+                connection.execute("DELETE FROM sales")
+
+    def test_cache_invalidated_by_load_version(self):
+        df = self.reader.select("sales", columns=["Sales"], filters={"CityName": ["Dallas"]})
+        self.assertEqual(df["Sales"].tolist(), [10.0])
+        df["Sales"] = 0.0
+        df = self.reader.select("sales", columns=["Sales"], filters={"CityName": ["Dallas"]})
+        self.assertEqual(df["Sales"].tolist(), [10.0])
+        self.assertEqual((self.reader.hits, self.reader.misses), (1, 1))
+        with sqlite_connector(str(self.db_name)) as connection:
+            with connection:
+                connection.execute("UPDATE sales SET Sales = 30.0 WHERE CityName = 'Dallas'")
+            bump_load_version(connection)
+        df = self.reader.select("sales", columns=["Sales"], filters={"CityName": ["Dallas"]})
+        self.assertEqual(df["Sales"].tolist(), [30.0])
+
+    def test_pool_size(self):
+        results = []
+
+        def read():
+            results.append(self.reader.read_sql("SELECT SUM(Sales) AS Sales FROM sales")["Sales"][0])
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [30.0] * 8)
+        self.assertLessEqual(len(self.pool._opened), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
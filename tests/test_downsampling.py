@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sales_prediction.utils.downsampling import downsample, lttb_positions, points_budget
+
+
+class TestDownsampling(unittest.TestCase):
+    def setUp(self):
+        values = np.random.default_rng(0).normal(size=10_000).cumsum()
+        values[5_000] = 1_000.0
+        self.series = pd.Series(values, index=pd.date_range("2019-01-01", periods=10_000, freq="h"), name="Sales")
+
+    def test_points_budget(self):
+        self.assertEqual(points_budget(900), 1800)
+        self.assertEqual(points_budget(1, points_per_pixel=1), 3)
+
+    def test_lttb(self):
+        sampled = downsample(self.series, 500)
+        self.assertEqual(len(sampled), 500)
+        self.assertEqual(sampled.index[0], self.series.index[0])
+        self.assertEqual(sampled.index[-1], self.series.index[-1])
+        self.assertTrue(sampled.index.is_monotonic_increasing)
+        self.assertEqual(sampled.max(), 1_000.0)
+        self.assertEqual(sampled.name, "Sales")
+        pd.testing.assert_series_equal(sampled, self.series.loc[sampled.index])
+
+    def test_lttb_line(self):
+        x = np.arange(7, dtype=float)
+        y = np.array([0.0, 1.0, 2.0, 9.0, 4.0, 5.0, 6.0])
+        self.assertEqual(lttb_positions(x, y, 3).tolist(), [0, 3, 6])
+
+    def test_minmax(self):
+        sampled = downsample(self.series, 500, method="minmax")
+        self.assertLessEqual(len(sampled), 500)
+        self.assertEqual(sampled.max(), self.series.max())
+        self.assertEqual(sampled.min(), self.series.min())
+        self.assertEqual(sampled.index[-1], self.series.index[-1])
+        self.assertTrue(sampled.index.is_unique and sampled.index.is_monotonic_increasing)
+
+    def test_short_series(self):
+        short = self.series.iloc[:100]
+        self.assertIs(downsample(short, 1800), short)
+        with self.assertRaises(ValueError):
+            downsample(short, 10, method="mean")
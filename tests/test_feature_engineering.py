@@ -1,10 +1,12 @@
 import unittest
+from unittest import mock
 import pandas as pd
 
 from logging import Logger
 from sales_prediction.data_processing.features_engineering import DateFeatureEngineering
 from sales_prediction.data_processing.features_engineering import AddressFeatureEngineering
 from sales_prediction.data_processing.features_engineering import FeatureEngineeringPipeline
+from sales_prediction.data_processing.features_engineering import _parse_fixed_width_dates
 
 
 class TestFeatureEngineering(unittest.TestCase):
@@ -35,6 +37,33 @@ class TestFeatureEngineering(unittest.TestCase):
         self.assertEqual(transformed_df["Day"].iloc[0], 1)
         self.assertEqual(transformed_df["Year"].iloc[0], 2020)
 
+    def test_date_feature_engineering_cached(self):
+        # Test DateFeatureEngineering.transform parses each distinct date once
+        df_date = pd.concat([self.df_date, self.df_date], ignore_index=True)
+        expected_df = DateFeatureEngineering(date_column_name="OrderDate").transform(df_date.copy())
+        transformer = DateFeatureEngineering(date_column_name="OrderDate", cached=True)
+        transformed_df = transformer.transform(df_date.copy())
+        pd.testing.assert_frame_equal(
+            transformed_df, expected_df, check_dtype=False, check_categorical=False
+        )
+        self.assertEqual(transformed_df["Hour"].dtype, "int8")
+        self.assertEqual(transformed_df["Year"].dtype, "int16")
+        self.assertEqual(transformed_df["DayName"].dtype, "category")
+
+    def test_parse_fixed_width_dates(self):
+        # Test _parse_fixed_width_dates against pd.to_datetime, and its fallback on other values
+        date_format = "%m/%d/%y %H:%M"
+        dates = pd.Index(
+            pd.date_range("1969-01-01", "2068-12-31", freq="997min").strftime(date_format), dtype=object
+        )
+        pd.testing.assert_index_equal(
+            _parse_fixed_width_dates(dates, date_format),
+            pd.DatetimeIndex(pd.to_datetime(dates, format=date_format)),
+        )
+        for value in ["02/29/19 08:46", "04/19/19 24:00", "4/19/19 08:46", "04/19/19 08:46 ", "04-19-19 08:46"]:
+            self.assertIsNone(_parse_fixed_width_dates(pd.Index([value], dtype=object), date_format))
+        self.assertIsNone(_parse_fixed_width_dates(dates, "%m/%d/%y %I:%M"))
+
     def test_address_feature_engineering(self):
         # Test AddressFeatureEngineering.transform
         transformer = AddressFeatureEngineering(address_column_name="Address")
@@ -50,6 +79,20 @@ class TestFeatureEngineering(unittest.TestCase):
         self.assertEqual(transformed_df["StateCode"].iloc[0], "CA")
         self.assertEqual(transformed_df["ZipCode"].iloc[0], "95014")
 
+    def test_address_feature_engineering_cached(self):
+        # Test AddressFeatureEngineering.transform parses each distinct address once
+        df_address = pd.concat([self.df_address, self.df_address], ignore_index=True)
+        expected_df = AddressFeatureEngineering(address_column_name="Address").transform(df_address.copy())
+        transformer = AddressFeatureEngineering(address_column_name="Address", cached=True)
+        with mock.patch.object(transformer, "_split_address", wraps=transformer._split_address) as split_address:
+            transformed_df = transformer.transform(df_address.copy())
+        pd.testing.assert_frame_equal(
+            transformed_df, expected_df, check_dtype=False, check_categorical=False
+        )
+        for column in ["CityName", "StateCode", "ZipCode"]:
+            self.assertEqual(transformed_df[column].dtype, "category")
+        self.assertEqual(split_address.call_count, 2)
+
     def test_pipeline(self):
         # Test FeatureEngineeringPipeline with both Date and Address feature engineering
         steps = [
@@ -75,6 +118,21 @@ class TestFeatureEngineering(unittest.TestCase):
         for column in expected_columns:
             self.assertTrue(column in transformed_df.columns)
 
+    def test_pipeline_transform_chunks(self):
+        # Test FeatureEngineeringPipeline.transform_chunks gives the same rows as transform
+        steps = [
+            DateFeatureEngineering(date_column_name="OrderDate"),
+            AddressFeatureEngineering(address_column_name="Address"),
+        ]
+        pipeline = FeatureEngineeringPipeline(logger=self.logger,
+                                              feature_engineering_steps=steps)
+        df_combined = pd.concat([self.df_date, self.df_address], axis=1)
+        chunks = [df_combined.iloc[[0]].copy(), df_combined.iloc[[1]].copy()]
+        transformed_chunks = list(pipeline.transform_chunks(chunks))
+        expected_df, _ = pipeline.transform(df_combined.copy())
+        pd.testing.assert_frame_equal(pd.concat(transformed_chunks), expected_df)
+        self.assertIsNone(pipeline.stream_error)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sktime.forecasting.naive import NaiveForecaster
+
+from sales_prediction.jobs.inference import InferenceJob
+from sales_prediction.utils.forecast_cache import ForecastCache
+from sales_prediction.utils.registries import ModelRegistry
+
+
+class TestForecastCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self.tmp_dir.name)
+        self.model_path = self.tmp_path / "model"
+        self.model_path.mkdir()
+        (self.model_path / "model.pkl").write_bytes(b"first model")
+        self.cache = ForecastCache(self.tmp_path / "forecasts.sqlite", max_entries=2)
+        self.forecast = pd.Series([1.0, 2.0], index=pd.date_range("2020-01-01", periods=2, freq="D"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+    def test_lru_eviction(self):
+        model_hash = ModelRegistry.artifact_hash(self.model_path)
+        for key in ["a", "b"]:
+            self.cache.put(self.model_path, model_hash, key, self.forecast)
+        self.assertIsNotNone(self.cache.get(self.model_path, model_hash, "a"))
+        self.cache.put(self.model_path, model_hash, "c", self.forecast)
+        self.assertIsNone(self.cache.get(self.model_path, model_hash, "b"))
+        pd.testing.assert_series_equal(self.cache.get(self.model_path, model_hash, "a"), self.forecast)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_invalidated_by_new_model(self):
+        model_hash = ModelRegistry.artifact_hash(self.model_path)
+        self.cache.put(self.model_path, model_hash, "a", self.forecast)
+        (self.model_path / "model.pkl").write_bytes(b"second model")
+        new_hash = ModelRegistry.artifact_hash(self.model_path)
+        self.assertNotEqual(new_hash, model_hash)
+        self.assertIsNone(self.cache.get(self.model_path, new_hash, "a"))
+        self.assertEqual(len(self.cache), 0)
+        self.cache.put(self.model_path, new_hash, "a", self.forecast)
+        for hook in ModelRegistry._save_hooks:
+            hook(str(self.model_path))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_inference_job_cache(self):
+        y = pd.Series(np.arange(30, dtype=float), index=pd.date_range("2019-01-01", periods=30, freq="D"))
+        job = InferenceJob(NaiveForecaster().fit(y), model_path=str(self.model_path), cache=self.cache)
+        y_pred = job.predict([1, 2, 3])
+        job._forecaster = None
+        pd.testing.assert_series_equal(job.predict([1, 2, 3]), y_pred)
+        self.assertEqual(len(self.cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
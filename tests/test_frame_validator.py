@@ -0,0 +1,78 @@
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sales_prediction.schema_validator.frame_validator import ColumnRule, FrameValidator, ValidationReport
+from sales_prediction.schema_validator.validate_time_series import validate_time_series
+
+
+class TestFrameValidator(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "OrderID": ["1", "2", "3", "x4", "5", "6"],
+                "QuantityOrdered": ["1", "2", "two", "1", "0", "3"],
+                "PriceEach": [1.5, np.nan, 2.0, 3.0, 4.0, -1.0],
+                "OrderDate": pd.to_datetime(
+                    ["2019-01-01", "2019-02-01", "1999-12-31", "2019-03-01", "2019-04-01", "2019-05-01"]
+                ),
+                "ZipCode": pd.Categorical(["75001", "75001", "ABCDE", "94016", "94016", "75001"]),
+            },
+            index=[10, 11, 12, 13, 14, 15],
+        )
+        self.validator = FrameValidator(
+            [
+                ColumnRule("OrderID", pattern=r"\d+"),
+                ColumnRule("QuantityOrdered", dtype="integer", min_value=1),
+                ColumnRule("PriceEach", dtype="float", nullable=False, min_value=0),
+                ColumnRule("OrderDate", dtype="datetime", min_date="2000-01-01"),
+                ColumnRule("ZipCode", dtype="string", pattern=r"\d{5}"),
+                ColumnRule("Product", required=False),
+                ColumnRule("Sales"),
+            ],
+            sample_size=1,
+        )
+
+    def test_every_row_is_checked(self):
+        report = self.validator.validate(self.df)
+        violations = {(v["column"], v["rule"]): (v["count"], v["sample_index"]) for v in report.violations}
+        self.assertEqual(
+            violations,
+            {
+                ("OrderID", "pattern"): (1, [13]),
+                ("QuantityOrdered", "dtype"): (1, [12]),
+                ("QuantityOrdered", "range"): (1, [14]),
+                ("PriceEach", "nullable"): (1, [11]),
+                ("PriceEach", "range"): (1, [15]),
+                ("OrderDate", "date_range"): (1, [12]),
+                ("ZipCode", "pattern"): (1, [12]),
+                ("Sales", "required"): (6, []),
+            },
+        )
+        self.assertEqual(json.loads(report.to_json())["rows"], 6)
+
+    def test_merge_chunks(self):
+        report = ValidationReport(0, sample_size=2)
+        for chunk in (self.df.iloc[:3], self.df.iloc[3:]):
+            report.merge(self.validator.validate(chunk))
+        whole = self.validator.validate(self.df)
+        self.assertEqual(report.n_rows, 6)
+        self.assertEqual(
+            sorted((v["column"], v["rule"], v["count"]) for v in report.violations if v["rule"] != "required"),
+            sorted((v["column"], v["rule"], v["count"]) for v in whole.violations if v["rule"] != "required"),
+        )
+
+    def test_validate_time_series(self):
+        index = pd.date_range("2019-01-01", periods=10, freq="D")
+        y = pd.Series(np.arange(10, dtype=float), index=index)
+        self.assertIsNone(validate_time_series(y)[1])
+        y.iloc[7] = -5.0
+        error = json.loads(validate_time_series(y)[1])
+        self.assertEqual(error["violations"][0]["rule"], "range")
+        self.assertEqual(error["violations"][0]["sample_index"], [7])
+
+
+if __name__ == "__main__":
+    unittest.main()
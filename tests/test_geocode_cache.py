@@ -0,0 +1,70 @@
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from sales_prediction.data_loading.geocode_cache import Gazetteer, GeocodeCache
+
+
+class TestGeocodeCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.gazetteer_path = Path(self.tmp_dir.name) / "gazetteer.geojson"
+        features = [
+            {"properties": {"ZipAddress": "MA 02215"}, "coordinates": [-71.1, 42.35]},
+            {"properties": {"ZipAddress": "TX 75001"}, "coordinates": [-96.84, 32.96]},
+            {"properties": {"ZipAddress": "TX 75001", "StreetName": "1st St"}, "coordinates": [-96.8, 33.0]},
+        ]
+        with open(self.gazetteer_path, "w") as f:
+            json.dump(
+                {
+                    "type": "FeatureCollection",
+                    "features": [
+                        {
+                            "type": "Feature",
+                            "properties": feature["properties"],
+                            "geometry": {"type": "Point", "coordinates": feature["coordinates"]},
+                        }
+                        for feature in features
+                    ],
+                },
+                f,
+            )
+        self.gazetteer = Gazetteer.from_geojson(self.gazetteer_path)
+        self.connection = sqlite3.connect(":memory:")
+        self.orders = pd.DataFrame(
+            {
+                "StreetName": ["1st St", "Main St", "Chestnut St", "1st St", "Elm St"],
+                "ZipAddress": ["TX 75001", "TX 75001", "MA 02215", "TX 75001", "ZZ 00000"],
+            }
+        )
+
+    def tearDown(self):
+        self.connection.close()
+        self.tmp_dir.cleanup()
+
+    def test_geocode(self):
+        geocodes = self.gazetteer.geocode(self.orders.drop_duplicates()).set_index("StreetName")
+        self.assertEqual(sorted(geocodes.index), ["1st St", "Chestnut St", "Main St"])
+        self.assertEqual(
+            geocodes.loc["1st St", ["Latitude", "Longitude", "Precision"]].tolist(), [33.0, -96.8, "street"]
+        )
+        self.assertEqual(
+            geocodes.loc["Main St", ["Latitude", "Longitude", "Precision"]].tolist(), [32.96, -96.84, "zip"]
+        )
+
+    def test_append(self):
+        cache = GeocodeCache(self.connection, self.gazetteer, batch_size=1)
+        cache.append(self.orders.iloc[:2])
+        cache.append(self.orders)
+        geocodes = cache.read()
+        self.assertEqual(len(geocodes), 3)
+        self.assertEqual(geocodes.drop_duplicates(subset=["StreetName", "ZipAddress"]).shape[0], 3)
+        cache.reset()
+        self.assertEqual(cache.read()["StreetName"].tolist(), ["1st St"])
+        cache.append(self.orders)
+        self.assertEqual(len(cache.read()), 3)
+        self.assertEqual(len(GeocodeCache(sqlite3.connect(":memory:")).read()), 0)
@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sktime.forecasting.base import ForecastingHorizon
+
+from sales_prediction.training_pipeline.modelling import GlobalLagForecaster
+
+
+class TestGlobalLagForecaster(unittest.TestCase):
+    def setUp(self):
+        index = pd.date_range("2019-01-01", periods=200, freq="D")
+        weekly = 1 + 0.5 * np.sin(2 * np.pi * np.arange(200) / 7)
+        self.panel = pd.DataFrame(
+            {"small": 10 * weekly, "large": 1000 * weekly, "flat": np.full(200, 50.0)}, index=index
+        )
+        self.forecaster = GlobalLagForecaster(
+            lags=(1, 7), windows=(7,), estimator=HistGradientBoostingRegressor(max_iter=50, random_state=0)
+        ).fit(self.panel)
+
+    def test_design_matrix(self):
+        scaled = self.panel.to_numpy() / self.forecaster.scale_
+        positions = np.array([7, 8])
+        X = self.forecaster.features(scaled, positions, self.panel.index[positions])
+        self.assertEqual(X.dtype, np.float32)
+        self.assertEqual(X.shape, (2 * 3, len(self.forecaster.feature_names)))
+        np.testing.assert_allclose(X[3:, 0], scaled[7], rtol=1e-6)
+        np.testing.assert_allclose(X[3:, 1], scaled[1], rtol=1e-6)
+        np.testing.assert_allclose(X[:3, 2], scaled[0:7].mean(axis=0), rtol=1e-6)
+
+    def test_predict_all_series(self):
+        y_pred = self.forecaster.predict(list(range(1, 15)))
+        self.assertEqual(list(y_pred.columns), ["small", "large", "flat"])
+        self.assertEqual(y_pred.index[0], pd.Timestamp("2019-07-20"))
+        expected = self.panel.iloc[-14:].to_numpy()
+        np.testing.assert_allclose(y_pred.to_numpy(), expected, rtol=0.1)
+
+    def test_absolute_horizon(self):
+        dates = pd.date_range("2019-07-25", periods=3, freq="D")
+        y_pred = self.forecaster.predict(ForecastingHorizon(dates, is_relative=False))
+        pd.testing.assert_frame_equal(y_pred, self.forecaster.predict([6, 7, 8]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import pickle
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sktime.forecasting.naive import NaiveForecaster
+
+from sales_prediction.training_pipeline.hierarchical import TOTAL, HierarchicalForecaster
+
+
+def create_naive_model():
+    return NaiveForecaster(strategy="mean", window_length=7)
+
+
+class TestHierarchicalForecaster(unittest.TestCase):
+    def setUp(self):
+        index = pd.date_range("2019-01-01", periods=60, freq="D")
+        columns = pd.MultiIndex.from_tuples(
+            [("Austin", "iPhone"), ("Austin", "Monitor"), ("Dallas", "iPhone")], names=["CityName", "Product"]
+        )
+        rng = np.random.default_rng(0)
+        self.panel = pd.DataFrame(rng.uniform(0, 100, size=(60, 3)), index=index, columns=columns)
+
+    def test_bottom_up_totals(self):
+        forecaster = HierarchicalForecaster(create_naive_model).fit(self.panel)
+        y_pred = forecaster.predict([1, 2, 3])
+        self.assertEqual(len(forecaster.models_), 3)
+        np.testing.assert_allclose(y_pred[("Austin", TOTAL)], y_pred[["Austin"]].iloc[:, :2].sum(axis=1))
+        np.testing.assert_allclose(y_pred[(TOTAL, TOTAL)], y_pred[self.panel.columns].sum(axis=1))
+        expected = self.panel.iloc[-7:].mean()
+        np.testing.assert_allclose(y_pred[self.panel.columns].iloc[0], expected)
+        self.assertEqual(forecaster.fit_report_.columns.tolist(), ["series", "n_obs", "fit_seconds"])
+        self.assertIsNone(forecaster.capacity_report()["max_peak_memory_mb"])
+
+    def test_trace_memory(self):
+        tracemalloc.start()
+        try:
+            forecaster = HierarchicalForecaster(create_naive_model, trace_memory=True).fit(self.panel)
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+        self.assertTrue((forecaster.fit_report_["peak_memory_mb"] > 0).all())
+
+    def test_top_down_splits_the_total(self):
+        forecaster = HierarchicalForecaster(create_naive_model, reconciliation="top_down").fit(self.panel)
+        self.assertIn(TOTAL, forecaster.models_)
+        bottom = forecaster.predict_bottom([1, 2])
+        total = forecaster.models_[TOTAL].predict([1, 2])
+        np.testing.assert_allclose(bottom.sum(axis=1), total)
+
+    def test_save_load(self):
+        forecaster = HierarchicalForecaster(create_naive_model, workers=2).fit(self.panel)
+        copied = pickle.loads(pickle.dumps(forecaster))
+        self.assertNotIn("model_mb", forecaster.fit_report_)
+        self.assertIn("model_mb", copied.fit_report_)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "hierarchical.pkl"
+            forecaster.save(path)
+            loaded = HierarchicalForecaster.load(path)
+        pd.testing.assert_frame_equal(loaded.predict([1, 2]), forecaster.predict([1, 2]))
+        self.assertEqual(loaded.capacity_report()["series"], 3)
+        self.assertGreater(loaded.capacity_report()["artifact_mb"], 0)
+        self.assertEqual(forecaster.fit_report_["model_mb"].tolist(), loaded.fit_report_["model_mb"].tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
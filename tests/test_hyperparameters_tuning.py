@@ -0,0 +1,81 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.linear_model import Ridge
+from sktime.forecasting.compose import TransformedTargetForecaster, make_reduction
+from sktime.forecasting.model_selection import ExpandingWindowSplitter, ForecastingGridSearchCV
+from sktime.transformations.series.difference import Differencer
+
+from sales_prediction.training_pipeline.hyperparmaters_tuning import (
+    SharedTransformSearchCV,
+    SuccessiveHalvingSearchCV,
+)
+
+
+class TestSharedTransformSearchCV(unittest.TestCase):
+    def setUp(self):
+        index = pd.date_range("2019-01-01", periods=80, freq="D")
+        self.y = pd.Series(100 + np.arange(80) + 10 * np.sin(np.arange(80)), index=index)
+        self.forecaster = TransformedTargetForecaster(
+            steps=[
+                ("differencer", Differencer(lags=1)),
+                ("forecaster", make_reduction(Ridge(), window_length=7)),
+            ]
+        )
+        self.cv = ExpandingWindowSplitter(fh=4, initial_window=30, step_length=10)
+        self.param_grid = {
+            "forecaster__estimator__alpha": [0.1, 10.0],
+            "differencer__lags": [1, 2],
+        }
+
+    def test_same_scores_as_sktime(self):
+        expected = ForecastingGridSearchCV(
+            self.forecaster, self.cv, self.param_grid, backend=None
+        ).fit(self.y)
+        search_cv = SharedTransformSearchCV(
+            self.forecaster, self.cv, self.param_grid, backend="loky", n_jobs=2
+        ).fit(self.y)
+        expected_scores = {
+            repr(sorted(params.items())): score
+            for params, score in zip(
+                expected.cv_results_["params"], expected.cv_results_["mean_test_MeanAbsolutePercentageError"]
+            )
+        }
+        for params, score in zip(search_cv.cv_results_["params"], search_cv.cv_results_["mean_test_score"]):
+            self.assertAlmostEqual(score, expected_scores[repr(sorted(params.items()))])
+        self.assertEqual(search_cv.best_params_, expected.best_params_)
+        pd.testing.assert_series_equal(search_cv.predict([1, 2]), expected.predict([1, 2]))
+
+
+class TestSuccessiveHalvingSearchCV(unittest.TestCase):
+    def test_rungs(self):
+        index = pd.date_range("2019-01-01", periods=80, freq="D")
+        y = pd.Series(100 + np.arange(80) + 10 * np.sin(np.arange(80)), index=index)
+        forecaster = TransformedTargetForecaster(
+            steps=[
+                ("differencer", Differencer(lags=1)),
+                ("forecaster", make_reduction(HistGradientBoostingRegressor(max_iter=27), window_length=7)),
+            ]
+        )
+        cv = ExpandingWindowSplitter(fh=4, initial_window=30, step_length=5)
+        param_grid = {
+            "forecaster__estimator__learning_rate": [0.3, 0.1, 0.03],
+            "forecaster__estimator__max_leaf_nodes": [3, 7, 15],
+        }
+        search_cv = SuccessiveHalvingSearchCV(
+            forecaster, cv, param_grid, backend=None, min_resource=3, min_folds=2
+        ).fit(y)
+        self.assertEqual(search_cv.schedule(9, 10), [(3, 2), (9, 4), (27, 10)])
+        rungs = search_cv.cv_results_.groupby("rung").size().tolist()
+        self.assertEqual(rungs, [9, 3, 1])
+        self.assertEqual(search_cv.best_params_["forecaster__estimator__max_iter"], 27)
+        last_rung = search_cv.cv_results_[search_cv.cv_results_["rung"] == 2]
+        self.assertEqual(last_rung["params"].iloc[0], {
+            key: value for key, value in search_cv.best_params_.items() if key != "forecaster__estimator__max_iter"
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
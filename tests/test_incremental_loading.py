@@ -0,0 +1,78 @@
+import sqlite3
+import tempfile
+import unittest
+from logging import Logger
+from pathlib import Path
+
+import pandas as pd
+
+from sales_prediction.data_loading.csv_output import CsvOutput
+from sales_prediction.data_loading.loadCsv import BulkSqliteLoader, CsvToSqliteWithPandas
+from sales_prediction.data_loading.manifest import IngestionManifest
+
+
+class TestIncrementalLoading(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self.tmp_dir.name)
+        self.connection = sqlite3.connect(":memory:")
+        self.logger = Logger(__name__)
+        self.df_january = pd.DataFrame(
+            {"OrderID": [1, 2], "Sales": [10.0, 20.0], "SourceFile": ["january.csv"] * 2}
+        )
+        self.df_february = pd.DataFrame(
+            {"OrderID": [3], "Sales": [30.0], "SourceFile": ["february.csv"]}
+        )
+
+    def tearDown(self):
+        self.connection.close()
+        self.tmp_dir.cleanup()
+
+    def test_manifest_status(self):
+        manifest = IngestionManifest(self.connection)
+        raw_file = self.tmp_path / "january.csv"
+        raw_file.write_text("OrderID\n1\n")
+        file_size, content_hash = manifest.fingerprint(raw_file)
+        self.assertEqual(manifest.status(raw_file.name, file_size, content_hash), IngestionManifest.NEW)
+        manifest.record(raw_file.name, file_size, content_hash, row_count=1)
+        self.assertEqual(manifest.status(raw_file.name, file_size, content_hash), IngestionManifest.UNCHANGED)
+        raw_file.write_text("OrderID\n1\n2\n")
+        file_size, content_hash = manifest.fingerprint(raw_file)
+        self.assertEqual(manifest.status(raw_file.name, file_size, content_hash), IngestionManifest.CHANGED)
+
+    def test_csv_output_replace_source_rows(self):
+        csv_output = CsvOutput(self.tmp_path / "sales.csv")
+        csv_output.append(self.df_january)
+        csv_output.append(self.df_february[["Sales", "SourceFile", "OrderID"]])
+        csv_output.delete_source_rows("january.csv")
+        result = pd.read_csv(csv_output.csv_path)
+        self.assertEqual(result.columns.tolist(), ["OrderID", "Sales", "SourceFile"])
+        self.assertEqual(result["OrderID"].tolist(), [3])
+
+    def test_sqlite_delete_source_rows(self):
+        loader = CsvToSqliteWithPandas(self.connection, self.logger)
+        self.assertTrue(loader.delete_source_rows("sales", "january.csv"))
+        loader.load_csv_into_table(self.df_january, "sales")
+        loader.load_csv_into_table(self.df_february, "sales", if_exists="append")
+        loader.delete_source_rows("sales", "january.csv")
+        rows = self.connection.execute("SELECT OrderID FROM sales").fetchall()
+        self.assertEqual(rows, [(3,)])
+
+    def test_bulk_loader(self):
+        loader = BulkSqliteLoader(self.connection, self.logger, batch_size=1, indexes=["SourceFile"])
+        df = self.df_january.assign(OrderDate=pd.to_datetime(["2019-01-01 10:00", None]))
+        self.assertTrue(loader.load_csv_into_table(df, "sales"))
+        self.assertTrue(loader.load_csv_into_table(self.df_february, "sales", if_exists="append"))
+        loader.create_indexes("sales")
+        rows = self.connection.execute("SELECT OrderID, Sales, OrderDate FROM sales").fetchall()
+        self.assertEqual(rows, [(1, 10.0, "2019-01-01 10:00:00"), (2, 20.0, None), (3, 30.0, None)])
+        schema = self.connection.execute("SELECT sql FROM sqlite_master WHERE name = 'sales'").fetchone()[0]
+        self.assertIn('"OrderID" INTEGER', schema)
+        self.assertIn('"OrderDate" TEXT', schema)
+        index = self.connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchone()
+        self.assertEqual(index, ("idx_sales_SourceFile",))
+        self.assertEqual(loader.last_load_stats["rows"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
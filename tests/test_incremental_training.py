@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sktime.forecasting.compose import TransformedTargetForecaster, make_reduction
+from sktime.transformations.series.detrend import Deseasonalizer
+from sktime.transformations.series.difference import Differencer
+
+from sales_prediction.training_pipeline.train import IncrementalTrainingPipeline
+
+
+def create_small_model():
+    return TransformedTargetForecaster(
+        steps=[
+            ("deseasonalizer", Deseasonalizer(sp=7)),
+            ("differencer", Differencer(lags=1)),
+            ("forecaster", make_reduction(HistGradientBoostingRegressor(max_iter=20, random_state=0))),
+        ]
+    )
+
+
+class TestIncrementalTrainingPipeline(unittest.TestCase):
+    def setUp(self):
+        index = pd.date_range("2019-01-01", periods=120, freq="D")
+        t = np.arange(120)
+        self.y = pd.Series(1000 + 5 * t + 50 * np.sin(2 * np.pi * t / 7), index=index, name="Sales")
+        self.previous = create_small_model().fit(self.y[:-3])
+
+    def test_warm_start_update(self):
+        train_pipeline = IncrementalTrainingPipeline(
+            create_small_model(), self.y, previous=self.previous, extra_iter=5, drift_threshold=1.0
+        )
+        forecaster = train_pipeline.fit()
+        self.assertEqual(train_pipeline.mode_, "update")
+        self.assertEqual(train_pipeline.updates_since_refit_, 1)
+        self.assertIsNot(forecaster, self.previous)
+        self.assertEqual(forecaster.cutoff[0], self.y.index[-1])
+        self.assertEqual(forecaster.forecaster_.estimator_.n_iter_, 25)
+        self.assertEqual(self.previous.cutoff[0], self.y.index[-4])
+        self.assertEqual(self.previous.forecaster_.estimator_.n_iter_, 20)
+        refit = create_small_model().fit(self.y)
+        np.testing.assert_allclose(forecaster.predict([1, 2, 3]), refit.predict([1, 2, 3]), rtol=0.02)
+
+    def test_refit_on_drift(self):
+        train_pipeline = IncrementalTrainingPipeline(
+            create_small_model(), self.y * 3, previous=self.previous, drift_threshold=0.3
+        )
+        train_pipeline.fit()
+        self.assertEqual(train_pipeline.mode_, "refit")
+        self.assertGreater(train_pipeline.drift_error_, 0.3)
+
+    def test_refit_on_schedule(self):
+        train_pipeline = IncrementalTrainingPipeline(
+            create_small_model(), self.y, previous=self.previous, updates_since_refit=6, refit_every=7
+        )
+        train_pipeline.fit()
+        self.assertEqual(train_pipeline.mode_, "refit")
+        self.assertEqual(train_pipeline.updates_since_refit_, 0)
+
+    def test_unchanged(self):
+        train_pipeline = IncrementalTrainingPipeline(create_small_model(), self.y[:-3], previous=self.previous)
+        self.assertIs(train_pipeline.fit(), self.previous)
+        self.assertEqual(train_pipeline.mode_, "unchanged")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sktime.forecasting.base import ForecastingHorizon
+from sktime.forecasting.compose import TransformedTargetForecaster, make_reduction
+from sktime.transformations.series.difference import Differencer
+
+from sales_prediction.jobs.inference import InferenceJob
+
+
+class TestInferenceJob(unittest.TestCase):
+    def setUp(self):
+        index = pd.date_range("2019-01-01", periods=120, freq="D")
+        y = pd.Series(100 + np.arange(120) + 10 * np.sin(np.arange(120)), index=index, name="Sales")
+        forecaster = TransformedTargetForecaster(
+            steps=[
+                ("differencer", Differencer(lags=1)),
+                ("forecaster", make_reduction(LinearRegression(), window_length=7)),
+            ]
+        )
+        self.job = InferenceJob(forecaster.fit(y))
+
+    def test_predict_many(self):
+        later = ForecastingHorizon(pd.date_range("2019-05-10", "2019-05-20", freq="D"), is_relative=False)
+        first_week, later_pred, second_step = self.job.predict_many([list(range(1, 8)), later, 2])
+        pd.testing.assert_series_equal(first_week, self.job.predict(list(range(1, 8))))
+        contiguous = self.job.predict(list(range(1, 21)))
+        pd.testing.assert_series_equal(later_pred, contiguous.loc["2019-05-10":"2019-05-20"], check_freq=False)
+        self.assertEqual(second_step.index.tolist(), [pd.Timestamp("2019-05-02")])
+        self.assertEqual(self.job.predict_many([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
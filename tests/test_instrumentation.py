@@ -0,0 +1,84 @@
+import json
+import pickle
+import tempfile
+import unittest
+from logging import Logger
+from pathlib import Path
+
+import pandas as pd
+
+from sales_prediction.data_processing.features_engineering import (
+    AddressFeatureEngineering,
+    DataCleaner,
+    DateFeatureEngineering,
+    FeatureEngineeringPipeline,
+)
+from sales_prediction.data_processing.instrumentation import StepProfiler, column_bytes
+
+
+class TestStepProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.df = pd.DataFrame(
+            {
+                "Product": ["iPhone", "Monitor", "Product", "iPhone"],
+                "OrderDate": ["01/01/20 10:00", "02/01/20 11:00", "02/01/20 11:00", None],
+                "Address": [
+                    "123 Apple St, Cupertino, CA 95014",
+                    "456 Banana Ave, Mountain View, CA 94043",
+                    "456 Banana Ave, Mountain View, CA 94043",
+                    None,
+                ],
+            }
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def pipeline(self, profiler: StepProfiler) -> FeatureEngineeringPipeline:
+        steps = [
+            DataCleaner(),
+            DateFeatureEngineering(date_column_name="OrderDate"),
+            AddressFeatureEngineering(address_column_name="Address"),
+        ]
+        return FeatureEngineeringPipeline(steps, logger=Logger(__name__), profiler=profiler)
+
+    def test_records(self):
+        metrics_path = Path(self.tmp_dir.name) / "metrics.json"
+        profile_path = Path(self.tmp_dir.name) / "steps.prof"
+        profiler = StepProfiler(metrics_path=metrics_path, trace_memory=True, profile_path=profile_path)
+        df, _ = self.pipeline(profiler).transform(self.df.copy(), source="january.csv")
+        self.assertEqual(
+            [record["step"] for record in profiler.records],
+            ["DataCleaner", "DateFeatureEngineering", "AddressFeatureEngineering"],
+        )
+        cleaner, dates, addresses = profiler.records
+        self.assertEqual((cleaner["rows_in"], cleaner["rows_out"]), (4, 2))
+        self.assertEqual(dates["bytes_in"], cleaner["bytes_out"])
+        self.assertEqual(addresses["column_bytes"].keys(), set(df.columns))
+        self.assertEqual(addresses["bytes_out"], sum(column_bytes(df).values()))
+        self.assertTrue(all(record["peak_memory_bytes"] >= 0 for record in profiler.records))
+        self.assertEqual(profiler.summary().index[0], max(profiler.records, key=lambda r: r["seconds"])["step"])
+        profiler.write()
+        with open(metrics_path) as f:
+            self.assertEqual(json.load(f)[0]["source"], "january.csv")
+        self.assertTrue(profile_path.exists())
+
+    def test_chunks_csv(self):
+        metrics_path = Path(self.tmp_dir.name) / "metrics.csv"
+        profiler = StepProfiler(metrics_path=metrics_path)
+        pipeline = self.pipeline(profiler)
+        chunks = [self.df.iloc[[0, 2]].copy(), self.df.iloc[[1, 3]].copy()]
+        list(pipeline.transform_chunks(chunks, source="january.csv"))
+        profiler.write()
+        metrics = pd.read_csv(metrics_path)
+        self.assertEqual(metrics["source"].unique().tolist(), ["january.csv[0]", "january.csv[1]"])
+        self.assertIn("column_bytes.Hour", metrics.columns)
+        self.assertEqual(pickle.loads(pickle.dumps(profiler)).records, [])
+
+    def test_column_bytes(self):
+        df = pd.DataFrame({"text": ["a" * 100] * 5_000, "number": range(5_000)})
+        exact = column_bytes(df, sample_size=None)
+        sampled = column_bytes(df, sample_size=100)
+        self.assertEqual(sampled["number"], exact["number"])
+        self.assertAlmostEqual(sampled["text"] / exact["text"], 1.0, places=2)
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sktime.forecasting.naive import NaiveForecaster
+
+from sales_prediction.utils.registries import ModelRegistry
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.model_path = str(Path(self.tmp_dir.name) / "model")
+        y = pd.Series(np.arange(30, dtype=float), index=pd.date_range("2019-01-01", periods=30, freq="D"))
+        self.forecaster = NaiveForecaster().fit(y)
+        ModelRegistry.save_model(self.forecaster, self.model_path)
+
+    def tearDown(self):
+        ModelRegistry.clear_cache()
+        self.tmp_dir.cleanup()
+
+    def test_fast_format(self):
+        fast_format_path = Path(self.model_path) / ModelRegistry.FAST_FORMAT_FILE
+        self.assertTrue(fast_format_path.is_file())
+        model = ModelRegistry.load_model(self.model_path)
+        pd.testing.assert_series_equal(model.predict([1, 2]), self.forecaster.predict([1, 2]))
+
+    def test_memoized_until_artifact_changes(self):
+        model = ModelRegistry.load_model(self.model_path)
+        self.assertIs(ModelRegistry.load_model(self.model_path), model)
+        self.assertIsNot(ModelRegistry.load_model(self.model_path, use_cache=False), model)
+        self.assertIs(ModelRegistry.load_model(self.model_path), model)
+        fast_format_path = Path(self.model_path) / ModelRegistry.FAST_FORMAT_FILE
+        stat = fast_format_path.stat()
+        os.utime(fast_format_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertIsNot(ModelRegistry.load_model(self.model_path), model)
+
+    def test_save_hook(self):
+        saved = []
+        ModelRegistry.register_save_hook(saved.append)
+        try:
+            ModelRegistry.save_model(self.forecaster, self.model_path + "_2", fast_format=False)
+        finally:
+            ModelRegistry.unregister_save_hook(saved.append)
+        self.assertEqual(saved, [self.model_path + "_2"])
+        self.assertFalse((Path(self.model_path + "_2") / ModelRegistry.FAST_FORMAT_FILE).exists())
+        ModelRegistry.warm_up([self.model_path + "_2"])
+
+    def test_overwrite(self):
+        with self.assertRaises(Exception):
+            ModelRegistry.save_model(self.forecaster, self.model_path)
+        y = pd.Series(np.arange(40, dtype=float), index=pd.date_range("2019-01-01", periods=40, freq="D"))
+        ModelRegistry.save_model(NaiveForecaster().fit(y), self.model_path, overwrite=True)
+        self.assertEqual(ModelRegistry.load_model(self.model_path).predict([1]).iloc[0], 39.0)
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["model"])
+
+
+if __name__ == "__main__":
+    unittest.main()
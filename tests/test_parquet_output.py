@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from sales_prediction.data_loading.parquet_output import ParquetOutput
+from sales_prediction.utils.parquet_loader import ParquetLoader, load_sales_data
+
+
+class TestParquetOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dataset_path = Path(self.tmp_dir.name) / "sales"
+        self.df_december = pd.DataFrame(
+            {
+                "OrderDate": pd.to_datetime(["2019-12-30 10:00", "2020-01-01 01:00"]),
+                "Sales": [10.0, 20.0],
+                "CityName": pd.Categorical(["Dallas", "Boston"]),
+                "Year": pd.Series([2019, 2020], dtype="int16"),
+                "Month": pd.Series([12, 1], dtype="int8"),
+                "SourceFile": ["december.csv"] * 2,
+            }
+        )
+        self.df_january = self.df_december.assign(
+            Sales=[30.0, 40.0], Year=pd.Series([2020, 2020], dtype="int16"),
+            Month=pd.Series([1, 1], dtype="int8"), SourceFile=["january.csv"] * 2,
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_append_and_load(self):
+        parquet_output = ParquetOutput(self.dataset_path)
+        parquet_output.append(self.df_december)
+        parquet_output.append(self.df_january)
+        df = ParquetLoader(self.dataset_path).load_data()
+        self.assertEqual(sorted(df["Sales"].tolist()), [10.0, 20.0, 30.0, 40.0])
+        self.assertEqual(df["CityName"].dtype, "category")
+        self.assertEqual(df["Month"].dtype, "int8")
+        df = ParquetLoader(self.dataset_path).load_data(columns=["Sales", "Month"], years=[2020], months=[1])
+        self.assertEqual(sorted(df["Sales"].tolist()), [20.0, 30.0, 40.0])
+        self.assertEqual(df.columns.tolist(), ["Sales", "Month"])
+
+    def test_delete_source_rows(self):
+        parquet_output = ParquetOutput(self.dataset_path)
+        parquet_output.append(pd.concat([self.df_december, self.df_january]))
+        parquet_output.delete_source_rows("december.csv")
+        df = load_sales_data(Path(self.tmp_dir.name) / "missing.csv", self.dataset_path)
+        self.assertEqual(sorted(df["Sales"].tolist()), [30.0, 40.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
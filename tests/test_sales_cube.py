@@ -0,0 +1,72 @@
+import sqlite3
+import unittest
+
+import pandas as pd
+
+from sales_prediction.data_loading.sales_cube import SalesCube
+
+
+class TestSalesCube(unittest.TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.sales_cube = SalesCube(self.connection)
+        self.df_january = pd.DataFrame(
+            {
+                "OrderDate": pd.to_datetime(["2019-01-01 10:00", "2019-01-01 12:00", "2019-01-03 09:00"]),
+                "Product": ["iPhone", "Monitor", "iPhone"],
+                "QuantityOrdered": [1, 2, 1],
+                "PriceEach": [700.0, 100.0, 700.0],
+                "Sales": [700.0, 200.0, 700.0],
+                "CityName": pd.Categorical(["Dallas", "Boston", "Dallas"]),
+                "StreetName": ["917 1st St", "682 Chestnut St", "917 1st St"],
+                "ZipAddress": ["TX 75001", "MA 02215", "TX 75001"],
+                "SourceFile": ["january.csv"] * 3,
+            }
+        )
+        self.df_february = self.df_january.assign(
+            OrderDate=pd.to_datetime(["2019-02-01 10:00"] * 3), SourceFile=["february.csv"] * 3
+        )
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_query(self):
+        self.sales_cube.append(self.df_january)
+        self.sales_cube.append(self.df_february)
+        df = self.sales_cube.query(by=["CityName"], start="2019-01-01", end="2019-01-31")
+        self.assertEqual(df["CityName"].tolist(), ["Boston", "Dallas", "Dallas"])
+        self.assertEqual(df["Sales"].tolist(), [200.0, 700.0, 700.0])
+        df = self.sales_cube.query(by=["Product"], filters={"CityName": ["Dallas"]})
+        self.assertEqual(df["Sales"].sum(), 2800.0)
+        self.assertEqual(df["Orders"].sum(), 4)
+        with self.assertRaises(ValueError):
+            self.sales_cube.query(by=["Product", "StreetName"])
+
+    def test_daily_sales(self):
+        self.assertEqual(len(self.sales_cube.daily_sales()), 0)
+        self.sales_cube.append(self.df_january)
+        daily_sales = self.sales_cube.daily_sales()
+        expected = self.df_january.set_index("OrderDate")["Sales"].resample("D").sum()
+        pd.testing.assert_series_equal(daily_sales, expected, check_freq=False)
+
+    def test_append_chunks(self):
+        self.sales_cube.append(self.df_january.iloc[:2])
+        self.sales_cube.append(self.df_january.iloc[2:])
+        self.sales_cube.append(self.df_january.iloc[:1])
+        rows = self.connection.execute("SELECT Date, Sales, Orders FROM daily_sales ORDER BY Date").fetchall()
+        self.assertEqual(rows, [("2019-01-01", 1600.0, 3), ("2019-01-03", 700.0, 1)])
+        df = self.sales_cube.query(by=["CityName"])
+        self.assertEqual(df["Sales"].tolist(), [200.0, 1400.0, 700.0])
+
+    def test_delete_source_rows(self):
+        self.sales_cube.append(self.df_january)
+        self.sales_cube.append(self.df_february)
+        self.sales_cube.delete_source_rows("january.csv")
+        df = self.sales_cube.query(by=["CityName", "Product"])
+        self.assertEqual(df["Date"].dt.month.unique().tolist(), [2])
+        self.sales_cube.reset()
+        self.assertEqual(len(self.sales_cube.daily_sales()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
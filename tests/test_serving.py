@@ -0,0 +1,69 @@
+import asyncio
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+from sktime.forecasting.base import ForecastingHorizon
+from sktime.forecasting.naive import NaiveForecaster
+
+from sales_prediction.jobs.inference import InferenceJob
+from sales_prediction.jobs.serving import ForecastServer, MicroBatcher
+
+
+class TestForecastServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        y = pd.Series(np.arange(30, dtype=float), index=pd.date_range("2019-12-01", periods=30, freq="D"))
+        self.batcher = MicroBatcher(InferenceJob(NaiveForecaster(strategy="last").fit(y)), window=0.05)
+        self.server = await ForecastServer(self.batcher).start("127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def get(self, path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(f"GET {path} HTTP/1.1\r\nConnection: close\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body)
+
+    async def test_forecast_batched(self):
+        responses = await asyncio.gather(
+            self.get("/forecast?start=2020-01-01&end=2020-01-03"),
+            self.get("/forecast?start=2020-01-10&end=2020-01-10"),
+        )
+        self.assertEqual([status for status, _ in responses], [200, 200])
+        self.assertEqual([row["sales"] for row in responses[0][1]["forecast"]], [29.0] * 3)
+        self.assertEqual(responses[1][1]["forecast"], [{"date": "2020-01-10", "sales": 29.0}])
+        self.assertEqual((self.batcher.batches, self.batcher.requests), (1, 2))
+
+    async def test_bad_requests(self):
+        self.assertEqual((await self.get("/forecast?start=2020-01-01"))[0], 400)
+        self.assertEqual((await self.get("/forecast?start=2020-02-01&end=2020-01-01"))[0], 400)
+        self.assertEqual((await self.get("/forecast?start=2019-12-30&end=2020-01-02"))[0], 400)
+        self.assertEqual((await self.get("/forecast?start=2100-01-01&end=2100-01-01"))[0], 400)
+        self.assertEqual((await self.get("/unknown"))[0], 404)
+
+    async def test_failed_horizon_isolated(self):
+        job = self.batcher.job
+        bad = ForecastingHorizon(pd.date_range("2000-01-01", periods=1, freq="D"), is_relative=False)
+        good = ForecastingHorizon(pd.date_range("2020-01-01", periods=2, freq="D"), is_relative=False)
+
+        def predict_many(horizons):
+            if any(fh.to_pandas()[0].year < 2019 for fh in horizons):
+                raise ValueError("in-sample prediction")
+            return InferenceJob.predict_many(job, horizons)
+
+        job.predict_many = predict_many
+        results = await asyncio.gather(self.batcher.submit(bad), self.batcher.submit(good), return_exceptions=True)
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(results[1].tolist(), [29.0, 29.0])
+        self.assertEqual(self.batcher.batches, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()